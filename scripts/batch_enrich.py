@@ -0,0 +1,615 @@
+"""
+Batch API enrichment for backfills and non-urgent items.
+
+Runs the enrichment step through the OpenAI Batch API (half price, up to
+24h latency) in three resumable steps:
+1. prepare: collect candidates, fetch content, write a JSONL batch file
+2. submit: upload the batch file and create the batch
+3. collect: poll the batch and merge results via build_complete_item/ItemWriter
+
+Requests that fail, or get no result because the batch failed, expired or
+was cancelled, are recorded as failed; running submit again resubmits
+just those.
+
+Data format:
+- data/batches/<name>/requests.jsonl: Batch API request lines (custom_id = item_id)
+- data/batches/<name>/resubmit.jsonl: failed request lines being resubmitted
+- data/batches/<name>/manifest.json: candidates, batch id, status, merged/failed item_ids
+- data/batches/<name>/output.jsonl: downloaded results and per-request errors
+
+The "local" backend is a file-based stand-in for the Batch API that answers
+requests offline, so the whole flow can be exercised without OpenAI.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import uuid
+from pathlib import Path
+from typing import Callable
+
+from openai import OpenAI
+
+from scripts.collect_candidates import collect_from_sources
+from scripts.fetch_content import fetch_and_extract
+from scripts.llm_client import (
+    ENRICHMENT_SCHEMA,
+    build_analysis_request,
+    build_system_prompt,
+    build_user_prompt,
+    compute_cache_key,
+    parse_enrichment,
+    response_cache,
+)
+from scripts.normalize import compute_item_id, normalize_url
+from scripts.store import (
+    ItemWriter,
+    build_complete_item,
+    load_index,
+    save_index,
+)
+from scripts.utils import (
+    BATCH_DIR,
+    OPENAI_API_KEY,
+    OPENAI_MODEL,
+    get_jst_now,
+    setup_logging,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Batch statuses after which no more results will arrive
+FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def get_batch_dir(name: str) -> Path:
+    """Get the working directory of a named batch."""
+    return BATCH_DIR / name
+
+
+def load_manifest(name: str) -> dict:
+    """
+    Load a batch manifest.
+
+    Args:
+        name: Batch name
+
+    Returns:
+        Manifest dict
+
+    Raises:
+        FileNotFoundError: If the batch has not been prepared
+    """
+    with open(get_batch_dir(name) / "manifest.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: dict) -> None:
+    """
+    Save a batch manifest atomically.
+
+    Args:
+        manifest: Manifest dict (must contain "name")
+    """
+    batch_dir = get_batch_dir(manifest["name"])
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = batch_dir / "manifest.json.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    tmp_path.replace(batch_dir / "manifest.json")
+
+
+def stub_responder(body: dict) -> dict:
+    """
+    Answer a request offline with a schema-valid placeholder result.
+
+    Args:
+        body: Chat completion request body
+
+    Returns:
+        Result dict matching ENRICHMENT_SCHEMA
+    """
+    user_prompt = body["messages"][-1]["content"]
+    title = "(不明)"
+    for line in user_prompt.splitlines():
+        if line.startswith("元タイトル: "):
+            title = line.removeprefix("元タイトル: ")
+            break
+
+    return {
+        "title": title,
+        "summary": f"{title}（ローカルバッチによる仮要約）",
+        "key_points": ["(要点なし)", "(要点なし)", "(要点なし)"],
+        "themes": [],
+        "tags": [],
+        "language": "unknown",
+        "published_at": None,
+        "reliability_score_delta": 0,
+        "reliability_reason": "ローカルバッチの仮結果",
+    }
+
+
+class OpenAIBatchBackend:
+    """OpenAI Batch API backend."""
+
+    def __init__(self, client: OpenAI | None = None):
+        """
+        Initialize backend.
+
+        Args:
+            client: OpenAI client (default: from OPENAI_API_KEY)
+        """
+        if client is None:
+            if not OPENAI_API_KEY:
+                raise ValueError("OpenAI API key is required")
+            client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = client
+
+    def submit(self, requests_path: Path) -> str:
+        """Upload the request file and create a batch; return the batch id."""
+        with open(requests_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        """Get the batch status."""
+        return self.client.batches.retrieve(batch_id).status
+
+    def download(self, batch_id: str, dest: Path) -> None:
+        """
+        Download the batch output and error files into one JSONL file.
+
+        Both files use the same line format. A batch that failed, expired or
+        was cancelled may have neither, which gives an empty file.
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        with open(dest, "wb") as f:
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if not file_id:
+                    continue
+                content = self.client.files.content(file_id).content
+                f.write(content)
+                if content and not content.endswith(b"\n"):
+                    f.write(b"\n")
+
+
+class LocalBatchBackend:
+    """
+    File-based stand-in for the Batch API.
+
+    A submitted batch is answered on the first status poll by calling the
+    responder for every request line, and its output is written in the
+    Batch API output format.
+    """
+
+    def __init__(self, root: Path, responder: Callable[[dict], dict] = stub_responder):
+        """
+        Initialize backend.
+
+        Args:
+            root: Directory holding local batches
+            responder: Maps a request body to a result dict
+        """
+        self.root = root
+        self.responder = responder
+
+    def submit(self, requests_path: Path) -> str:
+        """Copy the request file into a new local batch; return its id."""
+        batch_id = f"local_{uuid.uuid4().hex[:12]}"
+        batch_dir = self.root / batch_id
+        batch_dir.mkdir(parents=True, exist_ok=True)
+        (batch_dir / "input.jsonl").write_bytes(requests_path.read_bytes())
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        """Process the batch if needed and report it as completed."""
+        batch_dir = self.root / batch_id
+        output_path = batch_dir / "output.jsonl"
+        if output_path.exists():
+            return "completed"
+
+        lines = []
+        with open(batch_dir / "input.jsonl", "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                result = self.responder(request["body"])
+                lines.append(
+                    {
+                        "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                        "custom_id": request["custom_id"],
+                        "response": {
+                            "status_code": 200,
+                            "body": {
+                                "model": request["body"]["model"],
+                                "choices": [
+                                    {
+                                        "index": 0,
+                                        "message": {
+                                            "role": "assistant",
+                                            "content": json.dumps(result, ensure_ascii=False),
+                                        },
+                                    }
+                                ],
+                            },
+                        },
+                        "error": None,
+                    }
+                )
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        return "completed"
+
+    def download(self, batch_id: str, dest: Path) -> None:
+        """Copy the local batch output."""
+        dest.write_bytes((self.root / batch_id / "output.jsonl").read_bytes())
+
+
+def get_backend(name: str) -> OpenAIBatchBackend | LocalBatchBackend:
+    """
+    Get a batch backend by name.
+
+    Args:
+        name: "openai" or "local"
+
+    Returns:
+        Backend instance
+    """
+    if name == "local":
+        return LocalBatchBackend(BATCH_DIR / "_local")
+    return OpenAIBatchBackend()
+
+
+def prepare_batch(
+    source_group: str,
+    max_items: int,
+    name: str | None = None,
+    model: str | None = None,
+) -> dict:
+    """
+    Collect candidates, fetch content and write the batch request file.
+
+    Args:
+        source_group: "high" or "trend"
+        max_items: Maximum requests in the batch
+        name: Batch name (default: <group>-<timestamp>)
+        model: Model name (default: OPENAI_MODEL)
+
+    Returns:
+        Manifest dict
+    """
+    model = model or OPENAI_MODEL
+    name = name or f"{source_group}-{get_jst_now().strftime('%Y%m%d-%H%M%S')}"
+    batch_dir = get_batch_dir(name)
+    batch_dir.mkdir(parents=True, exist_ok=True)
+
+    index = load_index()
+    system_prompt = build_system_prompt()
+    candidates = collect_from_sources(source_group)
+
+    items = {}
+    with open(batch_dir / "requests.jsonl", "w", encoding="utf-8") as f:
+        for candidate in candidates:
+            if len(items) >= max_items:
+                break
+
+            url = candidate["url"]
+            item_id = compute_item_id(url)
+            if item_id in index or item_id in items:
+                continue
+
+            try:
+                content = fetch_and_extract(url, item_id, model) or ""
+            except Exception as e:
+                logger.warning(f"Fetch failed, batching without content: {url[:50]} ({e})")
+                content = ""
+
+            user_prompt = build_user_prompt(
+                content=content,
+                source_name=candidate["source_name"],
+                source_type=candidate["source_type"],
+                publisher=candidate["publisher"],
+                original_title=candidate["title"],
+                language=candidate["language"],
+            )
+            request = {
+                "custom_id": item_id,
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": build_analysis_request(model, system_prompt, user_prompt),
+            }
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+            items[item_id] = {
+                "candidate": dict(candidate),
+                "url_normalized": normalize_url(url),
+                "content_length": len(content),
+            }
+
+    manifest = {
+        "name": name,
+        "source_group": source_group,
+        "model": model,
+        "created_at": get_jst_now().isoformat(),
+        "backend": None,
+        "batch_id": None,
+        "status": "prepared",
+        "items": items,
+        "merged": [],
+        "failed": [],
+    }
+    save_manifest(manifest)
+
+    logger.info(f"Batch {name} prepared: {len(items)} requests")
+    return manifest
+
+
+def write_resubmit_file(manifest: dict) -> Path:
+    """
+    Write the request lines of a batch's failed items to resubmit.jsonl.
+
+    Args:
+        manifest: Manifest dict
+
+    Returns:
+        Path of the written file
+    """
+    batch_dir = get_batch_dir(manifest["name"])
+    failed = set(manifest["failed"])
+    resubmit_path = batch_dir / "resubmit.jsonl"
+    with open(batch_dir / "requests.jsonl", "r", encoding="utf-8") as src, open(
+        resubmit_path, "w", encoding="utf-8"
+    ) as dest:
+        for line in src:
+            if line.strip() and json.loads(line)["custom_id"] in failed:
+                dest.write(line)
+    return resubmit_path
+
+
+def submit_batch(name: str, backend_name: str = "openai") -> dict:
+    """
+    Submit a prepared batch, or resubmit the failed requests of a finished one.
+
+    A batch that is still running, or finished without failures, is left
+    alone.
+
+    Args:
+        name: Batch name
+        backend_name: "openai" or "local"
+
+    Returns:
+        Manifest dict
+    """
+    manifest = load_manifest(name)
+    batch_dir = get_batch_dir(name)
+    requests_path = batch_dir / "requests.jsonl"
+
+    if manifest["batch_id"]:
+        if manifest["status"] not in FINAL_STATUSES or not manifest["failed"]:
+            logger.info(f"Batch {name} already submitted: {manifest['batch_id']}")
+            return manifest
+        requests_path = write_resubmit_file(manifest)
+        # The previous output is merged; the next collect downloads the new one
+        (batch_dir / "output.jsonl").unlink(missing_ok=True)
+        logger.info(f"Batch {name}: resubmitting {len(manifest['failed'])} failed requests")
+
+    backend = get_backend(backend_name)
+    manifest["batch_id"] = backend.submit(requests_path)
+    manifest["backend"] = backend_name
+    manifest["status"] = "submitted"
+    manifest["failed"] = []
+    save_manifest(manifest)
+
+    logger.info(f"Batch {name} submitted: {manifest['batch_id']} ({backend_name})")
+    return manifest
+
+
+def merge_results(manifest: dict, output_path: Path) -> tuple[int, int]:
+    """
+    Merge batch output into the JSONL store and index.
+
+    Already merged items (or items that reached the index by another path)
+    are skipped, so the step can be rerun after an interruption. Items with
+    an error result, or no result at all, are recorded as failed.
+
+    Args:
+        manifest: Manifest dict (updated and saved as items are merged)
+        output_path: Downloaded batch output file
+
+    Returns:
+        Tuple of (merged_count, failed_count) for this call
+    """
+    index = load_index()
+    merged = set(manifest["merged"])
+    failed = set(manifest["failed"])
+    requests_by_id = {}
+    with open(get_batch_dir(manifest["name"]) / "requests.jsonl", "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                request = json.loads(line)
+                requests_by_id[request["custom_id"]] = request["body"]
+
+    merged_now = 0
+    failed_now = 0
+    answered = set()
+    writer = ItemWriter()
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            item_id = result["custom_id"]
+            answered.add(item_id)
+            entry = manifest["items"].get(item_id)
+
+            if entry is None or item_id in merged or item_id in index:
+                continue
+
+            response = result.get("response") or {}
+            try:
+                if result.get("error") or response.get("status_code") != 200:
+                    raise ValueError(result.get("error") or f"HTTP {response.get('status_code')}")
+
+                result_text = response["body"]["choices"][0]["message"]["content"]
+                enrichment = parse_enrichment(result_text)
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                logger.warning(f"Batch result failed for {entry['candidate']['url'][:50]}: {e}")
+                failed.add(item_id)
+                failed_now += 1
+                continue
+
+            # Let later synchronous runs reuse the paid-for response
+            body = requests_by_id.get(item_id)
+            if body is not None:
+                cache_key = compute_cache_key(
+                    body["model"],
+                    body["messages"][0]["content"],
+                    body["messages"][1]["content"],
+                    ENRICHMENT_SCHEMA,
+                )
+                response_cache.set(cache_key, result_text.encode("utf-8"))
+
+            candidate = entry["candidate"]
+            item = build_complete_item(
+                url=candidate["url"],
+                url_normalized=entry["url_normalized"],
+                item_id=item_id,
+                source_group=manifest["source_group"],
+                source_key=candidate["source_key"],
+                source_name=candidate["source_name"],
+                source_type=candidate["source_type"],
+                publisher=candidate["publisher"],
+                rss_title=candidate["title"],
+                rss_pub_date=candidate["pub_date"],
+                language=candidate["language"],
+                content_length=entry["content_length"],
+                enrichment=enrichment,
+            )
+            writer.add(index, item, candidate["source_name"])
+
+            merged.add(item_id)
+            failed.discard(item_id)
+            merged_now += 1
+
+            if not writer.pending:
+                # Items are on disk: record the progress
+                manifest["merged"] = sorted(merged)
+                save_manifest(manifest)
+
+    writer.close()
+
+    # A failed, expired or cancelled batch leaves some requests unanswered
+    for item_id in manifest["items"]:
+        if item_id not in answered and item_id not in merged and item_id not in index:
+            if item_id not in failed:
+                failed.add(item_id)
+                failed_now += 1
+
+    manifest["merged"] = sorted(merged)
+    manifest["failed"] = sorted(failed)
+    save_manifest(manifest)
+    save_index(index)
+
+    return merged_now, failed_now
+
+
+def collect_batch(name: str) -> dict:
+    """
+    Poll a submitted batch and merge its results once it has finished.
+
+    Args:
+        name: Batch name
+
+    Returns:
+        Manifest dict
+    """
+    manifest = load_manifest(name)
+    if not manifest["batch_id"]:
+        raise RuntimeError(f"Batch {name} has not been submitted")
+
+    backend = get_backend(manifest["backend"])
+    status = backend.status(manifest["batch_id"])
+    manifest["status"] = status
+    save_manifest(manifest)
+
+    if status not in FINAL_STATUSES:
+        logger.info(f"Batch {name} is {status}; try again later")
+        return manifest
+
+    output_path = get_batch_dir(name) / "output.jsonl"
+    if not output_path.exists():
+        backend.download(manifest["batch_id"], output_path)
+
+    merged_now, failed_now = merge_results(manifest, output_path)
+    logger.info(
+        f"Batch {name} {status}: merged {merged_now} items, {failed_now} failed "
+        f"({len(manifest['merged'])}/{len(manifest['items'])} merged in total)"
+    )
+    if manifest["failed"]:
+        logger.warning(
+            f"Batch {name}: {len(manifest['failed'])} requests failed; "
+            f"run submit again to resubmit them"
+        )
+    return manifest
+
+
+def main() -> int:
+    """CLI entry point."""
+    setup_logging()
+
+    parser = argparse.ArgumentParser(
+        description="EIC Batch API enrichment",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m scripts.batch_enrich prepare --group trend --name backfill-1
+  python -m scripts.batch_enrich submit --name backfill-1
+  python -m scripts.batch_enrich collect --name backfill-1
+  python -m scripts.batch_enrich submit --name backfill-1 --backend local
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    prepare_parser = subparsers.add_parser("prepare", help="Write the batch request file")
+    prepare_parser.add_argument("--group", choices=["high", "trend"], default="trend")
+    prepare_parser.add_argument("--max-items", type=int, default=200)
+    prepare_parser.add_argument("--name", type=str, default=None)
+    prepare_parser.add_argument("--model", type=str, default=None)
+
+    submit_parser = subparsers.add_parser("submit", help="Submit a prepared batch")
+    submit_parser.add_argument("--name", type=str, required=True)
+    submit_parser.add_argument("--backend", choices=["openai", "local"], default="openai")
+
+    collect_parser = subparsers.add_parser("collect", help="Poll and merge batch results")
+    collect_parser.add_argument("--name", type=str, required=True)
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "prepare":
+            prepare_batch(args.group, args.max_items, args.name, args.model)
+        elif args.command == "submit":
+            submit_batch(args.name, args.backend)
+        else:
+            collect_batch(args.name)
+    except Exception as e:
+        logger.error(f"Batch {args.command} failed: {e}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Compressed on-disk cache with TTL, size cap and LRU eviction.
+
+Layout:
+- <cache_dir>/<namespace>/<key[:2]>/<key>.z: 8-byte creation time + zlib payload
+
+Reads touch the entry's mtime, so eviction removes the least recently used
+entries first once the namespace grows past its size cap.
+"""
+
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<d")
+
+
+class DiskCache:
+    """Key/value byte cache stored as compressed files."""
+
+    def __init__(self, directory: Path, ttl_seconds: float, max_bytes: int):
+        """
+        Initialize disk cache.
+
+        Args:
+            directory: Namespace directory
+            ttl_seconds: Entry lifetime from creation
+            max_bytes: Total on-disk size before LRU eviction
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None
+
+    def _path(self, key: str) -> Path:
+        """Get the file path for a key."""
+        return self.directory / key[:2] / f"{key}.z"
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key (hex digest)
+
+        Returns:
+            Stored bytes, or None on miss or expiry
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            (created,) = _HEADER.unpack_from(raw)
+            if time.time() - created > self.ttl_seconds:
+                if self._remove(path):
+                    with self._lock:
+                        if self._total_bytes is not None:
+                            self._total_bytes -= len(raw)
+                value = None
+            else:
+                value = zlib.decompress(raw[_HEADER.size :])
+                os.utime(path)  # Mark as recently used
+        except (OSError, struct.error, zlib.error):
+            value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Store a value, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key (hex digest)
+            value: Bytes to store
+        """
+        path = self._path(key)
+        payload = _HEADER.pack(time.time()) + zlib.compress(value, 6)
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            old_size = path.stat().st_size if path.exists() else 0
+
+            # Write to a temp file and rename so readers never see partial entries
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning(f"Cache write failed for {key[:12]}: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                total = self._scan_size()  # The scan already counts this entry
+            else:
+                total = self._total_bytes + len(payload) - old_size
+            self._total_bytes = total
+            if total > self.max_bytes:
+                self._evict()
+
+    def _scan_size(self) -> int:
+        """Get the total size on disk (scanned once, then tracked)."""
+        if self._total_bytes is None:
+            self._total_bytes = sum(entry.stat().st_size for entry in self._entries())
+        return self._total_bytes
+
+    def _entries(self) -> list[Path]:
+        """List all entry files."""
+        if not self.directory.exists():
+            return []
+        return list(self.directory.glob("*/*.z"))
+
+    def _evict(self) -> None:
+        """Remove least recently used entries down to 90% of the cap."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+
+        self._total_bytes = total
+        logger.debug(f"Cache eviction in {self.directory.name}: removed {removed} entries")
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        """Delete an entry, ignoring races with other readers; True if this call removed it."""
+        try:
+            path.unlink()
+        except OSError:
+            return False
+        return True
+
+    def stats(self) -> str:
+        """Get a one-line hit/miss summary."""
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100) if lookups else 0.0
+        return f"{self.directory.name}: hits={self.hits} misses={self.misses} ({rate:.0f}% hit rate)"
@@ -2,23 +2,62 @@
 RSS feed collection from configured sources.
 
 Collects candidate URLs from High Trust and Trend sources.
+Feeds are fetched concurrently by a bounded thread pool with a per-host cap,
+using conditional GET (ETag / Last-Modified) against the persisted feed state.
+A per-source cursor (newest pub_date plus the item_ids seen at that instant)
+drops entries that earlier runs already yielded. When more unseen entries
+than MAX_ENTRIES_PER_SOURCE are waiting, the oldest ones after the cursor
+are yielded and the cursor stops at them, so the rest follow in later runs
+instead of falling behind the cursor (a source's first run only takes the
+first entries in feed order). Under a run deadline
+(scripts.deadline), sources are skipped once their estimated fetch time no
+longer fits.
 """
 
+import hashlib
+import html
 import logging
-from datetime import datetime, timedelta
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import TypedDict
+from urllib.parse import urlparse
 from zoneinfo import ZoneInfo
 
 import feedparser
 
+from scripts.deadline import RunDeadline
 from scripts.utils import (
-    EIC_TIMEZONE,
+    COLLECT_MAX_WORKERS,
+    COLLECT_PER_HOST_LIMIT,
+    FEED_FETCH_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    USER_AGENT,
     load_sources_config,
-    get_collection_window,
+    get_http_session,
+    get_jst_now,
 )
+from scripts.normalize import compute_item_id
 
 logger = logging.getLogger(__name__)
 
+# Maximum unseen entries yielded per source per run
+MAX_ENTRIES_PER_SOURCE = 30
+
+# Characters of the RSS summary kept on a candidate
+SUMMARY_MAX_CHARS = 500
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+# Request headers for feed downloads
+FEED_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+}
+
 
 class Candidate(TypedDict):
     """Candidate article from RSS feed."""
@@ -31,6 +70,22 @@ class Candidate(TypedDict):
     source_type: str
     publisher: str
     language: str
+    summary: str
+
+
+def entry_summary(entry: feedparser.FeedParserDict) -> str:
+    """
+    Get the RSS summary as plain text.
+
+    Args:
+        entry: feedparser entry
+
+    Returns:
+        Summary without markup, truncated to SUMMARY_MAX_CHARS (may be empty)
+    """
+    summary = getattr(entry, "summary", "") or ""
+    text = html.unescape(_TAG_PATTERN.sub(" ", summary))
+    return " ".join(text.split())[:SUMMARY_MAX_CHARS]
 
 
 def parse_pub_date(entry: feedparser.FeedParserDict) -> datetime | None:
@@ -60,35 +115,146 @@ def parse_pub_date(entry: feedparser.FeedParserDict) -> datetime | None:
     return None
 
 
-def collect_from_single_source(source: dict) -> list[Candidate]:
+def fetch_feed(url: str, previous: dict) -> tuple[bytes | None, dict]:
+    """
+    Download a feed with a conditional GET.
+
+    Args:
+        url: Feed URL
+        previous: Last stored state for this source (may be empty)
+
+    Returns:
+        Tuple of (feed bytes, new state). Bytes are None when the feed is
+        unchanged, either by a 304 response or an identical content hash.
+    """
+    headers = dict(FEED_HEADERS)
+    if previous.get("etag"):
+        headers["If-None-Match"] = previous["etag"]
+    if previous.get("last_modified"):
+        headers["If-Modified-Since"] = previous["last_modified"]
+
+    response = get_http_session().get(
+        url,
+        headers=headers,
+        timeout=(HTTP_CONNECT_TIMEOUT, FEED_FETCH_TIMEOUT),
+    )
+    checked_at = get_jst_now().isoformat()
+
+    if response.status_code == 304:
+        return None, {**previous, "checked_at": checked_at}
+
+    response.raise_for_status()
+
+    content = response.content
+    state = {
+        "etag": response.headers.get("ETag") or previous.get("etag"),
+        "last_modified": response.headers.get("Last-Modified") or previous.get("last_modified"),
+        "content_hash": hashlib.sha256(content).hexdigest(),
+        "checked_at": checked_at,
+    }
+
+    if state["content_hash"] == previous.get("content_hash"):
+        return None, state
+
+    return content, state
+
+
+def is_behind_cursor(pub_datetime: datetime | None, item_id: str, cursor: dict | None) -> bool:
+    """
+    Check whether an entry was already yielded by a previous run.
+
+    Entries without a publication date are never filtered here and are left
+    to the deduplication index.
+
+    Args:
+        pub_datetime: Entry publication datetime
+        item_id: SHA256 of the normalized entry URL
+        cursor: Stored cursor {pub_date, item_ids} or None
+
+    Returns:
+        True if the entry is older than (or at and already seen by) the cursor
+    """
+    if not cursor or pub_datetime is None:
+        return False
+
+    cursor_datetime = datetime.fromisoformat(cursor["pub_date"])
+    if pub_datetime < cursor_datetime:
+        return True
+    return pub_datetime == cursor_datetime and item_id in cursor.get("item_ids", [])
+
+
+def advance_cursor(cursor: dict | None, seen: list[tuple[datetime, str]]) -> dict | None:
+    """
+    Move the cursor to the newest entry seen in this run.
+
+    Args:
+        cursor: Stored cursor {pub_date, item_ids} or None
+        seen: (pub_datetime, item_id) pairs of the dated entries yielded
+
+    Returns:
+        Updated cursor, or the old one when nothing newer was seen
+    """
+    if not seen:
+        return cursor
+
+    newest = max(pub_datetime for pub_datetime, _ in seen)
+    item_ids = {item_id for pub_datetime, item_id in seen if pub_datetime == newest}
+
+    if cursor and datetime.fromisoformat(cursor["pub_date"]) == newest:
+        item_ids.update(cursor.get("item_ids", []))
+
+    return {"pub_date": newest.isoformat(), "item_ids": sorted(item_ids)}
+
+
+def collect_from_single_source(
+    source: dict,
+    feed_state: dict[str, dict] | None = None,
+) -> list[Candidate]:
     """
     Collect candidates from a single RSS source.
 
     Args:
         source: Source configuration dict
+        feed_state: Optional feed state store (source entry updated in place)
 
     Returns:
-        List of Candidate items
+        List of Candidate items (empty when the feed is unchanged)
     """
     candidates = []
     url = source.get("url", "")
+    source_key = source.get("key", "")
 
     if not url:
-        logger.warning(f"Source {source.get('key')} has no URL")
+        logger.warning(f"Source {source_key} has no URL")
         return candidates
 
+    previous = feed_state.get(source_key, {}) if feed_state is not None else {}
+    cursor = previous.get("cursor")
+
     try:
-        # Parse RSS feed
-        feed = feedparser.parse(url)
+        content, state = fetch_feed(url, previous)
+        state["cursor"] = cursor
+
+        if content is None:
+            logger.info(f"Feed unchanged, skipping parse: {source.get('name')}")
+            if feed_state is not None:
+                feed_state[source_key] = state
+            return candidates
+
+        # Parse RSS feed from the downloaded bytes
+        feed = feedparser.parse(
+            content,
+            response_headers={"content-location": url},
+        )
 
         if feed.bozo and not feed.entries:
             logger.warning(f"Failed to parse feed: {source.get('name')} - {feed.bozo_exception}")
             return candidates
 
-        # Get collection window for filtering
-        window_start, window_end = get_collection_window()
+        unseen = []
+        behind_cursor = 0
 
-        for entry in feed.entries[:30]:  # Limit per source
+        for entry in feed.entries:
             # Get entry URL
             entry_url = getattr(entry, "link", None)
             if not entry_url:
@@ -102,25 +268,55 @@ def collect_from_single_source(source: dict) -> list[Candidate]:
             # Parse publication date
             pub_datetime = parse_pub_date(entry)
 
+            # Drop entries already yielded by a previous run
+            item_id = compute_item_id(entry_url)
+            if is_behind_cursor(pub_datetime, item_id, cursor):
+                behind_cursor += 1
+                continue
+
             # Format pub_date as ISO string
             pub_date_str = None
             if pub_datetime:
                 pub_date_str = pub_datetime.isoformat()
 
-            candidates.append(
-                Candidate(
-                    url=entry_url,
-                    title=entry_title,
-                    pub_date=pub_date_str,
-                    source_key=source.get("key", ""),
-                    source_name=source.get("name", ""),
-                    source_type=source.get("source_type", "other"),
-                    publisher=source.get("publisher", ""),
-                    language=source.get("language", "unknown"),
-                )
+            candidate = Candidate(
+                url=entry_url,
+                title=entry_title,
+                pub_date=pub_date_str,
+                source_key=source.get("key", ""),
+                source_name=source.get("name", ""),
+                source_type=source.get("source_type", "other"),
+                publisher=source.get("publisher", ""),
+                language=source.get("language", "unknown"),
+                summary=entry_summary(entry),
+            )
+            unseen.append((pub_datetime, item_id, candidate))
+
+        held_back = max(0, len(unseen) - MAX_ENTRIES_PER_SOURCE)
+        if held_back:
+            if cursor:
+                # Oldest first, so the cursor never passes an entry that was held back
+                unseen.sort(key=lambda e: (e[0] is None, e[0].timestamp() if e[0] else 0.0))
+            # Without a cursor, the first entries in feed order form the initial window
+            unseen = unseen[:MAX_ENTRIES_PER_SOURCE]
+            logger.info(
+                f"{source.get('name')}: {held_back} unseen entries held back for the next run"
             )
 
-        logger.info(f"Collected {len(candidates)} candidates from {source.get('name')}")
+        candidates = [candidate for _, _, candidate in unseen]
+        state["cursor"] = advance_cursor(
+            cursor, [(pub_datetime, item_id) for pub_datetime, item_id, _ in unseen if pub_datetime]
+        )
+        if held_back and cursor:
+            # Drop the validators so the unchanged feed is parsed again next run
+            state.update(etag=None, last_modified=None, content_hash=None)
+        if feed_state is not None:
+            feed_state[source_key] = state
+
+        logger.info(
+            f"Collected {len(candidates)} candidates from {source.get('name')} "
+            f"({behind_cursor} behind cursor)"
+        )
 
     except Exception as e:
         logger.error(f"Error collecting from {source.get('name')}: {e}")
@@ -128,12 +324,57 @@ def collect_from_single_source(source: dict) -> list[Candidate]:
     return candidates
 
 
-def collect_from_sources(source_group: str) -> list[Candidate]:
+def _collect_timed(
+    source: dict,
+    host_slots: dict[str, threading.BoundedSemaphore],
+    feed_state: dict[str, dict] | None,
+    deadline: RunDeadline | None = None,
+) -> list[Candidate]:
+    """
+    Collect from a single source under its host's concurrency cap.
+
+    Args:
+        source: Source configuration dict
+        host_slots: Semaphore per feed host
+        feed_state: Optional feed state store
+        deadline: Optional run deadline (the source is skipped when out of time)
+
+    Returns:
+        List of Candidate items
+    """
+    host = urlparse(source.get("url", "")).netloc.lower()
+
+    with host_slots[host]:
+        if deadline is not None and not deadline.admit("source"):
+            logger.warning(f"Skipping {source.get('key')}: run deadline")
+            return []
+        start = time.monotonic()
+        candidates = collect_from_single_source(source, feed_state)
+        elapsed = time.monotonic() - start
+        if deadline is not None:
+            deadline.record("source", elapsed)
+
+    logger.info(
+        f"Source timing: {source.get('key')} "
+        f"({len(candidates)} candidates) in {elapsed:.2f}s"
+    )
+    return candidates
+
+
+def collect_from_sources(
+    source_group: str,
+    max_workers: int | None = None,
+    feed_state: dict[str, dict] | None = None,
+    deadline: RunDeadline | None = None,
+) -> list[Candidate]:
     """
     Collect candidates from all sources of a given group.
 
     Args:
         source_group: "high" or "trend"
+        max_workers: Feed fetch threads (default: COLLECT_MAX_WORKERS, 1 = serial)
+        feed_state: Optional feed state store for conditional GET
+        deadline: Optional run deadline for source admission
 
     Returns:
         List of all Candidate items, sorted by pub_date (newest first)
@@ -141,12 +382,41 @@ def collect_from_sources(source_group: str) -> list[Candidate]:
     sources = load_sources_config(source_group)
     all_candidates = []
 
-    logger.info(f"Collecting from {len(sources)} {source_group} sources...")
+    if max_workers is None:
+        max_workers = COLLECT_MAX_WORKERS
+    max_workers = max(1, min(max_workers, len(sources) or 1))
+
+    logger.info(
+        f"Collecting from {len(sources)} {source_group} sources "
+        f"({max_workers} workers)..."
+    )
 
-    for source in sources:
-        candidates = collect_from_single_source(source)
+    host_slots = {
+        urlparse(source.get("url", "")).netloc.lower(): threading.BoundedSemaphore(
+            max(1, COLLECT_PER_HOST_LIMIT)
+        )
+        for source in sources
+    }
+
+    start = time.monotonic()
+    if max_workers == 1:
+        results = [
+            _collect_timed(source, host_slots, feed_state, deadline) for source in sources
+        ]
+    else:
+        # map() yields in source order, so the final ordering matches serial runs
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collect") as pool:
+            results = list(
+                pool.map(
+                    lambda src: _collect_timed(src, host_slots, feed_state, deadline), sources
+                )
+            )
+
+    for candidates in results:
         all_candidates.extend(candidates)
 
+    logger.info(f"Collected {source_group} feeds in {time.monotonic() - start:.2f}s")
+
     # Sort by publication date (newest first)
     # Items without pub_date go to the end
     all_candidates.sort(
@@ -0,0 +1,174 @@
+"""
+Run-level deadline for the daily job.
+
+The workflow kills the job at its timeout, so the run tracks how much of
+its wall-clock budget is left. Each kind of work (a feed source, a
+pipeline item, the trend summary) has an EWMA cost estimate learned from
+what it actually took this run; new work is only admitted while its
+estimate fits before the reserved tail. The reserved slice is kept for
+saving the index and feed state, Discussions and Slack.
+
+Provides:
+- CostEstimator: EWMA duration per kind of work
+- RunDeadline: budget tracking and admission control
+- create_deadline: deadline from EIC_RUN_BUDGET / EIC_RUN_RESERVE
+"""
+
+import logging
+import threading
+import time
+
+from scripts.utils import RUN_BUDGET_SECONDS, RUN_RESERVE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Smoothing factor for cost estimates (weight of the newest sample)
+EWMA_ALPHA = 0.3
+
+# Estimates (seconds) used until a kind of work has been timed
+DEFAULT_COSTS = {
+    "source": 15.0,
+    "item": 45.0,
+    "summary": 20.0,
+}
+
+
+class CostEstimator:
+    """Thread-safe EWMA of observed durations per kind of work."""
+
+    def __init__(self, defaults: dict[str, float] | None = None, alpha: float = EWMA_ALPHA):
+        """
+        Initialize estimator.
+
+        Args:
+            defaults: Prior estimate per kind (default: DEFAULT_COSTS)
+            alpha: Weight of the newest sample
+        """
+        self.alpha = alpha
+        self._estimates = dict(DEFAULT_COSTS if defaults is None else defaults)
+        self._samples: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, seconds: float) -> None:
+        """Fold one observed duration into the estimate."""
+        with self._lock:
+            count = self._samples.get(kind, 0)
+            if count == 0:
+                self._estimates[kind] = seconds  # The first sample replaces the prior
+            else:
+                previous = self._estimates[kind]
+                self._estimates[kind] = previous + self.alpha * (seconds - previous)
+            self._samples[kind] = count + 1
+
+    def estimate(self, kind: str) -> float:
+        """Get the current estimate in seconds (0 for unknown kinds)."""
+        with self._lock:
+            return self._estimates.get(kind, 0.0)
+
+    def samples(self, kind: str) -> int:
+        """Get the number of durations recorded for a kind."""
+        with self._lock:
+            return self._samples.get(kind, 0)
+
+
+class RunDeadline:
+    """
+    Wall-clock budget for one run with admission control.
+
+    Work phases call admit() before starting a unit of work and record()
+    when it finishes. Once work_remaining() cannot cover a unit's estimate,
+    admit() refuses it, leaving the reserved slice for the final steps.
+    """
+
+    def __init__(
+        self,
+        budget_seconds: float,
+        reserve_seconds: float = RUN_RESERVE_SECONDS,
+        costs: CostEstimator | None = None,
+    ):
+        """
+        Initialize deadline.
+
+        Args:
+            budget_seconds: Total wall-clock budget from now
+            reserve_seconds: Tail kept for save, Discussions and Slack
+            costs: Cost estimator (default: fresh with DEFAULT_COSTS)
+        """
+        self.budget_seconds = budget_seconds
+        self.reserve_seconds = min(reserve_seconds, budget_seconds)
+        self.costs = costs or CostEstimator()
+        self.refused: dict[str, int] = {}
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        """Seconds since the run started."""
+        return time.monotonic() - self._start
+
+    def remaining(self) -> float:
+        """Seconds left in the whole budget."""
+        return self.budget_seconds - self.elapsed()
+
+    def work_remaining(self) -> float:
+        """Seconds left before the reserved slice begins."""
+        return self.remaining() - self.reserve_seconds
+
+    def admit(self, kind: str, reserved: bool = False) -> bool:
+        """
+        Decide whether a unit of work still fits.
+
+        Args:
+            kind: Kind of work ("source", "item", "summary", ...)
+            reserved: Work belonging to the reserved tail (measured against
+                the whole remaining budget instead of the work phase)
+
+        Returns:
+            True if the estimated cost fits in the time left
+        """
+        available = self.remaining() if reserved else self.work_remaining()
+        if available >= self.costs.estimate(kind):
+            return True
+        with self._lock:
+            self.refused[kind] = self.refused.get(kind, 0) + 1
+            first = self.refused[kind] == 1
+        if first:
+            logger.warning(
+                f"Deadline: not starting more {kind} work "
+                f"({available:.0f}s left, estimate {self.costs.estimate(kind):.0f}s)"
+            )
+        return False
+
+    def record(self, kind: str, seconds: float) -> None:
+        """Record the duration of a finished unit of work."""
+        self.costs.record(kind, seconds)
+
+    def log_stats(self) -> None:
+        """Log budget usage, cost estimates and refused work."""
+        logger.info(
+            f"Deadline: {self.elapsed():.0f}s of {self.budget_seconds:.0f}s used "
+            f"({self.remaining():.0f}s left, {self.reserve_seconds:.0f}s reserved)"
+        )
+        for kind in sorted(DEFAULT_COSTS):
+            if self.costs.samples(kind):
+                logger.info(
+                    f"  {kind}: ~{self.costs.estimate(kind):.1f}s "
+                    f"({self.costs.samples(kind)} timed)"
+                )
+        for kind, count in sorted(self.refused.items()):
+            logger.info(f"  {kind}: {count} refused")
+
+
+def create_deadline(budget_seconds: float | None = None) -> RunDeadline | None:
+    """
+    Create the run deadline.
+
+    Args:
+        budget_seconds: Budget override (default: EIC_RUN_BUDGET)
+
+    Returns:
+        RunDeadline, or None when the budget is 0 (unlimited)
+    """
+    budget = RUN_BUDGET_SECONDS if budget_seconds is None else budget_seconds
+    if budget <= 0:
+        return None
+    return RunDeadline(budget)
@@ -0,0 +1,71 @@
+"""
+Persistent per-source feed state for conditional GET.
+
+Data format:
+- data/feed_state.json: source_key -> {etag, last_modified, content_hash, checked_at}
+
+A source whose candidates were not all handled in a run is rolled back to
+its previous state, so the next run re-downloads the feed instead of
+receiving a 304 for entries that were never processed.
+"""
+
+import json
+import logging
+
+from scripts.utils import DATA_DIR, FEED_STATE_FILE
+
+logger = logging.getLogger(__name__)
+
+
+def load_feed_state() -> dict[str, dict]:
+    """
+    Load feed state store.
+
+    Returns:
+        Dict mapping source_key to its last fetch state
+    """
+    if not FEED_STATE_FILE.exists():
+        return {}
+
+    try:
+        with open(FEED_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        logger.warning(f"Failed to load feed state, starting fresh: {e}")
+        return {}
+
+
+def save_feed_state(state: dict[str, dict]) -> None:
+    """
+    Save feed state store.
+
+    Args:
+        state: The feed state dict to save
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(FEED_STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
+    logger.info(f"Feed state saved: {len(state)} sources")
+
+
+def rollback_sources(
+    state: dict[str, dict],
+    previous: dict[str, dict],
+    source_keys: set[str],
+) -> None:
+    """
+    Restore the previous state of sources with unprocessed candidates.
+
+    Args:
+        state: Current feed state (modified in place)
+        previous: Feed state as loaded at the start of the run
+        source_keys: Sources to roll back
+    """
+    for key in source_keys:
+        if key in previous:
+            state[key] = previous[key]
+        else:
+            state.pop(key, None)
+
+    if source_keys:
+        logger.info(f"Feed state rolled back for {len(source_keys)} sources: {sorted(source_keys)}")
@@ -1,27 +1,47 @@
 """
 Content fetching and extraction using trafilatura.
 
-Fetches HTML from URLs and extracts main article text.
+Fetches HTML from URLs and extracts main article text. Extraction runs in a
+process pool sized to the cores, with a per-document timeout that kills
+runaway parses. Raw HTML and extracted text are cached on disk by item_id.
 """
 
+import atexit
 import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
 
 import requests
 import trafilatura
 
+from scripts.cache import DiskCache
+from scripts.normalize import compute_item_id
+from scripts.resilience import CircuitOpenError, host_of, retry_with_backoff
+from scripts.token_budget import budget_content
 from scripts.utils import (
+    CACHE_DIR,
     CONTENT_FETCH_TIMEOUT,
     CONTENT_MAX_CHARS,
     CONTENT_MIN_CHARS,
-    retry_with_backoff,
+    EXTRACT_PROCESSES,
+    EXTRACT_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    OPENAI_MODEL,
+    PAGE_CACHE_MAX_BYTES,
+    PAGE_CACHE_TTL,
+    USER_AGENT,
+    get_http_session,
     truncate_text,
 )
 
 logger = logging.getLogger(__name__)
 
-# User-Agent for requests
-USER_AGENT = "Mozilla/5.0 (compatible; EIC-Bot/1.0; +https://github.com/eic-hr-analytics)"
-
 # Request headers
 DEFAULT_HEADERS = {
     "User-Agent": USER_AGENT,
@@ -30,8 +50,11 @@ DEFAULT_HEADERS = {
     "Accept-Encoding": "gzip, deflate",
 }
 
+# Page caches keyed by item_id (SHA256 of the normalized URL)
+html_cache = DiskCache(CACHE_DIR / "pages_html", PAGE_CACHE_TTL, PAGE_CACHE_MAX_BYTES)
+text_cache = DiskCache(CACHE_DIR / "pages_text", PAGE_CACHE_TTL, PAGE_CACHE_MAX_BYTES // 4)
+
 
-@retry_with_backoff(max_retries=2, base_delay=2.0, exceptions=(requests.RequestException,))
 def fetch_html(url: str) -> str | None:
     """
     Fetch HTML content from URL.
@@ -43,10 +66,28 @@ def fetch_html(url: str) -> str | None:
         HTML content as string, or None on failure
     """
     try:
-        response = requests.get(
+        return _get_html(url)
+    except requests.Timeout:
+        logger.warning(f"Timeout fetching {url[:50]}")
+        return None
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping {url[:50]}: {e}")
+        return None
+
+
+@retry_with_backoff(
+    max_retries=2,
+    base_delay=2.0,
+    exceptions=(requests.RequestException,),
+    circuit=host_of,
+)
+def _get_html(url: str) -> str | None:
+    """Fetch HTML once (retried on retryable errors, per-host circuit breaker)."""
+    try:
+        response = get_http_session().get(
             url,
             headers=DEFAULT_HEADERS,
-            timeout=CONTENT_FETCH_TIMEOUT,
+            timeout=(HTTP_CONNECT_TIMEOUT, CONTENT_FETCH_TIMEOUT),
             allow_redirects=True,
         )
         response.raise_for_status()
@@ -59,9 +100,6 @@ def fetch_html(url: str) -> str | None:
 
         return response.text
 
-    except requests.Timeout:
-        logger.warning(f"Timeout fetching {url[:50]}")
-        return None
     except requests.RequestException as e:
         logger.warning(f"Request error for {url[:50]}: {e}")
         raise  # Re-raise for retry decorator
@@ -70,56 +108,291 @@ def fetch_html(url: str) -> str | None:
         return None
 
 
-def extract_content(html: str) -> str | None:
+def _extract_text(html: str) -> str | None:
     """
-    Extract main content from HTML using trafilatura.
+    Run trafilatura on one document (executed in a worker process).
+
+    The primary extractor runs first; the fallback chain only runs when it
+    yields nothing usable.
 
     Args:
         html: Raw HTML content
 
     Returns:
-        Extracted text content, or None if extraction fails
+        Raw extracted text, or None
     """
-    try:
-        content = trafilatura.extract(
-            html,
-            include_comments=False,
-            include_tables=True,
-            no_fallback=False,
-            favor_precision=True,
-        )
+    options = {
+        "include_comments": False,
+        "include_tables": True,
+        "favor_precision": True,
+    }
+
+    # Fast path: skip the fallback extractors when the primary one succeeds
+    content = trafilatura.extract(html, no_fallback=True, **options)
+    if content and len(content) >= CONTENT_MIN_CHARS:
+        return content
+
+    return trafilatura.extract(html, no_fallback=False, **options)
 
-        if not content:
-            return None
 
-        # Clean up whitespace
-        content = " ".join(content.split())
+def _report_pid(pids: multiprocessing.SimpleQueue) -> None:
+    """Pool initializer: tell the parent this worker's PID so it can be killed."""
+    pids.put(os.getpid())
 
+
+class ExtractionEngine:
+    """
+    Process-pool trafilatura extraction with per-document timeouts.
+
+    A document that exceeds the timeout has its pool killed and replaced;
+    documents that were sharing the killed pool are resubmitted once. At
+    most one document per worker is in the pool at a time, so the timeout
+    never includes time spent queued behind other documents.
+    """
+
+    def __init__(self, processes: int = EXTRACT_PROCESSES, timeout: float = EXTRACT_TIMEOUT):
+        """
+        Initialize extraction engine.
+
+        Args:
+            processes: Worker processes (0 = extract in the calling thread)
+            timeout: Per-document timeout in seconds
+        """
+        self.processes = processes
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._pids: multiprocessing.SimpleQueue | None = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(processes, 1))
+        self.pages = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _get_executor(self) -> tuple[ProcessPoolExecutor, int]:
+        """Get the current pool, starting one if needed."""
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs I/O threads is unsafe
+                context = multiprocessing.get_context("spawn")
+                self._pids = context.SimpleQueue()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=context,
+                    initializer=_report_pid,
+                    initargs=(self._pids,),
+                )
+            return self._executor, self._generation
+
+    def _reset(self, generation: int) -> None:
+        """Kill and discard the pool of the given generation."""
+        with self._lock:
+            if self._executor is None or generation != self._generation:
+                return  # Already replaced by another thread
+            executor, pids = self._executor, self._pids
+            self._executor = self._pids = None
+            self._generation += 1
+
+        # ProcessPoolExecutor cannot cancel a running task, so kill its workers
+        while not pids.empty():
+            try:
+                os.kill(pids.get(), getattr(signal, "SIGKILL", signal.SIGTERM))
+            except ProcessLookupError:
+                pass  # Already exited
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, html: str) -> str | None:
+        """Extract one document in the pool, enforcing the timeout."""
+        if self.processes <= 0:
+            return _extract_text(html)
+
+        # Wait for a free worker here, so the timeout only covers extraction
+        with self._slots:
+            for _ in range(2):
+                executor, generation = self._get_executor()
+                try:
+                    future = executor.submit(_extract_text, html)
+                    return future.result(timeout=self.timeout)
+                except FuturesTimeout:
+                    with self._lock:
+                        self.timeouts += 1
+                    self._reset(generation)
+                    raise
+                except BrokenProcessPool:
+                    # Killed because of another document's timeout; retry once
+                    self._reset(generation)
+
+        return None
+
+    def extract(self, html: str, url: str = "") -> str | None:
+        """
+        Extract main content from HTML.
+
+        Args:
+            html: Raw HTML content
+            url: The article URL (for logging)
+
+        Returns:
+            Raw extracted text, or None if extraction fails or times out
+        """
+        start = time.monotonic()
+        try:
+            content = self._run(html)
+        except FuturesTimeout:
+            logger.warning(f"Extraction timed out after {self.timeout:.0f}s: {url[:50]}")
+            content = None
+        except Exception as e:
+            logger.error(f"Extraction error: {e}")
+            content = None
+
+        elapsed = time.monotonic() - start
+        with self._lock:
+            self.pages += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+        logger.info(f"Extraction took {elapsed:.2f}s ({len(content or '')} chars): {url[:50]}")
         return content
 
-    except Exception as e:
-        logger.error(f"Extraction error: {e}")
+    def log_stats(self) -> None:
+        """Log extraction timing totals."""
+        if not self.pages:
+            return
+        logger.info(
+            f"Extraction: {self.pages} pages, avg {self.total_seconds / self.pages:.2f}s, "
+            f"max {self.max_seconds:.2f}s, timeouts={self.timeouts}"
+        )
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        with self._lock:
+            executor = self._executor
+            self._executor = self._pids = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_engine: ExtractionEngine | None = None
+_engine_lock = threading.Lock()
+
+
+def get_extraction_engine() -> ExtractionEngine:
+    """Get the shared extraction engine."""
+    global _engine
+
+    with _engine_lock:
+        if _engine is None:
+            _engine = ExtractionEngine()
+            atexit.register(_engine.close)
+        return _engine
+
+
+def extract_content(html: str, url: str = "") -> str | None:
+    """
+    Extract main content from HTML using trafilatura.
+
+    Args:
+        html: Raw HTML content
+        url: The article URL (for logging)
+
+    Returns:
+        Extracted text content, or None if extraction fails
+    """
+    content = get_extraction_engine().extract(html, url)
+
+    if not content:
         return None
 
+    # Clean up whitespace, keeping paragraph breaks for token budgeting
+    content = "\n".join(" ".join(line.split()) for line in content.splitlines() if line.strip())
+
+    return content
 
-def fetch_and_extract(url: str) -> str | None:
+
+def fetch_page(url: str, item_id: str) -> tuple[str | None, str | None]:
     """
-    Fetch URL and extract main content.
+    Get a page from the cache or the network.
 
     Args:
         url: The article URL
+        item_id: SHA256 of the normalized URL
 
     Returns:
-        Extracted and trimmed text content, or None on failure
+        Tuple of (html, extracted_text). Cached extracted text is returned
+        without HTML; otherwise HTML is returned and text is None.
     """
-    # Fetch HTML
+    text = text_cache.get(item_id)
+    if text is not None:
+        logger.debug(f"Text cache hit: {url[:50]}")
+        return None, text.decode("utf-8")
+
+    html = html_cache.get(item_id)
+    if html is not None:
+        logger.debug(f"HTML cache hit: {url[:50]}")
+        return html.decode("utf-8"), None
+
     html = fetch_html(url)
-    if not html:
+    if html:
+        html_cache.set(item_id, html.encode("utf-8"))
+    return html, None
+
+
+def fetch_and_extract(
+    url: str,
+    item_id: str | None = None,
+    model: str = OPENAI_MODEL,
+) -> str | None:
+    """
+    Fetch URL and extract main content, consulting the page cache first.
+
+    Args:
+        url: The article URL
+        item_id: SHA256 of the normalized URL (computed if omitted)
+        model: Model whose token budget applies to the content
+
+    Returns:
+        Extracted and trimmed text content, or None on failure
+    """
+    if item_id is None:
+        item_id = compute_item_id(url)
+
+    # Fetch HTML (or cached text)
+    html, text = fetch_page(url, item_id)
+    if not html and text is None:
         logger.warning(f"No HTML content from {url[:50]}")
         return None
 
-    # Extract content
-    content = extract_content(html)
+    return prepare_content(html, url, item_id, text, model)
+
+
+def prepare_content(
+    html: str | None,
+    url: str,
+    item_id: str | None = None,
+    text: str | None = None,
+    model: str = OPENAI_MODEL,
+) -> str | None:
+    """
+    Extract main content from fetched HTML and trim it for the LLM.
+
+    Args:
+        html: Raw HTML content (unused when text is given)
+        url: The article URL (for logging)
+        item_id: SHA256 of the normalized URL, enables the text cache
+        text: Previously extracted text from the cache
+        model: Model whose token budget applies to the content
+
+    Returns:
+        Extracted and trimmed text content, or None on failure
+    """
+    content = text
+    if content is None and html:
+        # Extract content
+        content = extract_content(html, url)
+        if content and item_id:
+            text_cache.set(item_id, content.encode("utf-8"))
+
     if not content:
         logger.warning(f"No content extracted from {url[:50]}")
         return None
@@ -129,8 +402,14 @@ def fetch_and_extract(url: str) -> str | None:
         logger.warning(f"Content too short ({len(content)} chars) from {url[:50]}")
         return None
 
-    # Truncate to max length
+    # Hard cap before tokenizing, then fit the model's token budget
     content = truncate_text(content, CONTENT_MAX_CHARS)
+    content = budget_content(content, model)
 
     logger.debug(f"Extracted {len(content)} chars from {url[:50]}")
     return content
+
+
+def log_cache_stats() -> None:
+    """Log page cache hit/miss counts."""
+    logger.info(f"Page cache: {html_cache.stats()}; {text_cache.stats()}")
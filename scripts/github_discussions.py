@@ -11,12 +11,13 @@ from typing import TypedDict
 
 import requests
 
+from scripts.resilience import retry_with_backoff
 from scripts.utils import (
     GITHUB_TOKEN,
     GITHUB_REPO_OWNER,
     GITHUB_REPO_NAME,
     get_discussions_category_id,
-    retry_with_backoff,
+    get_http_session,
 )
 
 logger = logging.getLogger(__name__)
@@ -48,7 +49,12 @@ def _get_headers() -> dict[str, str]:
     }
 
 
-@retry_with_backoff(max_retries=3, base_delay=2.0, exceptions=(requests.RequestException,))
+@retry_with_backoff(
+    max_retries=3,
+    base_delay=2.0,
+    exceptions=(requests.RequestException,),
+    circuit="github",
+)
 def _graphql_request(query: str, variables: dict | None = None) -> dict:
     """
     Execute GraphQL request against GitHub API.
@@ -67,11 +73,10 @@ def _graphql_request(query: str, variables: dict | None = None) -> dict:
     if variables:
         payload["variables"] = variables
 
-    response = requests.post(
+    response = get_http_session().post(
         GITHUB_GRAPHQL_URL,
         json=payload,
         headers=_get_headers(),
-        timeout=30,
     )
     response.raise_for_status()
 
@@ -175,6 +180,7 @@ def create_daily_discussion(date_str: str, stats: dict | None = None) -> Discuss
     high_count = stats.get("high_count", 0)
     trend_count = stats.get("trend_count", 0)
     duplicates = stats.get("duplicates", 0)
+    screened = stats.get("screened", 0)
     errors = stats.get("errors", [])
 
     body_lines = [
@@ -189,6 +195,9 @@ def create_daily_discussion(date_str: str, stats: dict | None = None) -> Discuss
         f"- **重複スキップ**: {duplicates}件",
     ]
 
+    if screened:
+        body_lines.append(f"- **関連性スクリーニング除外**: {screened}件")
+
     if errors:
         body_lines.extend([
             "",
@@ -0,0 +1,334 @@
+"""
+Binary membership index for deduplication.
+
+Dedup only needs "has this item_id been seen?", so the item_ids are kept in
+a compact sorted file next to the JSON snapshot. The file is memory-mapped
+and searched in place; the JSON metadata (title, source, first_seen) is
+parsed only when something actually reads it.
+
+Data format (data/index.ids, little-endian):
+- Header: magic "EICIDX02", count (u64), bloom bits (u64, 0 = none),
+  size and mtime (ns) of the index.json it was built from (u64 each),
+  SHA256 of those index.json bytes (32 bytes)
+- count sorted 32-byte item_id digests
+- Bloom filter bit array (bloom bits / 8 bytes)
+
+Freshness is checked from the snapshot's size and mtime, so startup does
+not read index.json. Only when the size matches but the mtime does not
+(e.g. after a git checkout) is the snapshot hashed; a matching hash just
+re-stamps the header. Otherwise the file is rebuilt from the snapshot.
+
+Provides:
+- IdSet: memory-mapped sorted digests with optional Bloom filter
+- write_id_file: build the binary index for a set of item_ids
+- ItemIndex: dict-like index with binary membership and lazy metadata
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator, MutableMapping
+from pathlib import Path
+
+from scripts.utils import INDEX_BLOOM_ENABLED
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"EICIDX02"
+_HEADER = struct.Struct("<8sQQQQ32s")
+_STAMP = struct.Struct("<QQ")
+_STAMP_OFFSET = 24  # After magic, count and bloom bits
+DIGEST_SIZE = 32
+
+# Bloom filter sizing: ~10 bits per id with 7 probes gives ~1% false positives
+BLOOM_BITS_PER_ID = 10
+BLOOM_HASHES = 7
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file in chunks without loading it whole."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_stamp(path: Path) -> tuple[int, int]:
+    """Get the (size, mtime_ns) of a snapshot file."""
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _bloom_positions(digest: bytes, bits: int) -> list[int]:
+    """Bit positions of a digest; the digest is already uniform, so slices of it serve as hashes."""
+    return [
+        int.from_bytes(digest[4 * i : 4 * i + 4], "little") % bits for i in range(BLOOM_HASHES)
+    ]
+
+
+def write_id_file(
+    path: Path,
+    item_ids: Iterable[str],
+    snapshot_path: Path,
+    snapshot_sha256: str | None = None,
+    bloom: bool = INDEX_BLOOM_ENABLED,
+) -> int:
+    """
+    Write the binary index for a set of item_ids (temp file + rename).
+
+    Args:
+        path: Output path (data/index.ids)
+        item_ids: Hex SHA256 item_ids
+        snapshot_path: The index.json these ids come from (already written)
+        snapshot_sha256: Hex SHA256 of its bytes (hashed from the file if omitted)
+        bloom: Append a Bloom filter
+
+    Returns:
+        Number of ids written
+    """
+    digests = sorted({bytes.fromhex(item_id) for item_id in item_ids})
+
+    bloom_bits = 0
+    bloom_bytes = b""
+    if bloom and digests:
+        bloom_bits = -(-len(digests) * BLOOM_BITS_PER_ID // 8) * 8
+        bit_array = bytearray(bloom_bits // 8)
+        for digest in digests:
+            for position in _bloom_positions(digest, bloom_bits):
+                bit_array[position >> 3] |= 1 << (position & 7)
+        bloom_bytes = bytes(bit_array)
+
+    if snapshot_sha256 is None:
+        snapshot_sha256 = file_sha256(snapshot_path)
+    size, mtime_ns = snapshot_stamp(snapshot_path)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                _MAGIC, len(digests), bloom_bits, size, mtime_ns, bytes.fromhex(snapshot_sha256)
+            )
+        )
+        f.write(b"".join(digests))
+        f.write(bloom_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(digests)
+
+
+class IdSet:
+    """Read-only memory-mapped view of a binary index file."""
+
+    def __init__(self, path: Path):
+        """
+        Map an index file.
+
+        Args:
+            path: Path to data/index.ids
+
+        Raises:
+            ValueError: If the file is not a valid index
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size:
+            self.close()
+            raise ValueError("truncated header")
+        (
+            magic,
+            self.count,
+            self.bloom_bits,
+            self.snapshot_size,
+            self.snapshot_mtime_ns,
+            snapshot_digest,
+        ) = _HEADER.unpack_from(self._mm, 0)
+        expected = _HEADER.size + self.count * DIGEST_SIZE + self.bloom_bits // 8
+        if magic != _MAGIC or len(self._mm) != expected:
+            self.close()
+            raise ValueError("bad magic or size")
+
+        self.snapshot_sha256 = snapshot_digest.hex()
+        self._bloom_offset = _HEADER.size + self.count * DIGEST_SIZE
+
+    @classmethod
+    def open(cls, path: Path) -> "IdSet | None":
+        """Map an index file, or return None if it is missing or invalid."""
+        if not path.exists():
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring invalid {path.name}: {e}")
+            return None
+
+    def is_fresh(self, snapshot_path: Path) -> bool:
+        """
+        Check that this file was built from the current snapshot.
+
+        Size and mtime decide without reading the snapshot. If only the
+        mtime differs, the snapshot is hashed once and, when it matches,
+        the new mtime is recorded in the header.
+        """
+        size, mtime_ns = snapshot_stamp(snapshot_path)
+        if size != self.snapshot_size:
+            return False
+        if mtime_ns == self.snapshot_mtime_ns:
+            return True
+        if file_sha256(snapshot_path) != self.snapshot_sha256:
+            return False
+        try:
+            with open(self.path, "r+b") as f:
+                f.seek(_STAMP_OFFSET)
+                f.write(_STAMP.pack(size, mtime_ns))
+            self.snapshot_mtime_ns = mtime_ns
+        except OSError as e:
+            logger.debug(f"Could not re-stamp {self.path.name}: {e}")
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, item_id: object) -> bool:
+        try:
+            digest = bytes.fromhex(item_id)  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return False
+        if len(digest) != DIGEST_SIZE or not self.count:
+            return False
+
+        mm = self._mm
+        if self.bloom_bits:
+            for position in _bloom_positions(digest, self.bloom_bits):
+                if not mm[self._bloom_offset + (position >> 3)] & (1 << (position & 7)):
+                    return False
+
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            offset = _HEADER.size + mid * DIGEST_SIZE
+            probe = mm[offset : offset + DIGEST_SIZE]
+            if probe < digest:
+                low = mid + 1
+            elif probe > digest:
+                high = mid
+            else:
+                return True
+        return False
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mm.close()
+
+
+class ItemIndex(MutableMapping):
+    """
+    Deduplication index: item_id -> {first_seen, source, title}.
+
+    Membership of snapshot ids is answered from the binary index; entries
+    added since the snapshot live in memory. The snapshot metadata is only
+    parsed when an entry is read, iterated or saved.
+    """
+
+    def __init__(self, snapshot_path: Path, ids_path: Path):
+        """
+        Open the index.
+
+        Args:
+            snapshot_path: Path to data/index.json
+            ids_path: Path to data/index.ids (rebuilt when missing or stale)
+        """
+        self.snapshot_path = snapshot_path
+        self.ids_path = ids_path
+        self._ids: IdSet | None = None
+        self._meta: dict[str, dict] | None = None
+        self._added: dict[str, dict] = {}
+        self._removed = False
+
+        if not snapshot_path.exists():
+            self._meta = {}
+            return
+
+        ids = IdSet.open(ids_path)
+        if ids is not None and ids.is_fresh(snapshot_path):
+            self._ids = ids
+            return
+
+        if ids is not None:
+            ids.close()
+        meta = self.metadata
+        if meta:
+            count = write_id_file(ids_path, meta, snapshot_path)
+            logger.info(f"Rebuilt {ids_path.name}: {count} ids")
+
+    @property
+    def metadata(self) -> dict[str, dict]:
+        """Snapshot metadata (parsed on first access)."""
+        if self._meta is None:
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    self._meta = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Failed to load index snapshot, rebuilding: {e}")
+                self._meta = {}
+        return self._meta
+
+    @property
+    def dirty(self) -> bool:
+        """Whether entries were added or removed since the snapshot."""
+        return bool(self._added) or self._removed
+
+    def _in_snapshot(self, item_id: object) -> bool:
+        if self._meta is not None:
+            return item_id in self._meta
+        return self._ids is not None and item_id in self._ids
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._added or self._in_snapshot(item_id)
+
+    def __getitem__(self, item_id: str) -> dict:
+        if item_id in self._added:
+            return self._added[item_id]
+        return self.metadata[item_id]
+
+    def __setitem__(self, item_id: str, entry: dict) -> None:
+        self._added[item_id] = entry
+
+    def __delitem__(self, item_id: str) -> None:
+        found = self._added.pop(item_id, None) is not None
+        if item_id in self.metadata:
+            del self.metadata[item_id]
+            found = True
+        if not found:
+            raise KeyError(item_id)
+        self._removed = True
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.metadata
+        yield from (item_id for item_id in self._added if item_id not in self.metadata)
+
+    def __len__(self) -> int:
+        if self._meta is None and self._ids is not None:
+            base = len(self._ids)
+        else:
+            base = len(self.metadata)
+        return base + sum(1 for item_id in self._added if not self._in_snapshot(item_id))
+
+    def to_dict(self) -> dict[str, dict]:
+        """Get the full index (parses the snapshot metadata)."""
+        return {**self.metadata, **self._added}
+
+    def mark_saved(self, snapshot: dict[str, dict]) -> None:
+        """Adopt a just-written snapshot as the new base."""
+        self._meta = snapshot
+        self._added = {}
+        self._removed = False
+        if self._ids is not None:
+            self._ids.close()
+            self._ids = None
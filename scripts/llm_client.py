@@ -1,20 +1,66 @@
 """
 OpenAI Responses API client with JSON Schema strict mode.
 
-Analyzes articles and returns structured enrichment data.
+Analyzes articles and returns structured enrichment data. Responses are
+cached on disk by hash(model, system prompt, user prompt, schema), and all
+requests share one RPM/TPM token-bucket limiter.
+
+Prompts are laid out for provider-side prompt caching: the system prompt
+is a byte-stable prefix built only from themes.yaml, everything
+article-specific goes in the trailing user message, and requests carry a
+prompt_cache_key derived from the prefix. Cached-token usage is read from
+every response and reported per run.
+
+Several short articles can be packed into one request with an array
+variant of the schema; a malformed packed response falls back to one call
+per article.
+
+With the model cascade enabled, articles go to OPENAI_CHEAP_MODEL first and
+only low-confidence results (see escalation_reason) are re-run on the
+client's model. Tier mix, latency and cost are reported per run.
+
+Provides:
+- LLMClient: synchronous client
+- AsyncLLMClient: AsyncOpenAI-based client with bounded concurrency
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import threading
+import time
 from dataclasses import dataclass
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI, RateLimitError
 
+from scripts.cache import DiskCache
+from scripts.rate_limit import RateLimiter
+from scripts.resilience import (
+    full_jitter_delay,
+    get_breaker,
+    is_retryable,
+    record_outcome,
+    retry_after_seconds,
+    retry_budget,
+    retry_with_backoff,
+)
+from scripts.token_budget import count_tokens
 from scripts.utils import (
+    CASCADE_MIN_CONTENT_CHARS,
+    LLM_CASCADE_ENABLED,
+    OPENAI_CHEAP_MODEL,
+    CACHE_DIR,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_TTL,
+    MODEL_PRICING,
     OPENAI_API_KEY,
+    OPENAI_MAX_CONCURRENCY,
     OPENAI_MODEL,
+    OPENAI_RPM_LIMIT,
+    OPENAI_TPM_LIMIT,
     load_themes_config,
-    retry_with_backoff,
 )
 
 logger = logging.getLogger(__name__)
@@ -83,6 +129,42 @@ ENRICHMENT_SCHEMA = {
     },
 }
 
+# Array variant for several articles per request; article_id maps results back
+PACKED_ENRICHMENT_SCHEMA = {
+    "name": "enriched_items",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {
+            "items": {
+                "type": "array",
+                "items": {
+                    **ENRICHMENT_SCHEMA["schema"],
+                    "properties": {
+                        "article_id": {
+                            "type": "integer",
+                            "description": "Number of the article in the request (1-based)",
+                        },
+                        **ENRICHMENT_SCHEMA["schema"]["properties"],
+                    },
+                    "required": ["article_id"] + ENRICHMENT_SCHEMA["schema"]["required"],
+                },
+            },
+        },
+        "required": ["items"],
+    },
+}
+
+# Completion budget per article analysis
+ANALYSIS_MAX_TOKENS = 2000
+
+# Response cache shared by all clients
+response_cache = DiskCache(CACHE_DIR / "llm", LLM_CACHE_TTL, LLM_CACHE_MAX_BYTES)
+
+# Request/token rate limiter shared by all clients
+openai_limiter = RateLimiter(OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT)
+
 
 @dataclass
 class EnrichedItem:
@@ -97,10 +179,11 @@ class EnrichedItem:
     published_at: str | None
     reliability_score_delta: int
     reliability_reason: str
+    delta_out_of_range: bool = False
 
 
 def build_themes_list() -> str:
-    """Build themes list string for system prompt."""
+    """Build themes list string for system prompt (stable across runs)."""
     config = load_themes_config()
     themes = config.get("themes", [])
 
@@ -169,6 +252,34 @@ def build_system_prompt() -> str:
 """
 
 
+PACKED_INSTRUCTIONS = """
+## 複数記事の一括分析
+- 「# 記事 N」で区切られた複数の記事が与えられます
+- 記事ごとに独立して分析し、itemsに記事1件につき1要素を出力してください
+- article_idには記事番号Nを入れてください（すべての記事を1回ずつ）
+"""
+
+
+def build_packed_system_prompt() -> str:
+    """Build system prompt for packed analysis (single-article prompt as prefix)."""
+    return build_system_prompt() + PACKED_INSTRUCTIONS
+
+
+def build_packed_user_prompt(user_prompts: list[str]) -> str:
+    """
+    Join per-article user prompts into one packed prompt.
+
+    Args:
+        user_prompts: Prompts from build_user_prompt, in article order
+
+    Returns:
+        Packed user prompt with numbered article sections
+    """
+    return "\n".join(
+        f"# 記事 {number}\n{prompt}" for number, prompt in enumerate(user_prompts, 1)
+    )
+
+
 def build_user_prompt(
     content: str,
     source_name: str,
@@ -190,6 +301,319 @@ def build_user_prompt(
 """
 
 
+def prompt_fingerprint(system_prompt: str, schema: dict = ENRICHMENT_SCHEMA) -> str:
+    """
+    Fingerprint the static prompt prefix.
+
+    Args:
+        system_prompt: System prompt text
+        schema: Response JSON schema sent with the prompt
+
+    Returns:
+        Short hex digest, identical across runs while themes.yaml is unchanged
+    """
+    payload = system_prompt + json.dumps(schema, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def build_analysis_request(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    schema: dict = ENRICHMENT_SCHEMA,
+    max_tokens: int = ANALYSIS_MAX_TOKENS,
+) -> dict:
+    """
+    Build chat.completions.create arguments for an article analysis.
+
+    The static parts (system prompt, schema) come first and the article
+    last, so consecutive requests share the longest possible prefix.
+
+    Args:
+        model: Model name
+        system_prompt: System prompt text
+        user_prompt: User prompt text
+        schema: Response JSON schema
+        max_tokens: Completion budget
+
+    Returns:
+        Request body dict (also used as the Batch API line body)
+    """
+    # Use Chat Completions API with structured outputs
+    # (OpenAI Responses API may use different syntax)
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": schema,
+        },
+        "temperature": 0.3,
+        "max_tokens": max_tokens,
+        "prompt_cache_key": f"eic-enrich-{prompt_fingerprint(system_prompt, schema)}",
+    }
+
+
+def create_kwargs(request: dict) -> dict:
+    """
+    Convert a request body into SDK keyword arguments.
+
+    prompt_cache_key is sent through extra_body so older SDK versions
+    that lack the parameter still accept it.
+
+    Args:
+        request: Request body from build_analysis_request
+
+    Returns:
+        Keyword arguments for chat.completions.create
+    """
+    kwargs = dict(request)
+    cache_key = kwargs.pop("prompt_cache_key", None)
+    if cache_key:
+        kwargs["extra_body"] = {"prompt_cache_key": cache_key}
+    return kwargs
+
+
+class UsageStats:
+    """Thread-safe token usage and cost accounting per model."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self._lock = threading.Lock()
+        self._models: dict[str, dict[str, int]] = {}
+        self._tiers: dict[str, int] = {}
+
+    def record(self, model: str, usage, latency: float | None = None) -> None:
+        """
+        Record the usage block of one response.
+
+        Args:
+            model: Model name the request was sent to
+            usage: response.usage (may be None)
+            latency: Request latency in seconds
+        """
+        if usage is None:
+            return
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or 0
+
+        with self._lock:
+            counters = self._models.setdefault(
+                model,
+                {"calls": 0, "prompt": 0, "cached": 0, "completion": 0, "latency_ms": 0},
+            )
+            counters["calls"] += 1
+            counters["prompt"] += usage.prompt_tokens or 0
+            counters["cached"] += cached
+            counters["completion"] += usage.completion_tokens or 0
+            counters["latency_ms"] += int((latency or 0.0) * 1000)
+
+    def record_tier(self, tier: str) -> None:
+        """
+        Count one cascade outcome.
+
+        Args:
+            tier: "first_pass" or "escalated:<reason>"
+        """
+        with self._lock:
+            self._tiers[tier] = self._tiers.get(tier, 0) + 1
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        """Get a copy of the per-model counters."""
+        with self._lock:
+            return {model: dict(counters) for model, counters in self._models.items()}
+
+    @staticmethod
+    def cost(model: str, counters: dict[str, int]) -> tuple[float, float]:
+        """
+        Compute input and output cost in USD.
+
+        Args:
+            model: Model name (dated snapshots match their base name)
+            counters: Counters from snapshot()
+
+        Returns:
+            Tuple of (effective_input_cost, output_cost)
+        """
+        prices = MODEL_PRICING.get(model)
+        if prices is None:
+            base = max((name for name in MODEL_PRICING if model.startswith(name)), key=len, default=None)
+            prices = MODEL_PRICING.get(base, (0.0, 0.0, 0.0))
+
+        input_price, cached_price, output_price = prices
+        uncached = counters["prompt"] - counters["cached"]
+        input_cost = (uncached * input_price + counters["cached"] * cached_price) / 1_000_000
+        return input_cost, counters["completion"] * output_price / 1_000_000
+
+    def log(self) -> None:
+        """Log cache hit rate, latency, effective cost per model and the cascade tier mix."""
+        total_cost = 0.0
+        for model, counters in sorted(self.snapshot().items()):
+            input_cost, output_cost = self.cost(model, counters)
+            total_cost += input_cost + output_cost
+            hit_rate = counters["cached"] / counters["prompt"] * 100 if counters["prompt"] else 0.0
+            latency_ms = counters["latency_ms"] / counters["calls"] if counters["calls"] else 0.0
+            logger.info(
+                f"LLM usage [{model}]: {counters['calls']} calls, "
+                f"prompt={counters['prompt']} (cached={counters['cached']}, {hit_rate:.0f}% hit), "
+                f"completion={counters['completion']}, avg latency {latency_ms:.0f}ms, "
+                f"input ${input_cost:.4f} + output ${output_cost:.4f}"
+            )
+
+        with self._lock:
+            tiers = dict(self._tiers)
+        if tiers:
+            first_pass = tiers.pop("first_pass", 0)
+            escalated = sum(tiers.values())
+            reasons = ", ".join(
+                f"{tier.split(':', 1)[1]}={count}" for tier, count in sorted(tiers.items())
+            )
+            logger.info(
+                f"LLM cascade: {first_pass} accepted at first tier, {escalated} escalated"
+                + (f" ({reasons})" if reasons else "")
+                + f"; total cost ${total_cost:.4f}"
+            )
+
+
+def compute_cache_key(model: str, system_prompt: str, user_prompt: str, schema: dict) -> str:
+    """
+    Compute the response cache key for one analysis request.
+
+    Args:
+        model: Model name
+        system_prompt: System prompt text
+        user_prompt: User prompt text
+        schema: Response JSON schema
+
+    Returns:
+        SHA256 hex digest
+    """
+    payload = json.dumps(
+        [model, system_prompt, user_prompt, schema],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def parse_enrichment(result_text: str) -> EnrichedItem:
+    """
+    Parse and normalize a structured LLM response.
+
+    Args:
+        result_text: JSON text matching ENRICHMENT_SCHEMA
+
+    Returns:
+        EnrichedItem
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    return enrichment_from_dict(json.loads(result_text))
+
+
+def enrichment_from_dict(result: dict) -> EnrichedItem:
+    """
+    Normalize one decoded analysis result.
+
+    Args:
+        result: Object matching ENRICHMENT_SCHEMA
+
+    Returns:
+        EnrichedItem
+
+    Raises:
+        KeyError: If a required field is missing
+    """
+    # Validate key_points count
+    key_points = result.get("key_points", [])
+    if len(key_points) != 3:
+        # Adjust to exactly 3 key points
+        if len(key_points) < 3:
+            key_points.extend(["(要点なし)"] * (3 - len(key_points)))
+        else:
+            key_points = key_points[:3]
+        result["key_points"] = key_points
+
+    # Clamp reliability_score_delta
+    delta = result.get("reliability_score_delta", 0)
+    result["reliability_score_delta"] = max(-10, min(10, delta))
+    out_of_range = delta != result["reliability_score_delta"]
+
+    return EnrichedItem(
+        title=result["title"],
+        summary=result["summary"],
+        key_points=result["key_points"],
+        themes=result["themes"],
+        tags=result["tags"],
+        language=result["language"],
+        published_at=result["published_at"],
+        reliability_score_delta=result["reliability_score_delta"],
+        reliability_reason=result["reliability_reason"],
+        delta_out_of_range=out_of_range,
+    )
+
+
+def escalation_reason(
+    enrichment: EnrichedItem | None, content: str, check_length: bool = True
+) -> str | None:
+    """
+    Decide whether a first-tier result should be re-run on the larger model.
+
+    Args:
+        enrichment: First-tier result (None if the call failed)
+        content: Article text that was analyzed
+        check_length: Escalate short articles (off for packed articles,
+            which are short by design)
+
+    Returns:
+        Reason for escalation, or None to accept the result
+    """
+    if enrichment is None:
+        return "failed"
+    if not enrichment.themes:
+        return "no_themes"
+    if check_length and len(content) < CASCADE_MIN_CONTENT_CHARS:
+        return "short_content"
+    if "(要点なし)" in enrichment.key_points:
+        return "placeholder_key_point"
+    if enrichment.delta_out_of_range:
+        return "delta_out_of_range"
+    return None
+
+
+def parse_packed_enrichments(result_text: str, count: int) -> list[tuple[dict, EnrichedItem]]:
+    """
+    Parse a packed response and map results back to articles.
+
+    Args:
+        result_text: JSON text matching PACKED_ENRICHMENT_SCHEMA
+        count: Number of articles in the request
+
+    Returns:
+        (raw result, EnrichedItem) per article, in request order
+
+    Raises:
+        ValueError: If articles are missing, duplicated or out of range
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    results: dict[int, dict] = {}
+    for result in json.loads(result_text).get("items", []):
+        article_id = result.pop("article_id", None)
+        if not isinstance(article_id, int) or not 1 <= article_id <= count or article_id in results:
+            raise ValueError(f"Unexpected article_id {article_id!r} in packed response")
+        results[article_id] = result
+
+    if len(results) != count:
+        raise ValueError(f"Packed response covers {len(results)}/{count} articles")
+
+    return [(results[n], enrichment_from_dict(results[n])) for n in range(1, count + 1)]
+
+
 class LLMClient:
     """
     OpenAI Responses API client for article enrichment.
@@ -197,23 +621,45 @@ class LLMClient:
     Uses JSON Schema strict mode for guaranteed structured output.
     """
 
-    def __init__(self, api_key: str | None = None, model: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str | None = None,
+        use_cache: bool | None = None,
+        cheap_model: str | None = None,
+        cascade: bool | None = None,
+    ):
         """
         Initialize LLM client.
 
         Args:
             api_key: OpenAI API key (default: from env)
             model: Model name (default: from env)
+            use_cache: Use the response cache (default: EIC_LLM_CACHE)
+            cheap_model: First-tier model of the cascade (default: OPENAI_CHEAP_MODEL)
+            cascade: Use the model cascade (default: EIC_LLM_CASCADE)
         """
         self.api_key = api_key or OPENAI_API_KEY
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
 
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, max_retries=0)
         self.model = model or OPENAI_MODEL
         self._system_prompt = build_system_prompt()
+        self._packed_system_prompt = build_packed_system_prompt()
+        self.use_cache = LLM_CACHE_ENABLED if use_cache is None else use_cache
+        self.cheap_model = cheap_model or OPENAI_CHEAP_MODEL
+        self.cascade = bool(
+            (LLM_CASCADE_ENABLED if cascade is None else cascade)
+            and self.cheap_model
+            and self.cheap_model != self.model
+        )
+        self.usage = UsageStats()
+        logger.info(
+            f"System prompt: {len(self._system_prompt)} chars, "
+            f"prefix fingerprint {prompt_fingerprint(self._system_prompt)}"
+        )
 
-    @retry_with_backoff(max_retries=3, base_delay=2.0)
     def analyze_article(
         self,
         content: str,
@@ -222,10 +668,15 @@ class LLMClient:
         publisher: str,
         original_title: str | None = None,
         language: str = "unknown",
+        model: str | None = None,
     ) -> EnrichedItem | None:
         """
         Analyze article content using OpenAI Responses API.
 
+        Without a model override and with the cascade enabled, the cheap
+        model answers first and the client's model only re-runs results
+        that escalation_reason rejects.
+
         Args:
             content: Full article text (or empty string if unavailable)
             source_name: Name of the source
@@ -233,10 +684,106 @@ class LLMClient:
             publisher: Publisher name
             original_title: Title from RSS feed
             language: Language hint from source config
+            model: Model override for this article (default: the client's model)
 
         Returns:
             EnrichedItem or None on failure
         """
+        article = {
+            "content": content,
+            "source_name": source_name,
+            "source_type": source_type,
+            "publisher": publisher,
+            "original_title": original_title,
+            "language": language,
+        }
+        if model is not None or not self.cascade:
+            return self._analyze_single(**article, model=model or self.model)
+
+        first = None
+        try:
+            first = self._analyze_single(**article, model=self.cheap_model)
+        except Exception as e:
+            logger.warning(f"First-tier analysis failed: {e}")
+
+        if not self._should_escalate(first, content, original_title):
+            return first
+        try:
+            return self._analyze_single(**article, model=self.model) or first
+        except Exception:
+            if first is not None:
+                return first
+            raise
+
+    @retry_with_backoff(max_retries=3, base_delay=2.0, circuit="openai")
+    def _analyze_single(
+        self,
+        content: str,
+        source_name: str,
+        source_type: str,
+        publisher: str,
+        original_title: str | None,
+        language: str,
+        model: str,
+    ) -> EnrichedItem | None:
+        """Analyze one article on one model (retried on API errors)."""
+        user_prompt, cache_key, cached = self._prepare_analysis(
+            content, source_name, source_type, publisher, original_title, language, model
+        )
+        if cached:
+            return cached
+
+        try:
+            request = self._analysis_request(user_prompt, model)
+            openai_limiter.acquire(self._estimate_request_tokens(user_prompt, model))
+            started = time.monotonic()
+            response = self.client.chat.completions.create(**create_kwargs(request))
+            return self._finish_analysis(response, cache_key, model, time.monotonic() - started)
+
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"LLM analysis failed: {e}")
+            if isinstance(e, RateLimitError):
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None:
+                    openai_limiter.pause(retry_after)
+            raise  # Re-raise for retry decorator
+
+    def _should_escalate(
+        self,
+        first: EnrichedItem | None,
+        content: str,
+        original_title: str | None,
+        check_length: bool = True,
+    ) -> bool:
+        """Check a first-tier result and count the cascade outcome."""
+        reason = escalation_reason(first, content, check_length)
+        if reason is None:
+            self.usage.record_tier("first_pass")
+            return False
+
+        self.usage.record_tier(f"escalated:{reason}")
+        logger.info(f"Escalating to {self.model} ({reason}): {(original_title or '')[:40]}")
+        return True
+
+    def _prepare_analysis(
+        self,
+        content: str,
+        source_name: str,
+        source_type: str,
+        publisher: str,
+        original_title: str | None,
+        language: str,
+        model: str,
+    ) -> tuple[str, str, EnrichedItem | None]:
+        """
+        Build the user prompt and look up the response cache.
+
+        Returns:
+            Tuple of (user_prompt, cache_key, cached EnrichedItem or None)
+        """
         user_prompt = build_user_prompt(
             content=content,
             source_name=source_name,
@@ -246,63 +793,168 @@ class LLMClient:
             language=language,
         )
 
-        try:
-            # Use Chat Completions API with structured outputs
-            # (OpenAI Responses API may use different syntax)
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self._system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": ENRICHMENT_SCHEMA,
-                },
-                temperature=0.3,
-                max_tokens=2000,
-            )
+        cache_key = compute_cache_key(model, self._system_prompt, user_prompt, ENRICHMENT_SCHEMA)
+        if self.use_cache:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"LLM cache hit: {(original_title or '')[:40]}")
+                return user_prompt, cache_key, parse_enrichment(cached.decode("utf-8"))
 
-            # Parse the structured output
-            result_text = response.choices[0].message.content
-            if not result_text:
-                logger.error("Empty response from LLM")
-                return None
+        return user_prompt, cache_key, None
 
-            result = json.loads(result_text)
-
-            # Validate key_points count
-            key_points = result.get("key_points", [])
-            if len(key_points) != 3:
-                # Adjust to exactly 3 key points
-                if len(key_points) < 3:
-                    key_points.extend(["(要点なし)"] * (3 - len(key_points)))
-                else:
-                    key_points = key_points[:3]
-                result["key_points"] = key_points
-
-            # Clamp reliability_score_delta
-            delta = result.get("reliability_score_delta", 0)
-            result["reliability_score_delta"] = max(-10, min(10, delta))
-
-            return EnrichedItem(
-                title=result["title"],
-                summary=result["summary"],
-                key_points=result["key_points"],
-                themes=result["themes"],
-                tags=result["tags"],
-                language=result["language"],
-                published_at=result["published_at"],
-                reliability_score_delta=result["reliability_score_delta"],
-                reliability_reason=result["reliability_reason"],
-            )
+    def _analysis_request(self, user_prompt: str, model: str) -> dict:
+        """Build chat.completions.create arguments for an article analysis."""
+        return build_analysis_request(model, self._system_prompt, user_prompt)
 
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {e}")
+    def _estimate_request_tokens(self, user_prompt: str, model: str) -> int:
+        """Estimate TPM usage: prompt tokens plus the completion budget."""
+        return count_tokens(self._system_prompt + user_prompt, model) + ANALYSIS_MAX_TOKENS
+
+    def _finish_analysis(
+        self,
+        response,
+        cache_key: str,
+        model: str,
+        latency: float | None = None,
+    ) -> EnrichedItem | None:
+        """Record usage, parse the structured output and store it in the response cache."""
+        self.usage.record(model, getattr(response, "usage", None), latency)
+
+        result_text = response.choices[0].message.content
+        if not result_text:
+            logger.error("Empty response from LLM")
             return None
-        except Exception as e:
-            logger.error(f"LLM analysis failed: {e}")
-            raise  # Re-raise for retry decorator
+
+        enrichment = parse_enrichment(result_text)
+
+        if self.use_cache:
+            response_cache.set(cache_key, result_text.encode("utf-8"))
+
+        return enrichment
+
+    def analyze_packed(
+        self,
+        articles: list[dict],
+        model: str | None = None,
+    ) -> list[EnrichedItem | None]:
+        """
+        Analyze several articles in one request.
+
+        Cached articles are answered from the cache and the rest share one
+        call. Each result is cached under its single-article key, so later
+        runs hit the cache whether or not they pack. A malformed packed
+        response, or a failed call, falls back to one call per article.
+
+        With the cascade enabled (and no model override) the group goes to
+        the cheap model and rejected results are re-run, still packed, on
+        the larger model. Short content alone does not escalate a packed
+        article.
+
+        Args:
+            articles: analyze_article keyword arguments, one dict per article
+            model: Model override (default: the client's model)
+
+        Returns:
+            Results in input order (None for failures)
+        """
+        cascade = model is None and self.cascade
+        model = self.cheap_model if cascade else (model or self.model)
+        results: list[EnrichedItem | None] = [None] * len(articles)
+        pending = []  # (position, user_prompt, cache_key)
+
+        for position, article in enumerate(articles):
+            user_prompt, cache_key, cached = self._prepare_analysis(
+                article["content"],
+                article["source_name"],
+                article["source_type"],
+                article["publisher"],
+                article.get("original_title"),
+                article.get("language", "unknown"),
+                model,
+            )
+            if cached:
+                results[position] = cached
+            else:
+                pending.append((position, user_prompt, cache_key))
+
+        if len(pending) > 1:
+            user_prompt = build_packed_user_prompt([prompt for _, prompt, _ in pending])
+            request = build_analysis_request(
+                model,
+                self._packed_system_prompt,
+                user_prompt,
+                schema=PACKED_ENRICHMENT_SCHEMA,
+                max_tokens=ANALYSIS_MAX_TOKENS * len(pending),
+            )
+            breaker = get_breaker("openai")
+            try:
+                openai_limiter.acquire(
+                    count_tokens(self._packed_system_prompt + user_prompt, model)
+                    + ANALYSIS_MAX_TOKENS * len(pending)
+                )
+                breaker.before_call()
+                started = time.monotonic()
+                try:
+                    response = self.client.chat.completions.create(**create_kwargs(request))
+                except Exception as e:
+                    record_outcome(breaker, e)
+                    raise
+                except BaseException:
+                    breaker.release_trial()
+                    raise
+                record_outcome(breaker, None)
+                self.usage.record(model, getattr(response, "usage", None), time.monotonic() - started)
+
+                parsed = parse_packed_enrichments(
+                    response.choices[0].message.content or "", len(pending)
+                )
+                for (position, _, cache_key), (raw, enrichment) in zip(pending, parsed):
+                    results[position] = enrichment
+                    if self.use_cache:
+                        response_cache.set(
+                            cache_key, json.dumps(raw, ensure_ascii=False).encode("utf-8")
+                        )
+                logger.info(f"Packed analysis: {len(pending)} articles in one request")
+                pending = []
+
+            except Exception as e:
+                logger.warning(
+                    f"Packed analysis of {len(pending)} articles failed ({e}), "
+                    f"falling back to single calls"
+                )
+
+        for position, _, _ in pending:
+            try:
+                results[position] = self.analyze_article(**articles[position], model=model)
+            except Exception as e:
+                logger.error(f"LLM analysis failed: {e}")
+
+        if cascade:
+            escalate = [
+                position
+                for position, article in enumerate(articles)
+                if self._should_escalate(
+                    results[position],
+                    article["content"],
+                    article.get("original_title"),
+                    check_length=False,
+                )
+            ]
+            if escalate:
+                # Escalated articles stay packed, on the larger model
+                escalated = self.analyze_packed(
+                    [articles[position] for position in escalate], model=self.model
+                )
+                for position, enrichment in zip(escalate, escalated):
+                    results[position] = enrichment or results[position]
+
+        return results
+
+    def log_cache_stats(self) -> None:
+        """Log response cache hit/miss counts and provider-side token usage."""
+        state = "enabled" if self.use_cache else "bypassed"
+        logger.info(f"LLM cache ({state}): {response_cache.stats()}")
+        self.usage.log()
 
     def test_connection(self) -> bool:
         """Test API connectivity."""
@@ -365,7 +1017,7 @@ class LLMClient:
 - どのようなトピックが多かったか、注目すべきポイントは何かを説明"""
 
         try:
-            response = self.client.chat.completions.create(
+            response = self._complete(
                 model=self.model,
                 messages=[
                     {
@@ -377,6 +1029,7 @@ class LLMClient:
                 temperature=0.5,
                 max_tokens=300,
             )
+            self.usage.record(self.model, getattr(response, "usage", None))
 
             result = response.choices[0].message.content
             return result.strip() if result else None
@@ -384,3 +1037,235 @@ class LLMClient:
         except Exception as e:
             logger.error(f"Daily summary generation failed: {e}")
             return None
+
+    @retry_with_backoff(max_retries=2, base_delay=2.0, circuit="openai")
+    def _complete(self, **kwargs):
+        """Create a chat completion (retried on retryable API errors)."""
+        return self.client.chat.completions.create(**kwargs)
+
+
+class AsyncLLMClient(LLMClient):
+    """
+    Concurrent article enrichment on AsyncOpenAI.
+
+    In-flight requests are capped by a semaphore and paced by the shared
+    RPM/TPM limiter; 429 responses pause the limiter for the Retry-After
+    delay. analyze_article() keeps the synchronous signature and return
+    semantics by running the coroutine on a private event loop thread, so
+    the client can be used anywhere an LLMClient is expected.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str | None = None,
+        use_cache: bool | None = None,
+        concurrency: int | None = None,
+        max_retries: int = 3,
+        base_delay: float = 2.0,
+        max_delay: float = 30.0,
+    ):
+        """
+        Initialize async LLM client.
+
+        Args:
+            api_key: OpenAI API key (default: from env)
+            model: Model name (default: from env)
+            use_cache: Use the response cache (default: EIC_LLM_CACHE)
+            concurrency: Maximum in-flight requests (default: OPENAI_MAX_CONCURRENCY)
+            max_retries: Retries per article
+            base_delay: Initial backoff delay in seconds
+            max_delay: Longest backoff or Retry-After wait in seconds
+        """
+        super().__init__(api_key=api_key, model=model, use_cache=use_cache)
+        self.async_client = AsyncOpenAI(api_key=self.api_key, max_retries=0)
+        self.concurrency = concurrency or OPENAI_MAX_CONCURRENCY
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._semaphores: dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_lock = threading.Lock()
+
+    async def analyze_article_async(
+        self,
+        content: str,
+        source_name: str,
+        source_type: str,
+        publisher: str,
+        original_title: str | None = None,
+        language: str = "unknown",
+        model: str | None = None,
+    ) -> EnrichedItem | None:
+        """
+        Analyze article content (coroutine version of analyze_article).
+
+        Args:
+            content: Full article text (or empty string if unavailable)
+            source_name: Name of the source
+            source_type: Type for base reliability
+            publisher: Publisher name
+            original_title: Title from RSS feed
+            language: Language hint from source config
+            model: Model override for this article (default: the client's model)
+
+        Returns:
+            EnrichedItem or None on failure
+        """
+        article = {
+            "content": content,
+            "source_name": source_name,
+            "source_type": source_type,
+            "publisher": publisher,
+            "original_title": original_title,
+            "language": language,
+        }
+        if model is not None or not self.cascade:
+            return await self._analyze_single_async(**article, model=model or self.model)
+
+        first = None
+        try:
+            first = await self._analyze_single_async(**article, model=self.cheap_model)
+        except Exception as e:
+            logger.warning(f"First-tier analysis failed: {e}")
+
+        if not self._should_escalate(first, content, original_title):
+            return first
+        try:
+            return await self._analyze_single_async(**article, model=self.model) or first
+        except Exception:
+            if first is not None:
+                return first
+            raise
+
+    async def _analyze_single_async(
+        self,
+        content: str,
+        source_name: str,
+        source_type: str,
+        publisher: str,
+        original_title: str | None,
+        language: str,
+        model: str,
+    ) -> EnrichedItem | None:
+        """Analyze one article on one model, retrying with backoff and Retry-After."""
+        user_prompt, cache_key, cached = self._prepare_analysis(
+            content, source_name, source_type, publisher, original_title, language, model
+        )
+        if cached:
+            return cached
+
+        semaphore = self._semaphores.setdefault(
+            asyncio.get_running_loop(), asyncio.Semaphore(self.concurrency)
+        )
+        request = self._analysis_request(user_prompt, model)
+        estimated_tokens = self._estimate_request_tokens(user_prompt, model)
+
+        breaker = get_breaker("openai")
+        for attempt in range(self.max_retries + 1):
+            await openai_limiter.acquire_async(estimated_tokens)
+            # Outside the try: a fail-fast rejection is not an outcome of the host
+            breaker.before_call()
+            try:
+                async with semaphore:
+                    started = time.monotonic()
+                    response = await self.async_client.chat.completions.create(
+                        **create_kwargs(request)
+                    )
+                record_outcome(breaker, None)
+                return self._finish_analysis(response, cache_key, model, time.monotonic() - started)
+
+            except json.JSONDecodeError as e:
+                logger.error(f"JSON decode error: {e}")
+                return None
+            except Exception as e:
+                record_outcome(breaker, e)
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    logger.error(f"LLM analysis failed: {e}")
+                    raise
+
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = full_jitter_delay(attempt, self.base_delay, self.max_delay)
+                elif isinstance(e, RateLimitError):
+                    openai_limiter.pause(delay)
+                if delay > self.max_delay or not retry_budget.try_spend():
+                    logger.error(f"LLM analysis failed: {e}")
+                    raise
+
+                logger.warning(
+                    f"Attempt {attempt + 1}/{self.max_retries + 1} failed: {e}. "
+                    f"Retrying in {delay:.1f}s..."
+                )
+                await asyncio.sleep(delay)
+            except BaseException:
+                # Cancellation must not leave a half-open trial in flight
+                breaker.release_trial()
+                raise
+
+        return None
+
+    async def analyze_many(self, articles: list[dict]) -> list[EnrichedItem | None]:
+        """
+        Analyze several articles concurrently.
+
+        Args:
+            articles: analyze_article keyword arguments, one dict per article
+
+        Returns:
+            Results in input order (None for failures)
+        """
+
+        async def _safe(kwargs: dict) -> EnrichedItem | None:
+            try:
+                return await self.analyze_article_async(**kwargs)
+            except Exception:
+                return None
+
+        return list(await asyncio.gather(*(_safe(kwargs) for kwargs in articles)))
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop thread on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name="llm-async-loop",
+                    daemon=True,
+                ).start()
+                self._loop = loop
+            return self._loop
+
+    def analyze_article(
+        self,
+        content: str,
+        source_name: str,
+        source_type: str,
+        publisher: str,
+        original_title: str | None = None,
+        language: str = "unknown",
+        model: str | None = None,
+    ) -> EnrichedItem | None:
+        """
+        Analyze article content, blocking until the async request completes.
+
+        Safe to call from many threads at once; concurrency is bounded by
+        the client's semaphore rather than by the number of callers.
+
+        Returns:
+            EnrichedItem or None on failure
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.analyze_article_async(
+                content=content,
+                source_name=source_name,
+                source_type=source_type,
+                publisher=publisher,
+                original_title=original_title,
+                language=language,
+                model=model,
+            ),
+            self._ensure_loop(),
+        )
+        return future.result()
@@ -0,0 +1,403 @@
+"""
+Sealed, zstd-compressed storage for closed monthly JSONL files.
+
+The current month stays a plain, appendable YYYY-MM.jsonl. Closed months
+are sealed into independent zstd frames of whole lines plus a frame index,
+so any line can be read by decompressing only the frame holding it.
+
+Data format:
+- data/items/YYYY-MM.jsonl.zst: concatenated zstd frames, each holding
+  complete JSONL lines (about SEAL_FRAME_BYTES of text per frame)
+- data/items/YYYY-MM.jsonl.frames: one tab-separated line per frame:
+    <logical offset><TAB><logical length><TAB><compressed offset><TAB><compressed length>
+
+Logical offsets are byte offsets in the original JSONL text, so the offset
+sidecar (YYYY-MM.jsonl.idx) stays valid across sealing. Months are named by
+their logical path (YYYY-MM.jsonl) whether sealed or not; a plain file, when
+present, takes precedence over a sealed copy (a crash between the renames
+leaves both). Appending to a sealed month unseals it first.
+
+Requires zstandard (optional dependency) to seal or read sealed months.
+
+Provides:
+- month_paths: logical paths of all months, plain or sealed
+- month_exists / is_sealed / logical_size: month state
+- MonthReader: random access by logical offset
+- iter_lines: complete lines from a logical offset
+- seal_month / unseal_month / seal_closed_months
+
+Usage:
+    python -m scripts.month_archive seal              # all closed months
+    python -m scripts.month_archive seal 2024-01
+    python -m scripts.month_archive unseal 2024-01
+"""
+
+import argparse
+import bisect
+import logging
+import os
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from scripts.utils import ITEMS_DIR, fsync_directory, get_jst_month, setup_logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+# Uncompressed text per frame: larger frames compress better, smaller ones
+# decompress less per random read
+SEAL_FRAME_BYTES = 256 * 1024
+SEAL_LEVEL = 19
+
+
+class Frame(NamedTuple):
+    """Location of one zstd frame and the JSONL bytes it holds."""
+
+    logical_offset: int
+    logical_length: int
+    compressed_offset: int
+    compressed_length: int
+
+    def to_line(self) -> str:
+        """Serialize as a frame index line."""
+        return "\t".join(str(value) for value in self) + "\n"
+
+
+def sealed_path(jsonl_path: Path) -> Path:
+    """Get the compressed file of a month."""
+    return jsonl_path.with_name(jsonl_path.name + ".zst")
+
+
+def frames_path(jsonl_path: Path) -> Path:
+    """Get the frame index of a month."""
+    return jsonl_path.with_name(jsonl_path.name + ".frames")
+
+
+def is_sealed(jsonl_path: Path) -> bool:
+    """Whether a month is stored sealed (and not superseded by a plain file)."""
+    return not jsonl_path.exists() and sealed_path(jsonl_path).exists()
+
+
+def month_exists(jsonl_path: Path) -> bool:
+    """Whether a month has data, plain or sealed."""
+    return jsonl_path.exists() or sealed_path(jsonl_path).exists()
+
+
+def month_paths(items_dir: Path = ITEMS_DIR) -> list[Path]:
+    """
+    Get the logical JSONL paths of all months, plain or sealed.
+
+    Returns:
+        Paths (data/items/YYYY-MM.jsonl) sorted by month
+    """
+    paths = set(items_dir.glob("*.jsonl"))
+    paths.update(
+        path.with_name(path.name.removesuffix(".zst")) for path in items_dir.glob("*.jsonl.zst")
+    )
+    return sorted(paths)
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise RuntimeError("zstandard is required for sealed months (pip install zstandard)")
+
+
+def load_frames(jsonl_path: Path) -> list[Frame]:
+    """
+    Read the frame index of a sealed month.
+
+    Raises:
+        ValueError: If the index is malformed
+    """
+    frames = []
+    with open(frames_path(jsonl_path), "r", encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) != 4:
+                raise ValueError(f"malformed line in {frames_path(jsonl_path).name}")
+            frames.append(Frame(*(int(field) for field in fields)))
+    return frames
+
+
+def logical_size(jsonl_path: Path) -> int:
+    """Get the size of a month's JSONL text (0 if the month does not exist)."""
+    if jsonl_path.exists():
+        return jsonl_path.stat().st_size
+    if not sealed_path(jsonl_path).exists():
+        return 0
+    frames = load_frames(jsonl_path)
+    return frames[-1].logical_offset + frames[-1].logical_length if frames else 0
+
+
+class MonthReader:
+    """Random access to a month's JSONL text by logical offset."""
+
+    def __init__(self, jsonl_path: Path):
+        """
+        Open a month.
+
+        Args:
+            jsonl_path: Logical path (data/items/YYYY-MM.jsonl)
+
+        Raises:
+            FileNotFoundError: If the month does not exist
+            RuntimeError: If the month is sealed and zstandard is missing
+        """
+        self.sealed = is_sealed(jsonl_path)
+        if not self.sealed:
+            self._file = open(jsonl_path, "rb")
+            return
+
+        _require_zstandard()
+        self._frames = load_frames(jsonl_path)
+        self._starts = [frame.logical_offset for frame in self._frames]
+        self._file = open(sealed_path(jsonl_path), "rb")
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._cached_frame = -1
+        self._cached_data = b""
+
+    def __enter__(self) -> "MonthReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _frame_data(self, number: int) -> bytes:
+        """Decompress a frame (the last one is kept)."""
+        if number != self._cached_frame:
+            frame = self._frames[number]
+            self._file.seek(frame.compressed_offset)
+            self._cached_data = self._decompressor.decompress(
+                self._file.read(frame.compressed_length), max_output_size=frame.logical_length
+            )
+            self._cached_frame = number
+        return self._cached_data
+
+    def read_at(self, offset: int, length: int) -> bytes:
+        """
+        Read length bytes of JSONL text from a logical offset.
+
+        Returns:
+            The bytes (shorter if the range runs past the end)
+        """
+        if not self.sealed:
+            self._file.seek(offset)
+            return self._file.read(length)
+
+        chunks = []
+        number = bisect.bisect_right(self._starts, offset) - 1
+        while length > 0 and 0 <= number < len(self._frames):
+            frame = self._frames[number]
+            start = offset - frame.logical_offset
+            chunk = self._frame_data(number)[start : start + length]
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+            length -= len(chunk)
+            number += 1
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self._file.close()
+
+
+def iter_lines(jsonl_path: Path, start: int = 0) -> Iterator[tuple[int, bytes]]:
+    """
+    Iterate over the lines of a month from a logical offset.
+
+    Args:
+        jsonl_path: Logical path (data/items/YYYY-MM.jsonl)
+        start: Logical offset of the first line
+
+    Yields:
+        (logical offset, line bytes); only the last line of a plain file can
+        lack its newline
+    """
+    if not is_sealed(jsonl_path):
+        with open(jsonl_path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                yield offset, line
+                offset += len(line)
+        return
+
+    _require_zstandard()
+    decompressor = zstandard.ZstdDecompressor()
+    with open(sealed_path(jsonl_path), "rb") as f:
+        for frame in load_frames(jsonl_path):
+            if frame.logical_offset + frame.logical_length <= start:
+                continue
+            f.seek(frame.compressed_offset)
+            data = decompressor.decompress(
+                f.read(frame.compressed_length), max_output_size=frame.logical_length
+            )
+            position = 0
+            while position < len(data):
+                end = data.find(b"\n", position) + 1 or len(data)
+                offset = frame.logical_offset + position
+                if offset >= start:
+                    yield offset, data[position:end]
+                position = end
+
+
+def _write_durably(path: Path, data: bytes) -> None:
+    """Write a file via a temp file, fsynced, and rename it into place."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def seal_month(jsonl_path: Path, frame_bytes: int = SEAL_FRAME_BYTES, level: int = SEAL_LEVEL) -> int:
+    """
+    Compress a plain month into zstd frames and remove the plain file.
+
+    Frames end on line boundaries. The sealed copy is verified before the
+    plain file is removed. A torn last line is dropped.
+
+    Args:
+        jsonl_path: Logical path (data/items/YYYY-MM.jsonl)
+        frame_bytes: Target uncompressed bytes per frame
+        level: zstd compression level
+
+    Returns:
+        Compressed size in bytes
+    """
+    _require_zstandard()
+    if is_sealed(jsonl_path):
+        return sealed_path(jsonl_path).stat().st_size
+    data = jsonl_path.read_bytes()
+    end = data.rfind(b"\n") + 1
+    if end < len(data):
+        logger.warning(f"Dropping a torn {len(data) - end}-byte record from {jsonl_path.name}")
+
+    compressor = zstandard.ZstdCompressor(level=level, write_content_size=True)
+    frames: list[Frame] = []
+    blobs: list[bytes] = []
+    position = 0
+    compressed_offset = 0
+    while position < end:
+        stop = min(position + frame_bytes, end)
+        if stop < end:
+            newline = data.rfind(b"\n", position, stop)
+            stop = newline + 1 if newline != -1 else data.index(b"\n", stop) + 1
+        blob = compressor.compress(data[position:stop])
+        frames.append(Frame(position, stop - position, compressed_offset, len(blob)))
+        blobs.append(blob)
+        position = stop
+        compressed_offset += len(blob)
+
+    sealed = b"".join(blobs)
+    decompressor = zstandard.ZstdDecompressor()
+    restored = b"".join(
+        decompressor.decompress(
+            sealed[frame.compressed_offset : frame.compressed_offset + frame.compressed_length],
+            max_output_size=frame.logical_length,
+        )
+        for frame in frames
+    )
+    if restored != data[:end]:
+        raise RuntimeError(f"Sealed copy of {jsonl_path.name} does not round-trip")
+
+    _write_durably(frames_path(jsonl_path), "".join(frame.to_line() for frame in frames).encode())
+    _write_durably(sealed_path(jsonl_path), sealed)
+    fsync_directory(jsonl_path.parent)
+    jsonl_path.unlink()
+    fsync_directory(jsonl_path.parent)
+
+    logger.info(
+        f"Sealed {jsonl_path.name}: {len(data)} -> {len(sealed)} bytes in {len(frames)} frames"
+    )
+    return len(sealed)
+
+
+def unseal_month(jsonl_path: Path) -> None:
+    """
+    Restore the plain file of a sealed month (e.g. to append to it).
+
+    Args:
+        jsonl_path: Logical path (data/items/YYYY-MM.jsonl)
+    """
+    if not is_sealed(jsonl_path):
+        return
+    data = b"".join(line for _, line in iter_lines(jsonl_path))
+    _write_durably(jsonl_path, data)
+    fsync_directory(jsonl_path.parent)
+    sealed_path(jsonl_path).unlink()
+    frames_path(jsonl_path).unlink(missing_ok=True)
+    fsync_directory(jsonl_path.parent)
+    logger.info(f"Unsealed {jsonl_path.name} ({len(data)} bytes)")
+
+
+def seal_closed_months(current_month: str | None = None) -> int:
+    """
+    Seal every plain month before the current one.
+
+    Args:
+        current_month: Month kept appendable (YYYY-MM, default: now in JST)
+
+    Returns:
+        Number of months sealed (0 if zstandard is not installed)
+    """
+    if zstandard is None:
+        logger.warning("zstandard is not installed, leaving closed months unsealed")
+        return 0
+    current_month = current_month or get_jst_month()
+    sealed = 0
+    for jsonl_path in sorted(ITEMS_DIR.glob("*.jsonl")):
+        if jsonl_path.stem < current_month:
+            seal_month(jsonl_path)
+            sealed += 1
+    return sealed
+
+
+def main() -> int:
+    """CLI entry point."""
+    setup_logging()
+
+    parser = argparse.ArgumentParser(
+        description="EIC monthly JSONL sealing",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m scripts.month_archive seal
+  python -m scripts.month_archive seal 2024-01
+  python -m scripts.month_archive unseal 2024-01
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    seal_parser = subparsers.add_parser("seal", help="Seal closed months")
+    seal_parser.add_argument("month", nargs="?", help="Month (YYYY-MM, default: all closed)")
+
+    unseal_parser = subparsers.add_parser("unseal", help="Restore a plain month")
+    unseal_parser.add_argument("month", help="Month (YYYY-MM)")
+
+    args = parser.parse_args()
+
+    if zstandard is None:
+        logger.error("zstandard is not installed (pip install zstandard)")
+        return 1
+
+    if args.command == "unseal":
+        unseal_month(ITEMS_DIR / f"{args.month}.jsonl")
+    elif args.month:
+        seal_month(ITEMS_DIR / f"{args.month}.jsonl")
+    else:
+        seal_closed_months()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+Byte-offset sidecar index for the monthly JSONL files.
+
+Each data/items/YYYY-MM.jsonl has a sidecar YYYY-MM.jsonl.idx listing, per
+line, the observed date, source_group, item_id and the line's byte offset
+and length. Date lookups read only the matching lines instead of parsing
+the whole month.
+
+Data format (YYYY-MM.jsonl.idx, one tab-separated line per item):
+    2024-01-15<TAB>high<TAB><item_id><TAB><offset><TAB><length>
+
+The sidecar is appended by append_item. Lines the sidecar does not cover
+yet (e.g. after a crash between the two writes) are indexed on the next
+lookup; a sidecar that disagrees with its JSONL file is rebuilt. Offsets are
+logical (uncompressed), so they also address sealed months
+(scripts.month_archive).
+
+Provides:
+- OffsetEntry: one indexed line
+- load_offset_index: sidecar entries, caught up with the JSONL file
+- append_offsets: record newly appended lines
+- read_items: read indexed lines by offset
+- rebuild_offset_index: rebuild a sidecar from scratch
+
+Usage:
+    python -m scripts.offset_index rebuild              # all months
+    python -m scripts.offset_index rebuild 2024-01      # one month
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+from scripts.month_archive import (
+    MonthReader,
+    iter_lines,
+    logical_size,
+    month_exists,
+    month_paths,
+)
+from scripts.utils import ITEMS_DIR, setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+class OffsetEntry(NamedTuple):
+    """Location of one item line in a monthly JSONL file."""
+
+    date: str
+    source_group: str
+    item_id: str
+    offset: int
+    length: int
+
+    def to_line(self) -> str:
+        """Serialize as a sidecar line."""
+        return "\t".join(
+            [self.date, self.source_group, self.item_id, str(self.offset), str(self.length)]
+        ) + "\n"
+
+
+class StaleOffsetIndex(Exception):
+    """Raised when a sidecar does not match its JSONL file."""
+
+
+def offset_index_path(jsonl_path: Path) -> Path:
+    """Get the sidecar path of a monthly JSONL file."""
+    return jsonl_path.with_name(jsonl_path.name + ".idx")
+
+
+def entry_for_item(item: dict, offset: int, length: int) -> OffsetEntry:
+    """Build the sidecar entry of an item stored at offset."""
+    return OffsetEntry(
+        date=(item.get("observed_at") or "")[:10],
+        source_group=item.get("source_group") or "",
+        item_id=item.get("item_id") or "",
+        offset=offset,
+        length=length,
+    )
+
+
+def _scan(jsonl_path: Path, start: int) -> list[OffsetEntry]:
+    """Index the complete lines of a JSONL file from a byte offset."""
+    entries = []
+    for offset, line in iter_lines(jsonl_path, start):
+        if not line.endswith(b"\n"):
+            break  # Unterminated tail: not a complete item yet
+        if line.strip():
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed line at byte {offset} in {jsonl_path.name}")
+            else:
+                entries.append(entry_for_item(item, offset, len(line)))
+    return entries
+
+
+def _parse_sidecar(path: Path) -> list[OffsetEntry]:
+    """Read a sidecar file."""
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                raise StaleOffsetIndex(f"torn last line in {path.name}")
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) != 5:
+                raise StaleOffsetIndex(f"malformed line in {path.name}")
+            entries.append(
+                OffsetEntry(fields[0], fields[1], fields[2], int(fields[3]), int(fields[4]))
+            )
+    return entries
+
+
+def rebuild_offset_index(jsonl_path: Path) -> list[OffsetEntry]:
+    """
+    Rebuild the sidecar of a monthly JSONL file from scratch.
+
+    Args:
+        jsonl_path: Path to data/items/YYYY-MM.jsonl
+
+    Returns:
+        All entries of the file
+    """
+    entries = _scan(jsonl_path, 0) if month_exists(jsonl_path) else []
+    path = offset_index_path(jsonl_path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(entry.to_line() for entry in entries)
+    os.replace(tmp_path, path)
+    logger.info(f"Rebuilt {path.name}: {len(entries)} entries")
+    return entries
+
+
+def load_offset_index(jsonl_path: Path) -> list[OffsetEntry]:
+    """
+    Get the sidecar entries of a monthly JSONL file, catching up on lines
+    appended since the sidecar was last written.
+
+    Args:
+        jsonl_path: Path to data/items/YYYY-MM.jsonl
+
+    Returns:
+        Entries in file order (empty if the month does not exist)
+    """
+    if not month_exists(jsonl_path):
+        return []
+
+    path = offset_index_path(jsonl_path)
+    if not path.exists():
+        return rebuild_offset_index(jsonl_path)
+
+    try:
+        entries = _parse_sidecar(path)
+    except (StaleOffsetIndex, ValueError) as e:
+        logger.warning(f"Invalid {path.name} ({e}), rebuilding")
+        return rebuild_offset_index(jsonl_path)
+
+    covered = entries[-1].offset + entries[-1].length if entries else 0
+    size = logical_size(jsonl_path)
+    if covered > size:
+        logger.warning(f"{path.name} points past the end of {jsonl_path.name}, rebuilding")
+        return rebuild_offset_index(jsonl_path)
+
+    if covered < size:
+        missing = _scan(jsonl_path, covered)
+        if missing:
+            with open(path, "a", encoding="utf-8") as f:
+                f.writelines(entry.to_line() for entry in missing)
+            logger.info(f"Indexed {len(missing)} unindexed lines of {jsonl_path.name}")
+            entries.extend(missing)
+
+    return entries
+
+
+def append_offsets(jsonl_path: Path, entries: list[OffsetEntry]) -> None:
+    """
+    Record lines just appended to a monthly JSONL file.
+
+    Only written when the sidecar already covers everything before the
+    first line; otherwise the next load_offset_index catches up.
+
+    Args:
+        jsonl_path: Path to data/items/YYYY-MM.jsonl
+        entries: Entries of the appended lines, in file order
+    """
+    if not entries:
+        return
+    path = offset_index_path(jsonl_path)
+    if _covered_end(path) != entries[0].offset:
+        return  # Missing or behind: the next lookup catches up
+    with open(path, "a", encoding="utf-8") as f:
+        f.writelines(entry.to_line() for entry in entries)
+
+
+def _covered_end(path: Path) -> int:
+    """
+    Get the JSONL byte offset a sidecar covers up to from its last line.
+
+    Returns:
+        End offset (0 for an empty or missing sidecar), -1 if unreadable
+    """
+    if not path.exists():
+        return 0
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if not size:
+            return 0
+        f.seek(max(0, size - 512))
+        tail = f.read()
+    if not tail.endswith(b"\n"):
+        return -1
+    fields = tail.rstrip(b"\n").rsplit(b"\n", 1)[-1].split(b"\t")
+    try:
+        return int(fields[3]) + int(fields[4])
+    except (IndexError, ValueError):
+        return -1
+
+
+def read_items(jsonl_path: Path, entries: list[OffsetEntry]) -> list[dict]:
+    """
+    Read indexed lines by offset.
+
+    Args:
+        jsonl_path: Path to data/items/YYYY-MM.jsonl
+        entries: Entries to read
+
+    Returns:
+        Item records in entry order
+
+    Raises:
+        StaleOffsetIndex: If a line does not hold the item the entry names
+    """
+    items = []
+    if not entries:
+        return items
+    with MonthReader(jsonl_path) as reader:
+        for entry in entries:
+            try:
+                item = json.loads(reader.read_at(entry.offset, entry.length))
+            except json.JSONDecodeError as e:
+                raise StaleOffsetIndex(f"unreadable line at byte {entry.offset}") from e
+            if item.get("item_id", "") != entry.item_id:
+                raise StaleOffsetIndex(f"item_id mismatch at byte {entry.offset}")
+            items.append(item)
+    return items
+
+
+def main() -> int:
+    """CLI entry point."""
+    setup_logging()
+
+    parser = argparse.ArgumentParser(
+        description="EIC JSONL offset index",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m scripts.offset_index rebuild
+  python -m scripts.offset_index rebuild 2024-01
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = subparsers.add_parser("rebuild", help="Rebuild sidecar offset indexes")
+    rebuild_parser.add_argument("month", nargs="?", help="Month (YYYY-MM, default: all)")
+
+    args = parser.parse_args()
+    if args.month:
+        paths = [ITEMS_DIR / f"{args.month}.jsonl"]
+    else:
+        paths = month_paths()
+    for jsonl_path in paths:
+        rebuild_offset_index(jsonl_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+"""
+Columnar Parquet export of the item corpus.
+
+Keeps a month-partitioned Parquet mirror of data/items so analyses read only
+the columns they touch (e.g. themes and dates) instead of parsing every
+JSONL line. Each run exports only the lines appended since the last export,
+located through the JSONL offset sidecars (scripts.offset_index).
+
+Data format (data/parquet/, hive partitioning):
+- month=YYYY-MM/part-<start>-<end>.parquet: rows for JSONL bytes [start, end)
+  (key_points, themes and tags as list columns, theme_confidence as a map)
+- _export_state.json: per month, exported byte end, row count, a digest of
+  the sidecar entries exported and the part files
+
+A month whose exported lines were rewritten (e.g. by theme_tagger retag,
+which changes their sidecar entries) or whose part files do not match the
+state is exported again in full. Sealing a month (scripts.month_archive)
+keeps its sidecar entries, so sealed months are not exported again. A month
+with more than PARQUET_MAX_PARTS parts is compacted into one file.
+
+Requires pyarrow (optional dependency).
+
+Provides:
+- export_items: export new lines of all (or some) months
+- read_columns: read selected columns as a pyarrow Table
+- theme_counts: items per month and theme
+
+Usage:
+    python -m scripts.parquet_export export [--month 2024-01] [--full]
+    python -m scripts.parquet_export themes
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from scripts.month_archive import month_exists, month_paths
+from scripts.offset_index import (
+    OffsetEntry,
+    StaleOffsetIndex,
+    load_offset_index,
+    read_items,
+    rebuild_offset_index,
+)
+from scripts.utils import ITEMS_DIR, PARQUET_DIR, PARQUET_MAX_PARTS, setup_logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency
+    pa = None
+
+STATE_FILE_NAME = "_export_state.json"  # Leading "_" keeps it out of the dataset
+STATE_VERSION = 3
+
+_STRING_COLUMNS = [
+    "item_id",
+    "url",
+    "url_normalized",
+    "source_group",
+    "source_key",
+    "source_name",
+    "source_type",
+    "publisher",
+    "rss_title",
+    "rss_pub_date",
+    "title",
+    "summary",
+    "language",
+    "published_at",
+    "reliability_reason",
+    "ingest_version",
+    "enrichment_source",
+]
+_LIST_COLUMNS = ["key_points", "themes", "tags"]
+_INT_COLUMNS = ["reliability_score", "reliability_base", "reliability_delta", "content_length"]
+_TIMESTAMP_COLUMNS = ["observed_at", "retrieved_at"]
+
+
+def _schema() -> "pa.Schema":
+    """Arrow schema of the exported rows."""
+    return pa.schema(
+        [(column, pa.string()) for column in _STRING_COLUMNS]
+        + [(column, pa.list_(pa.string())) for column in _LIST_COLUMNS]
+        + [(column, pa.int32()) for column in _INT_COLUMNS]
+        + [(column, pa.timestamp("us", tz="UTC")) for column in _TIMESTAMP_COLUMNS]
+        + [
+            ("observed_date", pa.date32()),  # JST date, as used for daily lookups
+            ("theme_confidence", pa.map_(pa.string(), pa.float32())),
+        ]
+    )
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else None
+
+
+def _to_int(value: Any) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_row(item: dict) -> dict:
+    """Convert an item record to a row of the export schema."""
+    row: dict[str, Any] = {}
+    for column in _STRING_COLUMNS:
+        value = item.get(column)
+        row[column] = str(value) if value is not None else None
+    for column in _LIST_COLUMNS:
+        row[column] = [str(value) for value in item.get(column) or []]
+    for column in _INT_COLUMNS:
+        row[column] = _to_int(item.get(column))
+    for column in _TIMESTAMP_COLUMNS:
+        row[column] = _parse_timestamp(item.get(column))
+
+    try:
+        row["observed_date"] = date.fromisoformat((item.get("observed_at") or "")[:10])
+    except ValueError:
+        row["observed_date"] = None
+
+    confidence = item.get("theme_confidence")
+    row["theme_confidence"] = (
+        [(str(key), float(value)) for key, value in confidence.items()]
+        if isinstance(confidence, dict)
+        else None
+    )
+    return row
+
+
+def _write_table(table: "pa.Table", path: Path) -> None:
+    """Write a Parquet file (hidden temp file + rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+
+def _load_state(export_dir: Path) -> dict[str, dict]:
+    path = export_dir / STATE_FILE_NAME
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        logger.warning(f"Failed to load {path.name}, exporting all months again: {e}")
+        return {}
+    if state.get("version") != STATE_VERSION:
+        return {}
+    return state.get("months", {})
+
+
+def _save_state(export_dir: Path, months: dict[str, dict]) -> None:
+    export_dir.mkdir(parents=True, exist_ok=True)
+    path = export_dir / STATE_FILE_NAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": STATE_VERSION, "months": months}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _entries_digest(entries: list[OffsetEntry]) -> str:
+    """Fingerprint of sidecar entries (item_ids and byte ranges)."""
+    return hashlib.sha256("".join(entry.to_line() for entry in entries).encode()).hexdigest()
+
+
+def _state_matches(
+    month_state: dict, jsonl_path: Path, entries: list[OffsetEntry], partition: Path
+) -> bool:
+    """Whether the exported parts still describe a prefix of the JSONL file."""
+    parts = sorted(path.name for path in partition.glob("*.parquet"))
+    if parts != sorted(month_state.get("parts", [])):
+        return False
+
+    # Rewritten lines move or change the sidecar entries of the exported range
+    end = month_state.get("end", 0)
+    exported = [entry for entry in entries if entry.offset < end]
+    covered = exported[-1].offset + exported[-1].length if exported else 0
+    return (
+        covered == end
+        and len(exported) == month_state.get("rows")
+        and _entries_digest(exported) == month_state.get("digest")
+    )
+
+
+def export_month(
+    jsonl_path: Path, months: dict[str, dict], export_dir: Path = PARQUET_DIR, full: bool = False
+) -> int:
+    """
+    Export the lines of a monthly JSONL file not exported yet.
+
+    Args:
+        jsonl_path: Path to data/items/YYYY-MM.jsonl
+        months: Export state per month (updated in place)
+        export_dir: Root of the Parquet dataset
+        full: Export the whole month again
+
+    Returns:
+        Number of rows written
+    """
+    month = jsonl_path.stem
+    partition = export_dir / f"month={month}"
+    entries = load_offset_index(jsonl_path)
+
+    month_state = months.get(month)
+    if month_state is not None and not full:
+        if not _state_matches(month_state, jsonl_path, entries, partition):
+            logger.info(f"{jsonl_path.name} changed since the last export, exporting it again")
+            month_state = None
+    if month_state is None or full:
+        if partition.exists():
+            shutil.rmtree(partition)
+        month_state = {"end": 0, "digest": _entries_digest([]), "rows": 0, "parts": []}
+
+    months[month] = month_state
+
+    new_entries = [entry for entry in entries if entry.offset >= month_state["end"]]
+    if not new_entries:
+        return 0
+
+    try:
+        items = read_items(jsonl_path, new_entries)
+    except StaleOffsetIndex as e:
+        logger.warning(f"Stale offset index for {jsonl_path.name} ({e}), exporting it again")
+        entries = new_entries = rebuild_offset_index(jsonl_path)
+        if partition.exists():
+            shutil.rmtree(partition)
+        month_state.update(end=0, rows=0, parts=[])
+        if not new_entries:
+            month_state["digest"] = _entries_digest([])
+            return 0
+        items = read_items(jsonl_path, new_entries)
+    start = new_entries[0].offset
+    end = new_entries[-1].offset + new_entries[-1].length
+    name = f"part-{start:012d}-{end:012d}.parquet"
+    table = pa.Table.from_pylist([_to_row(item) for item in items], schema=_schema())
+    _write_table(table, partition / name)
+
+    month_state["end"] = end
+    month_state["digest"] = _entries_digest([entry for entry in entries if entry.offset < end])
+    month_state["rows"] += len(items)
+    month_state["parts"].append(name)
+    return len(items)
+
+
+def compact_month(month: str, months: dict[str, dict], export_dir: Path = PARQUET_DIR) -> None:
+    """
+    Merge the part files of a month into one.
+
+    The state is saved before the old parts are removed; a crash in between
+    leaves extra files, which makes the next export redo the month.
+
+    Args:
+        month: Month string (YYYY-MM)
+        months: Export state per month (updated and saved)
+        export_dir: Root of the Parquet dataset
+    """
+    month_state = months[month]
+    partition = export_dir / f"month={month}"
+    old_parts = [partition / name for name in month_state["parts"]]
+
+    table = ds.dataset([str(path) for path in old_parts], schema=_schema(), format="parquet").to_table()
+    name = f"part-{0:012d}-{month_state['end']:012d}.parquet"
+    _write_table(table, partition / name)
+
+    month_state["parts"] = [name]
+    _save_state(export_dir, months)
+    for path in old_parts:
+        if path.name != name:
+            path.unlink(missing_ok=True)
+    logger.info(f"Compacted {len(old_parts)} parts of {month} ({table.num_rows} rows)")
+
+
+def export_items(
+    month: str | None = None, export_dir: Path = PARQUET_DIR, full: bool = False
+) -> int:
+    """
+    Export new items of all months (or one month) to Parquet.
+
+    Args:
+        month: Only this month (YYYY-MM)
+        export_dir: Root of the Parquet dataset
+        full: Export the selected months again from scratch
+
+    Returns:
+        Number of rows written (0 if pyarrow is not installed)
+    """
+    if pa is None:
+        logger.warning("pyarrow is not installed, skipping Parquet export")
+        return 0
+
+    if month:
+        paths = [ITEMS_DIR / f"{month}.jsonl"]
+    else:
+        paths = month_paths(ITEMS_DIR)
+
+    months = _load_state(export_dir)
+    total = 0
+    for jsonl_path in paths:
+        if not month_exists(jsonl_path):
+            continue
+        written = export_month(jsonl_path, months, export_dir, full)
+        _save_state(export_dir, months)
+        if written:
+            logger.info(f"Exported {written} rows of {jsonl_path.stem}")
+        if len(months[jsonl_path.stem]["parts"]) > PARQUET_MAX_PARTS:
+            compact_month(jsonl_path.stem, months, export_dir)
+        total += written
+
+    logger.info(f"Parquet export: {total} new rows")
+    return total
+
+
+def read_columns(
+    columns: list[str], months: list[str] | None = None, export_dir: Path = PARQUET_DIR
+) -> "pa.Table":
+    """
+    Read selected columns of the exported items.
+
+    Only the requested columns (and partitions) are read from disk.
+
+    Args:
+        columns: Column names ("month" is the partition column)
+        months: Only these months (YYYY-MM)
+        export_dir: Root of the Parquet dataset
+
+    Returns:
+        pyarrow Table
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required to read the Parquet export")
+    dataset = ds.dataset(
+        export_dir,
+        schema=_schema().append(pa.field("month", pa.string())),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive"),
+    )
+    row_filter = ds.field("month").isin(months) if months else None
+    return dataset.to_table(columns=columns, filter=row_filter)
+
+
+def theme_counts(months: list[str] | None = None, export_dir: Path = PARQUET_DIR) -> "pa.Table":
+    """
+    Count items per month and theme, reading only those two columns.
+
+    Args:
+        months: Only these months (YYYY-MM)
+        export_dir: Root of the Parquet dataset
+
+    Returns:
+        Table of (month, theme, items), sorted by month and count
+    """
+    table = read_columns(["month", "themes"], months, export_dir).combine_chunks()
+    themes = table["themes"].chunk(0) if table.num_rows else pa.array([], pa.list_(pa.string()))
+    pairs = pa.table(
+        {
+            "month": pc.take(table["month"], pc.list_parent_indices(themes)),
+            "theme": pc.list_flatten(themes),
+        }
+    )
+    counts = pairs.group_by(["month", "theme"]).aggregate([("theme", "count")])
+    counts = counts.rename_columns(["month", "theme", "items"])
+    return counts.sort_by([("month", "ascending"), ("items", "descending")])
+
+
+def main() -> int:
+    """CLI entry point."""
+    setup_logging()
+
+    parser = argparse.ArgumentParser(
+        description="EIC Parquet export",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m scripts.parquet_export export
+  python -m scripts.parquet_export export --month 2024-01 --full
+  python -m scripts.parquet_export themes
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export new items")
+    export_parser.add_argument("--month", help="Month (YYYY-MM, default: all)")
+    export_parser.add_argument("--full", action="store_true", help="Export again from scratch")
+
+    themes_parser = subparsers.add_parser("themes", help="Items per month and theme")
+    themes_parser.add_argument("--month", action="append", help="Month (repeatable)")
+
+    args = parser.parse_args()
+
+    if pa is None:
+        logger.error("pyarrow is not installed (pip install pyarrow)")
+        return 1
+
+    if args.command == "export":
+        export_items(args.month, full=args.full)
+        return 0
+
+    for row in theme_counts(args.month).to_pylist():
+        print(f"{row['month']}  {row['theme']:<16} {row['items']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
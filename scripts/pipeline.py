@@ -0,0 +1,548 @@
+"""
+Staged item pipeline for a source group.
+
+Stages run concurrently, connected by bounded queues:
+1. Fetch: download article HTML (I/O threads)
+2. Extract: main-text extraction with trafilatura (CPU workers)
+3. Enrich: LLM analysis (concurrent LLM calls)
+
+Admission, deduplication and storage stay on the calling thread, so
+max_items, duplicate counting and partial-failure handling behave as in
+the sequential loop. Candidates are keyword pre-screened (scripts.prescreen)
+at admission and again after extraction; off-topic items are skipped or
+routed to the cheap model. Short articles are packed into shared LLM
+requests by ArticlePacker. Under a run deadline (scripts.deadline),
+admission stops once an item's estimated completion time no longer fits,
+and items still in flight when the work phase ends are abandoned: queued
+work is dropped and stage workers make no further fetch or LLM calls.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, NamedTuple
+
+from scripts.collect_candidates import Candidate
+from scripts.deadline import RunDeadline
+from scripts.fetch_content import fetch_page, prepare_content
+from scripts.llm_client import EnrichedItem, LLMClient
+from scripts.normalize import compute_item_id, normalize_url
+from scripts.prescreen import SCREEN_CHEAP, SCREEN_SKIP, score_candidate, score_content, screen
+from scripts.store import ItemWriter, build_complete_item
+from scripts.theme_tagger import fallback_enrichment
+from scripts.token_budget import budget_content, count_tokens
+from scripts.utils import (
+    LLM_PACK_ENABLED,
+    LLM_PACK_LINGER,
+    LLM_PACK_MAX_TOKENS,
+    LLM_PACK_SIZE,
+    LOCAL_FALLBACK_ENABLED,
+    OPENAI_CHEAP_MODEL,
+    PRESCREEN_MODE,
+    PRESCREEN_THRESHOLD,
+    PIPELINE_EXTRACT_WORKERS,
+    PIPELINE_FETCH_WORKERS,
+    PIPELINE_LLM_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Queue sentinel that stops one stage worker
+_STOP = object()
+
+
+class ProcessingStats(NamedTuple):
+    """Statistics from processing a source group."""
+
+    processed: list[dict]
+    duplicates: int
+    errors: list[str]
+    unfinished_sources: set[str]
+    screened: int = 0
+
+
+@dataclass
+class WorkItem:
+    """A candidate travelling through the pipeline stages."""
+
+    candidate: Candidate
+    url_normalized: str
+    item_id: str
+    html: str | None = None
+    text: str | None = None
+    content: str | None = None
+    enrichment: EnrichedItem | None = None
+    error: str | None = None
+    screen_score: int = 0
+    model: str | None = None
+    skipped: bool = False
+    enrichment_source: str = "llm"
+    theme_confidence: dict[str, float] | None = None
+
+
+def fetch_stage(work: WorkItem) -> None:
+    """Get the article HTML (or its extracted text) from the cache or network."""
+    work.html, work.text = fetch_page(work.candidate["url"], work.item_id)
+    if not work.html and work.text is None:
+        logger.warning(f"No HTML content from {work.candidate['url'][:50]}")
+
+
+def make_extract_stage(model: str) -> Callable[[WorkItem], None]:
+    """
+    Build the extraction stage for a model's token budget.
+
+    Args:
+        model: Model the extracted content is trimmed for
+
+    Returns:
+        Stage function
+    """
+
+    def extract_stage(work: WorkItem) -> None:
+        url = work.candidate["url"]
+        if work.html or work.text is not None:
+            work.content = prepare_content(work.html, url, work.item_id, work.text, model)
+        work.html = work.text = None  # Release the page as soon as it is no longer needed
+
+        if not work.content:
+            logger.warning(f"No content extracted: {url[:60]}...")
+
+        # Second screen on the article text for candidates with weak titles
+        if work.screen_score < PRESCREEN_THRESHOLD:
+            score = work.screen_score + score_content(work.content or "")
+            decision = screen(score)
+            if decision == SCREEN_SKIP:
+                work.skipped = True
+            elif decision == SCREEN_CHEAP:
+                work.model = OPENAI_CHEAP_MODEL
+                if work.content:
+                    work.content = budget_content(work.content, OPENAI_CHEAP_MODEL)
+            work.screen_score = score
+
+    return extract_stage
+
+
+class _PackSlot:
+    """One article waiting in ArticlePacker."""
+
+    def __init__(self, article: dict):
+        self.article = article
+        self.result: EnrichedItem | None = None
+        self.error: Exception | None = None
+        self.done = threading.Event()
+
+
+class ArticlePacker:
+    """
+    Group short articles from concurrent enrich workers into packed requests.
+
+    A worker adds its article to the open group for its model and waits.
+    The worker that fills the group to size, or whose linger time runs out
+    first, takes the group and makes the packed call for everyone in it.
+    """
+
+    def __init__(
+        self,
+        llm: LLMClient,
+        size: int = LLM_PACK_SIZE,
+        linger: float = LLM_PACK_LINGER,
+        stop: threading.Event | None = None,
+    ):
+        """
+        Initialize packer.
+
+        Args:
+            llm: LLM client instance
+            size: Maximum articles per request
+            linger: Seconds to wait for a group to fill before sending it
+            stop: Once set, groups are failed instead of sent
+        """
+        self.llm = llm
+        self.size = size
+        self.linger = linger
+        self.stop = stop
+        self.requests = 0
+        self.articles = 0
+        self._cond = threading.Condition()
+        self._groups: dict[str | None, list[_PackSlot]] = {}
+
+    def analyze(self, article: dict, model: str | None = None) -> EnrichedItem | None:
+        """
+        Analyze one article as part of a packed request.
+
+        Args:
+            article: analyze_article keyword arguments
+            model: Model override (articles are only packed with the same model)
+
+        Returns:
+            EnrichedItem or None on failure
+        """
+        slot = _PackSlot(article)
+        group = None
+        with self._cond:
+            waiting = self._groups.setdefault(model, [])
+            waiting.append(slot)
+            if len(waiting) >= self.size:
+                group = self._groups.pop(model)
+            else:
+                deadline = time.monotonic() + self.linger
+                # Wait until another worker takes the group or the linger runs out
+                while self._groups.get(model) is waiting:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        group = self._groups.pop(model)
+                        break
+                    self._cond.wait(remaining)
+            if group is not None:
+                self._cond.notify_all()
+
+        if group is not None:
+            self._run(group, model)
+
+        slot.done.wait()
+        if slot.error is not None:
+            raise slot.error
+        return slot.result
+
+    def _run(self, group: list[_PackSlot], model: str | None) -> None:
+        """Make the packed call for a group and hand out the results."""
+        try:
+            if self.stop is not None and self.stop.is_set():
+                raise RuntimeError("Pipeline stopped before the packed request")
+            results = self.llm.analyze_packed([slot.article for slot in group], model=model)
+            for slot, result in zip(group, results):
+                slot.result = result
+        except Exception as e:
+            for slot in group:
+                slot.error = e
+        finally:
+            with self._cond:
+                self.requests += 1
+                self.articles += len(group)
+            for slot in group:
+                slot.done.set()
+
+
+def make_enrich_stage(
+    llm: LLMClient,
+    packer: ArticlePacker | None = None,
+) -> Callable[[WorkItem], None]:
+    """
+    Build the enrichment stage for an LLM client.
+
+    Args:
+        llm: LLM client instance
+        packer: Packs articles under LLM_PACK_MAX_TOKENS (None = single calls)
+
+    Returns:
+        Stage function
+    """
+
+    def enrich_stage(work: WorkItem) -> None:
+        candidate = work.candidate
+        article = {
+            # Continue with empty content (LLM will handle it)
+            "content": work.content or "",
+            "source_name": candidate["source_name"],
+            "source_type": candidate["source_type"],
+            "publisher": candidate["publisher"],
+            "original_title": candidate["title"],
+            "language": candidate["language"],
+        }
+        model = work.model or llm.model
+        try:
+            if packer is not None and count_tokens(article["content"], model) <= LLM_PACK_MAX_TOKENS:
+                work.enrichment = packer.analyze(article, model=work.model)
+            else:
+                work.enrichment = llm.analyze_article(**article, model=work.model)
+        except Exception as e:
+            if not LOCAL_FALLBACK_ENABLED:
+                raise
+            logger.warning(f"LLM analysis raised, using local tagger: {e}")
+            work.enrichment = None
+
+        if not work.enrichment and LOCAL_FALLBACK_ENABLED:
+            # Keep the item with locally assigned themes instead of dropping it
+            work.enrichment, work.theme_confidence = fallback_enrichment(
+                candidate["title"],
+                work.content or "",
+                candidate["language"],
+                candidate.get("summary", ""),
+            )
+            work.enrichment_source = "local"
+            logger.info(f"Local enrichment (themes: {work.enrichment.themes}): {candidate['title'][:50]}")
+
+        if not work.enrichment:
+            work.error = f"LLM analysis failed: {candidate['url'][:50]}"
+
+    return enrich_stage
+
+
+def _stage_worker(
+    inbox: queue.Queue,
+    outbox: queue.Queue,
+    stage: Callable[[WorkItem], None],
+    busy: dict[str, float],
+    name: str,
+    lock: threading.Lock,
+    stop: threading.Event,
+) -> None:
+    """Run one stage until a stop sentinel or the stop event; failed items pass straight through."""
+    while True:
+        work = inbox.get()
+        if work is _STOP or stop.is_set():
+            return  # Abandoned work is dropped without another fetch or LLM call
+
+        if work.error is None and not work.skipped:
+            start = time.monotonic()
+            try:
+                stage(work)
+            except Exception as e:
+                work.error = f"Error processing {work.candidate['url'][:40]}: {str(e)}"
+            with lock:
+                busy[name] += time.monotonic() - start
+
+        outbox.put(work)  # Blocks while the next stage is saturated
+
+
+def _drain(stage_q: queue.Queue) -> None:
+    """Discard everything waiting in a stage queue."""
+    while True:
+        try:
+            stage_q.get_nowait()
+        except queue.Empty:
+            return
+
+
+def run_pipeline(
+    candidates: list[Candidate],
+    source_group: str,
+    max_items: int,
+    index: dict,
+    llm: LLMClient,
+    deadline: RunDeadline | None = None,
+    writer: ItemWriter | None = None,
+) -> ProcessingStats:
+    """
+    Fetch, extract, enrich and store candidates with overlapping stages.
+
+    At most max_items items are admitted beyond those already stored, so a
+    failed item frees a slot for the next candidate exactly like the
+    sequential loop did.
+
+    Args:
+        candidates: Candidates in priority order
+        source_group: "high" or "trend"
+        max_items: Maximum items to store
+        index: Deduplication index (updated on the calling thread)
+        llm: LLM client instance
+        deadline: Optional run deadline for admission control
+        writer: JSONL writer for the run (default: one for this call); it is
+            flushed before returning
+
+    Returns:
+        ProcessingStats with processed items, duplicate count, errors, the
+        sources whose candidates were not all handled and the screened count
+    """
+    processed = []
+    duplicates = 0
+    screened = 0
+    errors = []
+    unfinished_sources = set()
+
+    own_writer = writer is None
+    if writer is None:
+        writer = ItemWriter()
+
+    stop = threading.Event()
+    packer = ArticlePacker(llm, stop=stop) if LLM_PACK_ENABLED and LLM_PACK_SIZE > 1 else None
+    enrich_workers = max(PIPELINE_LLM_WORKERS, getattr(llm, "concurrency", 0))
+    if packer is not None:
+        # Enough waiting workers for a group to fill before its linger expires
+        enrich_workers = max(enrich_workers, LLM_PACK_SIZE)
+
+    fetch_q: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    extract_q: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    enrich_q: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    done_q: queue.Queue = queue.Queue()
+
+    stages = [
+        ("fetch", fetch_q, extract_q, fetch_stage, PIPELINE_FETCH_WORKERS),
+        ("extract", extract_q, enrich_q, make_extract_stage(llm.model), PIPELINE_EXTRACT_WORKERS),
+        # An async client bounds its own concurrency; give it enough callers
+        ("enrich", enrich_q, done_q, make_enrich_stage(llm, packer), enrich_workers),
+    ]
+    busy = {name: 0.0 for name, *_ in stages}
+    busy_lock = threading.Lock()
+
+    workers = []
+    for name, inbox, outbox, stage, count in stages:
+        for i in range(max(1, count)):
+            thread = threading.Thread(
+                target=_stage_worker,
+                args=(inbox, outbox, stage, busy, name, busy_lock, stop),
+                name=f"pipeline-{name}-{i}",
+                daemon=True,
+            )
+            thread.start()
+            workers.append((inbox, thread))
+
+    start = time.monotonic()
+    pending = iter(candidates)
+    exhausted = False
+    out_of_time = False
+    abandoned = False
+    # item_id -> (source_key, admission time)
+    in_flight: dict[str, tuple[str, float]] = {}
+    outstanding = 0
+
+    while True:
+        # Admit candidates while there is room under max_items and in the fetch queue
+        while not exhausted and outstanding + len(processed) < max_items and not fetch_q.full():
+            if deadline is not None and not deadline.admit("item"):
+                out_of_time = True
+                break
+
+            candidate = next(pending, None)
+            if candidate is None:
+                exhausted = True
+                break
+
+            url = candidate["url"]
+            item_id = compute_item_id(url)
+
+            # Skip duplicates (including the same URL already in flight)
+            if item_id in index or item_id in in_flight:
+                duplicates += 1
+                logger.debug(f"Skipping duplicate: {url[:60]}...")
+                continue
+
+            # Skip off-topic entries before fetching when the summary confirms it
+            screen_score = score_candidate(candidate["title"], candidate.get("summary", ""))
+            if (
+                PRESCREEN_MODE == "skip"
+                and candidate.get("summary")
+                and screen(screen_score) == SCREEN_SKIP
+            ):
+                screened += 1
+                logger.info(f"Screened out (score {screen_score}): {candidate['title'][:50]}")
+                continue
+
+            fetch_q.put(
+                WorkItem(candidate, normalize_url(url), item_id, screen_score=screen_score)
+            )
+            in_flight[item_id] = (candidate["source_key"], time.monotonic())
+            outstanding += 1
+
+        if outstanding == 0:
+            break
+
+        try:
+            if deadline is None:
+                work = done_q.get()
+            else:
+                work = done_q.get(timeout=max(0.0, deadline.work_remaining()))
+        except queue.Empty:
+            # The work phase is over; leave the rest for the next run
+            logger.warning(f"Deadline: abandoning {outstanding} in-flight {source_group} items")
+            unfinished_sources.update(source_key for source_key, _ in in_flight.values())
+            abandoned = True
+            break
+
+        outstanding -= 1
+        _, admitted_at = in_flight.pop(work.item_id)
+        if deadline is not None and not work.skipped:
+            deadline.record("item", time.monotonic() - admitted_at)
+        candidate = work.candidate
+
+        if work.skipped:
+            screened += 1
+            logger.info(f"Screened out (score {work.screen_score}): {candidate['title'][:50]}")
+            continue
+
+        if work.error:
+            errors.append(work.error)
+            unfinished_sources.add(candidate["source_key"])
+            logger.warning(work.error)
+            continue
+
+        try:
+            # Build complete item
+            item = build_complete_item(
+                url=candidate["url"],
+                url_normalized=work.url_normalized,
+                item_id=work.item_id,
+                source_group=source_group,
+                source_key=candidate["source_key"],
+                source_name=candidate["source_name"],
+                source_type=candidate["source_type"],
+                publisher=candidate["publisher"],
+                rss_title=candidate["title"],
+                rss_pub_date=candidate["pub_date"],
+                language=candidate["language"],
+                content_length=len(work.content) if work.content else 0,
+                enrichment=work.enrichment,
+                enrichment_source=work.enrichment_source,
+                theme_confidence=work.theme_confidence,
+            )
+
+            # Store item (indexed now, journaled once it is on disk)
+            writer.add(index, item, candidate["source_name"])
+
+            processed.append(item)
+            logger.info(f"Processed: {item['title'][:50]}...")
+
+        except Exception as e:
+            error_msg = f"Error processing {candidate['url'][:40]}: {str(e)}"
+            errors.append(error_msg)
+            unfinished_sources.add(candidate["source_key"])
+            logger.error(error_msg)
+            # Continue with next item (partial failure OK)
+
+    if not exhausted:
+        if out_of_time or abandoned:
+            logger.info(f"Stopped {source_group} admission at the run deadline")
+        else:
+            logger.info(f"Reached max items ({max_items}) for {source_group}")
+        unfinished_sources.update(c["source_key"] for c in pending)
+
+    if not abandoned:
+        for inbox, _ in workers:
+            inbox.put(_STOP)
+        for _, thread in workers:
+            thread.join()
+    else:
+        # Workers finish at most the call they are in, then exit; queued work is dropped
+        stop.set()
+        for stage_q in (fetch_q, extract_q, enrich_q):
+            _drain(stage_q)
+        for inbox, _ in workers:
+            try:
+                inbox.put_nowait(_STOP)  # Wake idle workers
+            except queue.Full:
+                pass
+    # Abandoned workers are daemon threads; their results are never stored
+
+    # Checkpoint so the group's items are on disk before anything reads them
+    if own_writer:
+        writer.close()
+    else:
+        writer.flush()
+
+    logger.info(
+        f"Pipeline {source_group}: {len(processed)} items in {time.monotonic() - start:.1f}s "
+        f"(busy: " + ", ".join(f"{name} {seconds:.1f}s" for name, seconds in busy.items()) + ")"
+    )
+    if packer is not None and packer.requests:
+        logger.info(f"Packed {packer.articles} short articles into {packer.requests} requests")
+
+    return ProcessingStats(
+        processed=processed,
+        duplicates=duplicates,
+        errors=errors,
+        unfinished_sources=unfinished_sources,
+        screened=screened,
+    )
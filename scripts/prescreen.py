@@ -0,0 +1,201 @@
+"""
+Local relevance pre-screen using the themes.yaml keyword dictionary.
+
+Every theme keyword is compiled into one Aho-Corasick automaton, so a text
+is scanned once regardless of how many keywords there are. Candidates are
+scored on the RSS title and summary before fetching, and again on the
+extracted text; low scores are skipped or sent to a cheaper model before
+any paid LLM call.
+
+Provides:
+- KeywordMatcher: multi-pattern keyword matcher
+- get_matcher: matcher built from themes.yaml (cached)
+- score_candidate / score_content: relevance scores
+- screen: decide full, cheap or skip for a score
+"""
+
+import logging
+from collections import deque
+from functools import lru_cache
+
+from scripts.utils import (
+    OPENAI_CHEAP_MODEL,
+    PRESCREEN_MODE,
+    PRESCREEN_THRESHOLD,
+    load_themes_config,
+)
+
+logger = logging.getLogger(__name__)
+
+# Screening decisions
+SCREEN_FULL = "full"
+SCREEN_CHEAP = "cheap"
+SCREEN_SKIP = "skip"
+
+# Title keywords weigh more than summary keywords
+TITLE_WEIGHT = 2
+
+# Distinct keywords counted from the extracted text at most
+CONTENT_SCORE_CAP = 5
+
+
+def _is_word_char(char: str) -> bool:
+    """Check for an ASCII letter or digit (word boundary test for Latin keywords)."""
+    return char.isascii() and char.isalnum()
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over lowercased keywords.
+
+    Latin keywords only match on word boundaries ("office" does not match
+    "officer"); CJK keywords match anywhere.
+    """
+
+    def __init__(self, keywords: dict[str, list[str]]):
+        """
+        Build the automaton.
+
+        Args:
+            keywords: Theme key -> keywords
+        """
+        self.keywords: list[str] = []
+        self.themes: list[set[str]] = []
+        index: dict[str, int] = {}
+        for theme_key, words in keywords.items():
+            for word in words:
+                word = str(word).strip().lower()
+                if not word:
+                    continue
+                if word not in index:
+                    index[word] = len(self.keywords)
+                    self.keywords.append(word)
+                    self.themes.append(set())
+                self.themes[index[word]].add(theme_key)
+
+        self._boundary = [_is_word_char(word[0]) or _is_word_char(word[-1]) for word in self.keywords]
+
+        # Trie
+        self._goto: list[dict[str, int]] = [{}]
+        self._output: list[list[int]] = [[]]
+        for i, word in enumerate(self.keywords):
+            state = 0
+            for char in word:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(i)
+
+        # Failure links (breadth-first), merging outputs along the way
+        self._fail = [0] * len(self._goto)
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> set[int]:
+        """
+        Find the distinct keywords occurring in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Indices into self.keywords
+        """
+        text = text.lower()
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found: set[int] = set()
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for i in output[state]:
+                if i in found:
+                    continue
+                if self._boundary[i]:
+                    start = position - len(self.keywords[i]) + 1
+                    if start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if position + 1 < len(text) and _is_word_char(text[position + 1]):
+                        continue
+                found.add(i)
+        return found
+
+    def themes_for(self, matches: set[int]) -> set[str]:
+        """Get the theme keys of matched keywords."""
+        return set().union(*(self.themes[i] for i in matches)) if matches else set()
+
+
+@lru_cache(maxsize=1)
+def get_matcher() -> KeywordMatcher:
+    """Get the matcher for all themes.yaml keywords."""
+    config = load_themes_config()
+    matcher = KeywordMatcher(
+        {theme["key"]: theme.get("keywords", []) for theme in config.get("themes", [])}
+    )
+    logger.debug(f"Pre-screen matcher: {len(matcher.keywords)} keywords")
+    return matcher
+
+
+def score_candidate(title: str, summary: str = "") -> int:
+    """
+    Score an RSS entry from its title and summary.
+
+    Args:
+        title: RSS title
+        summary: RSS summary (plain text)
+
+    Returns:
+        Weighted count of distinct keywords
+    """
+    matcher = get_matcher()
+    title_hits = matcher.find(title)
+    summary_hits = matcher.find(summary) - title_hits if summary else set()
+    return TITLE_WEIGHT * len(title_hits) + len(summary_hits)
+
+
+def score_content(text: str) -> int:
+    """
+    Score extracted article text.
+
+    Args:
+        text: Extracted text
+
+    Returns:
+        Count of distinct keywords (capped)
+    """
+    return min(len(get_matcher().find(text)), CONTENT_SCORE_CAP)
+
+
+def screen(score: int, threshold: int = PRESCREEN_THRESHOLD, mode: str = PRESCREEN_MODE) -> str:
+    """
+    Decide how to handle a candidate with a given relevance score.
+
+    Args:
+        score: Relevance score
+        threshold: Minimum score for the full model
+        mode: "off", "cheap" or "skip"
+
+    Returns:
+        SCREEN_FULL, SCREEN_CHEAP or SCREEN_SKIP
+    """
+    if mode == "off" or score >= threshold:
+        return SCREEN_FULL
+    if mode == "skip":
+        return SCREEN_SKIP
+    return SCREEN_CHEAP if OPENAI_CHEAP_MODEL else SCREEN_FULL
@@ -0,0 +1,127 @@
+"""
+Token-bucket rate limiting for OpenAI requests.
+
+Provides:
+- TokenBucket: continuously refilled bucket, usable from threads and asyncio
+- RateLimiter: paired requests-per-minute and tokens-per-minute buckets
+- estimate_tokens: rough local token estimate from text length
+"""
+
+import asyncio
+import threading
+import time
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without a tokenizer.
+
+    CJK characters are counted as one token each, other characters as
+    roughly four per token.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Estimated token count
+    """
+    wide = sum(1 for ch in text if ord(ch) >= 0x3000)
+    return wide + (len(text) - wide + 3) // 4
+
+
+class TokenBucket:
+    """Bucket of `per_minute` units, refilled continuously."""
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize token bucket.
+
+        Args:
+            per_minute: Capacity and refill rate per minute
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take `amount` units now, possibly going into debt.
+
+        Args:
+            amount: Units to take (capped at capacity)
+
+        Returns:
+            Seconds the caller must wait before proceeding
+        """
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+            self._updated = now
+            self._level -= amount
+
+            wait = -self._level / self.rate if self._level < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Block all reservations for the given time (e.g. a 429 Retry-After).
+
+        Args:
+            seconds: Pause length
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits."""
+
+    def __init__(self, rpm: float, tpm: float):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rpm: Requests per minute
+            tpm: Tokens per minute
+        """
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve one request and `tokens` tokens; return the wait time."""
+        return max(self.requests.reserve(1), self.tokens.reserve(tokens))
+
+    def acquire(self, tokens: int) -> None:
+        """
+        Block the calling thread until the request may be sent.
+
+        Args:
+            tokens: Estimated tokens for the request
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int) -> None:
+        """
+        Wait in the event loop until the request may be sent.
+
+        Args:
+            tokens: Estimated tokens for the request
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Pause all requests (honoring a Retry-After header).
+
+        Args:
+            seconds: Pause length
+        """
+        self.requests.pause(seconds)
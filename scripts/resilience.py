@@ -0,0 +1,374 @@
+"""
+Retry and circuit-breaker policy for outbound calls.
+
+Errors are classified as retryable (timeouts, connection errors, 408/425/
+429/5xx) or fatal (other 4xx, invalid requests, parse errors); only
+retryable ones are retried. Delays use full jitter, a Retry-After hint
+overrides the computed delay, and all retries in a run draw from one
+shared budget. Repeated retryable failures against the same host or
+service open its circuit breaker, so later calls fail fast instead of
+walking the whole retry ladder again.
+
+Provides:
+- retry_with_backoff: retry decorator applying the policy
+- classify_error / is_retryable: error classification
+- retry_after_seconds: Retry-After hint from an error response
+- CircuitBreaker / get_breaker / CircuitOpenError: per-host/service breakers
+- RetryBudget / retry_budget: per-run retry budget
+- log_resilience_stats: run summary
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from functools import wraps
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+import requests
+
+from scripts.utils import BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS, RETRY_BUDGET
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE = "retryable"
+FATAL = "fatal"
+
+# HTTP statuses worth retrying
+RETRYABLE_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host or service whose breaker is open."""
+
+
+def _status_code(error: Exception) -> int | None:
+    """Get the HTTP status code carried by an exception, if any."""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Classify an exception as retryable or fatal.
+
+    Args:
+        error: Exception raised by an outbound call
+
+    Returns:
+        RETRYABLE or FATAL
+    """
+    if isinstance(error, CircuitOpenError):
+        return FATAL
+
+    status = _status_code(error)
+    if status is not None:
+        if status == 429 and "insufficient_quota" in str(error):
+            return FATAL  # Billing problem; retrying cannot help
+        return RETRYABLE if status in RETRYABLE_STATUSES else FATAL
+
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return RETRYABLE
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return RETRYABLE
+
+    # openai.APIConnectionError / APITimeoutError without importing the SDK here
+    if type(error).__name__ in ("APIConnectionError", "APITimeoutError"):
+        return RETRYABLE
+
+    if isinstance(error, (requests.RequestException, json.JSONDecodeError, ValueError, KeyError)):
+        return FATAL
+
+    # Unknown errors (e.g. GraphQL error payloads) keep the old retrying behavior
+    return RETRYABLE
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether an exception is worth retrying."""
+    return classify_error(error) == RETRYABLE
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """
+    Read the Retry-After delay from an API error response.
+
+    Args:
+        error: Exception raised by the API client
+
+    Returns:
+        Delay in seconds, or None if the response carries no hint
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def full_jitter_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    Compute a full-jitter backoff delay.
+
+    Args:
+        attempt: Zero-based attempt number that just failed
+        base_delay: Initial delay in seconds
+        max_delay: Maximum delay in seconds
+
+    Returns:
+        Uniform random delay in [0, min(max_delay, base_delay * 2**attempt)]
+    """
+    return random.uniform(0.0, min(max_delay, base_delay * (2**attempt)))
+
+
+class RetryBudget:
+    """Thread-safe cap on the total number of retries in a run."""
+
+    def __init__(self, limit: int):
+        """
+        Initialize budget.
+
+        Args:
+            limit: Retries allowed across all calls
+        """
+        self.limit = limit
+        self.spent = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False when it is exhausted."""
+        with self._lock:
+            if self.spent >= self.limit:
+                self.denied += 1
+                return False
+            self.spent += 1
+            return True
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after failure_threshold retryable failures in a row, rejects calls
+    for reset_seconds, then lets one trial call through (half-open): success
+    closes it, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = BREAKER_RESET_SECONDS,
+    ):
+        """
+        Initialize breaker.
+
+        Args:
+            name: Host or service name (for logging)
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: Time before a trial call is allowed
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trips = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """
+        Check that a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at >= self.reset_seconds and not self._trial_in_flight:
+                self._trial_in_flight = True  # Half-open: one trial call
+                return
+            self.rejected += 1
+        raise CircuitOpenError(f"Circuit open for {self.name}")
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a retryable failure, opening the circuit at the threshold."""
+        with self._lock:
+            self.failures += 1
+            closed_at_threshold = self.opened_at is None and self.failures >= self.failure_threshold
+            if self._trial_in_flight or closed_at_threshold:
+                self.trips += 1
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+                logger.warning(f"Circuit opened for {self.name} after {self.failures} failures")
+
+    def release_trial(self) -> None:
+        """Give up a half-open trial that ended without an outcome, allowing another."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+# Retries shared by every call in this run
+retry_budget = RetryBudget(RETRY_BUDGET)
+
+
+def get_breaker(key: str) -> CircuitBreaker:
+    """
+    Get the circuit breaker for a host or service.
+
+    Args:
+        key: Hostname or service name (e.g. "openai")
+
+    Returns:
+        Shared CircuitBreaker
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker(key)
+        return breaker
+
+
+def record_outcome(breaker: CircuitBreaker | None, error: Exception | None) -> None:
+    """
+    Feed a call outcome to a breaker.
+
+    Fatal errors still prove the host answered, so they count as success.
+
+    Args:
+        breaker: Breaker of the called host or service (None = no-op)
+        error: Exception raised by the call, or None on success
+    """
+    if breaker is None:
+        return
+    if error is not None and is_retryable(error):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+def host_of(url: str, *args: Any, **kwargs: Any) -> str:
+    """Circuit key for a URL-taking function: its hostname."""
+    return urlparse(url).hostname or url
+
+
+def retry_with_backoff(
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    exceptions: tuple = (Exception,),
+    circuit: str | Callable[..., str] | None = None,
+) -> Callable:
+    """
+    Decorator for retrying functions with the classified backoff policy.
+
+    Only exceptions in `exceptions` that classify as retryable are retried,
+    with full-jitter delays (or the server's Retry-After) while the run's
+    retry budget lasts. A Retry-After longer than max_delay is not waited
+    out; the error is raised instead.
+
+    Args:
+        max_retries: Maximum number of retry attempts
+        base_delay: Initial delay in seconds
+        max_delay: Maximum delay in seconds
+        exceptions: Tuple of exceptions to catch
+        circuit: Breaker key, or a function of the call arguments returning it
+
+    Returns:
+        Decorated function
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            breaker = None
+            if circuit is not None:
+                key = circuit if isinstance(circuit, str) else circuit(*args, **kwargs)
+                breaker = get_breaker(key)
+
+            for attempt in range(max_retries + 1):
+                if breaker is not None:
+                    breaker.before_call()
+                try:
+                    result = func(*args, **kwargs)
+                except exceptions as e:
+                    record_outcome(breaker, e)
+                    if not is_retryable(e) or attempt >= max_retries:
+                        raise
+
+                    delay = retry_after_seconds(e)
+                    if delay is None:
+                        delay = full_jitter_delay(attempt, base_delay, max_delay)
+                    elif delay > max_delay:
+                        raise  # Waiting that long would stall the run
+                    if not retry_budget.try_spend():
+                        raise
+                    logger.warning(
+                        f"Attempt {attempt + 1}/{max_retries + 1} failed: {e}. "
+                        f"Retrying in {delay:.1f}s..."
+                    )
+                    time.sleep(delay)
+                except BaseException:
+                    # Unlisted errors and interrupts must not leave a trial in flight
+                    if breaker is not None:
+                        breaker.release_trial()
+                    raise
+                else:
+                    record_outcome(breaker, None)
+                    return result
+
+        return wrapper
+
+    return decorator
+
+
+def log_resilience_stats() -> None:
+    """Log retry budget usage and breakers that tripped."""
+    logger.info(
+        f"Retries: {retry_budget.spent}/{retry_budget.limit} budget used, "
+        f"{retry_budget.denied} denied"
+    )
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    for breaker in breakers:
+        if breaker.trips or breaker.rejected:
+            logger.info(
+                f"Circuit {breaker.name}: tripped {breaker.trips}x, "
+                f"{breaker.rejected} calls rejected"
+            )
@@ -9,33 +9,47 @@ Runs the complete EIC pipeline:
 5. Store in JSONL + update index
 6. Post to GitHub Discussions
 7. Send Slack notification
+
+Steps 3-5 run as an overlapped staged pipeline (see scripts.pipeline).
+With EIC_RUN_BUDGET set, steps 1-5 stop admitting work before the run
+deadline so saving, Discussions and Slack keep a reserved time slice
+(see scripts.deadline).
 """
 
 import argparse
+import copy
 import logging
 import sys
-from typing import NamedTuple
+import time
 
 from scripts.utils import (
     setup_logging,
     get_jst_today,
+    log_http_stats,
     OPENAI_API_KEY,
     GITHUB_TOKEN,
     GITHUB_REPO_OWNER,
     GITHUB_REPO_NAME,
     MAX_HIGH_TRUST_ITEMS,
     MAX_TREND_ITEMS,
+    LLM_ASYNC_ENABLED,
+    PARQUET_EXPORT_ENABLED,
+    SEAL_CLOSED_MONTHS,
+    load_sources_config,
 )
 from scripts.collect_candidates import collect_from_sources
-from scripts.normalize import compute_item_id, normalize_url, is_duplicate
-from scripts.fetch_content import fetch_and_extract
-from scripts.llm_client import LLMClient
+from scripts.deadline import RunDeadline, create_deadline
+from scripts.feed_state import load_feed_state, save_feed_state, rollback_sources
+from scripts.fetch_content import get_extraction_engine, log_cache_stats
+from scripts.llm_client import AsyncLLMClient, LLMClient
+from scripts.month_archive import seal_closed_months
+from scripts.parquet_export import export_items
+from scripts.pipeline import ProcessingStats, run_pipeline
+from scripts.resilience import log_resilience_stats
 from scripts.store import (
+    ItemWriter,
     load_index,
     save_index,
-    add_to_index,
-    append_item,
-    build_complete_item,
     get_items_for_date,
 )
 from scripts.github_discussions import (
@@ -47,14 +61,6 @@ from scripts.slack_notify import send_daily_notification, send_no_updates_notifi
 logger = logging.getLogger(__name__)
 
 
-class ProcessingStats(NamedTuple):
-    """Statistics from processing a source group."""
-
-    processed: list[dict]
-    duplicates: int
-    errors: list[str]
-
-
 def validate_config() -> list[str]:
     """
     Validate required configuration.
@@ -78,6 +84,9 @@ def process_source_group(
     max_items: int,
     index: dict,
     llm: LLMClient,
+    feed_state: dict[str, dict] | None = None,
+    deadline: RunDeadline | None = None,
+    writer: ItemWriter | None = None,
 ) -> ProcessingStats:
     """
     Process one source group (high or trend).
@@ -87,97 +96,20 @@ def process_source_group(
         max_items: Maximum items to process
         index: Deduplication index
         llm: LLM client instance
+        feed_state: Optional feed state store for conditional GET
+        deadline: Optional run deadline for admission control
+        writer: JSONL writer shared by the run
 
     Returns:
-        ProcessingStats with processed items, duplicate count, and errors
+        ProcessingStats with processed items, duplicate count, errors, and
+        the sources whose candidates were not all handled
     """
-    processed = []
-    duplicates = 0
-    errors = []
-
     # Collect candidates from RSS
-    candidates = collect_from_sources(source_group)
+    candidates = collect_from_sources(source_group, feed_state=feed_state, deadline=deadline)
     logger.info(f"Collected {len(candidates)} candidates from {source_group} sources")
 
-    for candidate in candidates:
-        # Check if we've reached the limit
-        if len(processed) >= max_items:
-            logger.info(f"Reached max items ({max_items}) for {source_group}")
-            break
-
-        url = candidate["url"]
-
-        # Normalize URL and compute item_id
-        url_normalized = normalize_url(url)
-        item_id = compute_item_id(url)
-
-        # Skip duplicates
-        if is_duplicate(url, index):
-            duplicates += 1
-            logger.debug(f"Skipping duplicate: {url[:60]}...")
-            continue
-
-        try:
-            # Fetch and extract content
-            content = fetch_and_extract(url)
-            content_length = len(content) if content else 0
-
-            if not content:
-                logger.warning(f"No content extracted: {url[:60]}...")
-                # Continue with empty content (LLM will handle it)
-                content = ""
-
-            # Analyze with LLM
-            enrichment = llm.analyze_article(
-                content=content,
-                source_name=candidate["source_name"],
-                source_type=candidate["source_type"],
-                publisher=candidate["publisher"],
-                original_title=candidate["title"],
-                language=candidate["language"],
-            )
-
-            if not enrichment:
-                error_msg = f"LLM analysis failed: {url[:50]}"
-                errors.append(error_msg)
-                logger.warning(error_msg)
-                continue
-
-            # Build complete item
-            item = build_complete_item(
-                url=url,
-                url_normalized=url_normalized,
-                item_id=item_id,
-                source_group=source_group,
-                source_key=candidate["source_key"],
-                source_name=candidate["source_name"],
-                source_type=candidate["source_type"],
-                publisher=candidate["publisher"],
-                rss_title=candidate["title"],
-                rss_pub_date=candidate["pub_date"],
-                language=candidate["language"],
-                content_length=content_length,
-                enrichment=enrichment,
-            )
-
-            # Store item
-            append_item(item)
-            add_to_index(index, item_id, candidate["source_name"], item["title"])
-
-            processed.append(item)
-            logger.info(f"Processed: {item['title'][:50]}...")
-
-        except Exception as e:
-            error_msg = f"Error processing {url[:40]}: {str(e)}"
-            errors.append(error_msg)
-            logger.error(error_msg)
-            # Continue with next item (partial failure OK)
-
-    return ProcessingStats(
-        processed=processed,
-        duplicates=duplicates,
-        errors=errors,
-    )
+    # Fetch, extract, enrich and store with overlapping stages
+    return run_pipeline(candidates, source_group, max_items, index, llm, deadline, writer)
 
 
 def select_highlights(
@@ -231,21 +163,35 @@ def select_highlights(
     return highlights
 
 
-def run_daily(date_override: str | None = None) -> int:
+def run_daily(
+    date_override: str | None = None,
+    use_llm_cache: bool | None = None,
+    async_llm: bool | None = None,
+    budget_seconds: float | None = None,
+) -> int:
     """
     Execute daily collection pipeline.
 
     Args:
         date_override: Optional date string (YYYY-MM-DD) for testing
+        use_llm_cache: Override the LLM response cache setting (None = env)
+        async_llm: Use the AsyncOpenAI client (None = EIC_LLM_ASYNC)
+        budget_seconds: Run deadline in seconds (None = EIC_RUN_BUDGET, 0 = unlimited)
 
     Returns:
         Exit code (0 = success, 1 = failure)
     """
     logger = setup_logging()
+    deadline = create_deadline(budget_seconds)
 
     logger.info("=" * 60)
     logger.info("EIC Daily Collection Started")
     logger.info("=" * 60)
+    if deadline is not None:
+        logger.info(
+            f"Run budget: {deadline.budget_seconds:.0f}s "
+            f"({deadline.reserve_seconds:.0f}s reserved for save and notifications)"
+        )
 
     # Validate configuration
     config_errors = validate_config()
@@ -262,45 +208,105 @@ def run_daily(date_override: str | None = None) -> int:
     index = load_index()
     logger.info(f"Loaded index: {len(index)} existing entries")
 
+    feed_state = load_feed_state()
+    previous_feed_state = copy.deepcopy(feed_state)
+
     try:
-        llm = LLMClient()
-        logger.info(f"LLM client initialized (model: {llm.model})")
+        if LLM_ASYNC_ENABLED if async_llm is None else async_llm:
+            llm = AsyncLLMClient(use_cache=use_llm_cache)
+            logger.info(
+                f"Async LLM client initialized (model: {llm.model}, "
+                f"concurrency: {llm.concurrency})"
+            )
+        else:
+            llm = LLMClient(use_cache=use_llm_cache)
+            logger.info(f"LLM client initialized (model: {llm.model})")
+        if llm.cascade:
+            logger.info(f"Model cascade: {llm.cheap_model} first, escalating to {llm.model}")
     except Exception as e:
         logger.error(f"Failed to initialize LLM client: {e}")
         return 1
 
     all_errors = []
 
-    # Process HIGH TRUST sources
-    logger.info("-" * 40)
-    logger.info("Processing HIGH TRUST sources")
-    high_stats = process_source_group("high", MAX_HIGH_TRUST_ITEMS, index, llm)
-    all_errors.extend(high_stats.errors)
-    logger.info(
-        f"HIGH: processed={len(high_stats.processed)}, "
-        f"duplicates={high_stats.duplicates}, "
-        f"errors={len(high_stats.errors)}"
-    )
+    # One JSONL writer for the whole run; it checkpoints as items come in
+    writer = ItemWriter()
 
-    # Process TREND sources
-    logger.info("-" * 40)
-    logger.info("Processing TREND sources")
-    trend_stats = process_source_group("trend", MAX_TREND_ITEMS, index, llm)
-    all_errors.extend(trend_stats.errors)
-    logger.info(
-        f"TREND: processed={len(trend_stats.processed)}, "
-        f"duplicates={trend_stats.duplicates}, "
-        f"errors={len(trend_stats.errors)}"
-    )
+    stats_by_group: dict[str, ProcessingStats] = {}
+    try:
+        # Process HIGH TRUST sources
+        logger.info("-" * 40)
+        logger.info("Processing HIGH TRUST sources")
+        high_stats = process_source_group(
+            "high", MAX_HIGH_TRUST_ITEMS, index, llm, feed_state, deadline, writer
+        )
+        stats_by_group["high"] = high_stats
+        all_errors.extend(high_stats.errors)
+        logger.info(
+            f"HIGH: processed={len(high_stats.processed)}, "
+            f"duplicates={high_stats.duplicates}, "
+            f"screened={high_stats.screened}, "
+            f"errors={len(high_stats.errors)}"
+        )
+
+        # Checkpoint the index so stored HIGH items stay deduplicated even if the job is killed
+        save_index(index)
+
+        # Process TREND sources
+        logger.info("-" * 40)
+        logger.info("Processing TREND sources")
+        trend_stats = process_source_group(
+            "trend", MAX_TREND_ITEMS, index, llm, feed_state, deadline, writer
+        )
+        stats_by_group["trend"] = trend_stats
+        all_errors.extend(trend_stats.errors)
+        logger.info(
+            f"TREND: processed={len(trend_stats.processed)}, "
+            f"duplicates={trend_stats.duplicates}, "
+            f"screened={trend_stats.screened}, "
+            f"errors={len(trend_stats.errors)}"
+        )
+    except Exception as e:
+        logger.error(f"Source processing failed, saving what was stored: {e}")
+        raise
+    finally:
+        # Flush the remaining items, then save the index
+        writer.close()
+        save_index(index)
+
+        # Save feed state, keeping old validators for sources with leftover candidates
+        # (every source of a group that did not finish)
+        unfinished_sources = set()
+        for group in ("high", "trend"):
+            if group in stats_by_group:
+                unfinished_sources |= stats_by_group[group].unfinished_sources
+            else:
+                unfinished_sources.update(
+                    source.get("key", "") for source in load_sources_config(group)
+                )
+        rollback_sources(feed_state, previous_feed_state, unfinished_sources)
+        save_feed_state(feed_state)
+
+    # Compress closed months; the current month stays appendable
+    if SEAL_CLOSED_MONTHS:
+        try:
+            seal_closed_months()
+        except Exception as e:
+            logger.warning(f"Sealing closed months failed: {e}")
 
-    # Save index
-    save_index(index)
+    # Append the new items to the columnar export (optional, needs pyarrow)
+    if PARQUET_EXPORT_ENABLED:
+        try:
+            export_items()
+        except Exception as e:
+            logger.warning(f"Parquet export failed: {e}")
 
     # Prepare stats for Discussion
     stats = {
         "high_count": len(high_stats.processed),
         "trend_count": len(trend_stats.processed),
         "duplicates": high_stats.duplicates + trend_stats.duplicates,
+        "screened": high_stats.screened + trend_stats.screened,
         "errors": all_errors[:10],  # Limit errors shown
     }
 
@@ -359,13 +365,17 @@ def run_daily(date_override: str | None = None) -> int:
 
             # Generate LLM summary of the day's trends
             trend_summary_text = None
-            try:
-                logger.info("Generating daily trend summary with LLM...")
-                trend_summary_text = llm.generate_daily_summary(all_items)
-                if trend_summary_text:
-                    logger.info(f"Trend summary generated: {trend_summary_text[:50]}...")
-            except Exception as e:
-                logger.warning(f"Failed to generate trend summary: {e}")
+            if deadline is None or deadline.admit("summary", reserved=True):
+                try:
+                    logger.info("Generating daily trend summary with LLM...")
+                    started = time.monotonic()
+                    trend_summary_text = llm.generate_daily_summary(all_items)
+                    if deadline is not None:
+                        deadline.record("summary", time.monotonic() - started)
+                    if trend_summary_text:
+                        logger.info(f"Trend summary generated: {trend_summary_text[:50]}...")
+                except Exception as e:
+                    logger.warning(f"Failed to generate trend summary: {e}")
 
             send_daily_notification(
                 date_str=date_str,
@@ -395,7 +405,15 @@ def run_daily(date_override: str | None = None) -> int:
     logger.info(f"  HIGH items: {len(high_items)}")
     logger.info(f"  TREND items: {len(trend_items)}")
     logger.info(f"  Duplicates skipped: {stats['duplicates']}")
+    logger.info(f"  Screened out: {stats['screened']}")
     logger.info(f"  Errors: {len(all_errors)}")
+    log_http_stats()
+    get_extraction_engine().log_stats()
+    log_cache_stats()
+    llm.log_cache_stats()
+    log_resilience_stats()
+    if deadline is not None:
+        deadline.log_stats()
     if discussion_url:
         logger.info(f"  Discussion: {discussion_url}")
     logger.info("=" * 60)
@@ -413,6 +431,9 @@ def main() -> int:
 Examples:
   python -m scripts.run_daily
   python -m scripts.run_daily --date 2024-01-15
+  python -m scripts.run_daily --no-llm-cache
+  python -m scripts.run_daily --async-llm
+  python -m scripts.run_daily --budget 1500
         """,
     )
     parser.add_argument(
@@ -422,8 +443,32 @@ Examples:
         help="Override date (YYYY-MM-DD format, for testing)",
     )
 
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Bypass the LLM response cache (always call OpenAI)",
+    )
+
+    parser.add_argument(
+        "--async-llm",
+        action="store_true",
+        help="Use the AsyncOpenAI client with RPM/TPM limiting",
+    )
+
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        help="Run deadline in seconds (default: EIC_RUN_BUDGET, 0 = unlimited)",
+    )
+
     args = parser.parse_args()
-    return run_daily(args.date)
+    return run_daily(
+        args.date,
+        use_llm_cache=False if args.no_llm_cache else None,
+        async_llm=True if args.async_llm else None,
+        budget_seconds=args.budget,
+    )
 
 
 if __name__ == "__main__":
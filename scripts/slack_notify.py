@@ -8,7 +8,8 @@ import logging
 
 import requests
 
-from scripts.utils import SLACK_WEBHOOK_URL, retry_with_backoff
+from scripts.resilience import retry_with_backoff
+from scripts.utils import SLACK_WEBHOOK_URL, get_http_session
 
 logger = logging.getLogger(__name__)
 
@@ -236,7 +237,12 @@ def build_slack_blocks(
     return blocks
 
 
-@retry_with_backoff(max_retries=2, base_delay=2.0, exceptions=(requests.RequestException,))
+@retry_with_backoff(
+    max_retries=2,
+    base_delay=2.0,
+    exceptions=(requests.RequestException,),
+    circuit="slack",
+)
 def send_daily_notification(
     date_str: str,
     discussion_url: str,
@@ -286,10 +292,9 @@ def send_daily_notification(
     }
 
     try:
-        response = requests.post(
+        response = get_http_session().post(
             SLACK_WEBHOOK_URL,
             json=payload,
-            timeout=30,
         )
 
         if response.status_code == 200:
@@ -356,10 +361,9 @@ def send_no_updates_notification(date_str: str) -> bool:
     }
 
     try:
-        response = requests.post(
+        response = get_http_session().post(
             SLACK_WEBHOOK_URL,
             json=payload,
-            timeout=30,
         )
 
         if response.status_code == 200:
@@ -411,10 +415,9 @@ def send_error_notification(date_str: str, error_message: str) -> bool:
     }
 
     try:
-        response = requests.post(
+        response = get_http_session().post(
             SLACK_WEBHOOK_URL,
             json=payload,
-            timeout=30,
         )
         return response.status_code == 200
     except Exception as e:
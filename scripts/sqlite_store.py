@@ -0,0 +1,422 @@
+"""
+Optional SQLite mirror of the item store with full-text search.
+
+The JSONL files stay the source of truth. With EIC_SQLITE=1, items and
+index entries are also upserted into a SQLite database as they are stored,
+so history can be searched across years without scanning every month.
+
+Data format (data/eic.sqlite3):
+- items: one row per item (key_points, tags, theme_confidence as JSON)
+- item_themes: (item_id, theme) pairs
+- seen: the deduplication index (item_id -> first_seen, source, title)
+- items_fts: FTS5 with the trigram tokenizer over title, summary,
+  key_points and tags (works for Japanese without word segmentation)
+
+Trigram matching needs three or more characters, so shorter search terms
+(e.g. "改正") are matched with LIKE on the rows the longer terms select.
+
+Provides:
+- connect: open a database, creating the schema
+- upsert_items / upsert_index_entries: write rows
+- mirror_items / mirror_index: sync hooks used by scripts.store
+- rebuild: ingest the existing JSONL files and index
+- search: full-text search
+
+Usage:
+    python -m scripts.sqlite_store rebuild
+    python -m scripts.sqlite_store search "育児休業 改正" [--theme laborlaw] [--group high]
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+
+from scripts.month_archive import month_paths
+from scripts.utils import ITEMS_DIR, SQLITE_ENABLED, SQLITE_PATH, setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Trigram tokenizer: terms shorter than this are matched with LIKE
+MIN_TRIGRAM_CHARS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_id TEXT PRIMARY KEY,
+    url TEXT,
+    url_normalized TEXT,
+    source_group TEXT,
+    source_key TEXT,
+    source_name TEXT,
+    source_type TEXT,
+    publisher TEXT,
+    rss_title TEXT,
+    rss_pub_date TEXT,
+    title TEXT,
+    summary TEXT,
+    key_points TEXT,
+    tags TEXT,
+    language TEXT,
+    published_at TEXT,
+    reliability_score INTEGER,
+    reliability_base INTEGER,
+    reliability_delta INTEGER,
+    reliability_reason TEXT,
+    content_length INTEGER,
+    observed_at TEXT,
+    retrieved_at TEXT,
+    ingest_version TEXT,
+    enrichment_source TEXT,
+    theme_confidence TEXT
+);
+CREATE INDEX IF NOT EXISTS items_observed_at ON items (observed_at);
+CREATE INDEX IF NOT EXISTS items_source_group ON items (source_group, observed_at);
+
+CREATE TABLE IF NOT EXISTS item_themes (
+    item_id TEXT NOT NULL REFERENCES items (item_id) ON DELETE CASCADE,
+    theme TEXT NOT NULL,
+    PRIMARY KEY (item_id, theme)
+);
+CREATE INDEX IF NOT EXISTS item_themes_theme ON item_themes (theme);
+
+CREATE TABLE IF NOT EXISTS seen (
+    item_id TEXT PRIMARY KEY,
+    first_seen TEXT,
+    source TEXT,
+    title TEXT
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5 (
+    item_id UNINDEXED,
+    title,
+    summary,
+    key_points,
+    tags,
+    tokenize = 'trigram'
+);
+"""
+
+_ITEM_COLUMNS = [
+    "item_id",
+    "url",
+    "url_normalized",
+    "source_group",
+    "source_key",
+    "source_name",
+    "source_type",
+    "publisher",
+    "rss_title",
+    "rss_pub_date",
+    "title",
+    "summary",
+    "key_points",
+    "tags",
+    "language",
+    "published_at",
+    "reliability_score",
+    "reliability_base",
+    "reliability_delta",
+    "reliability_reason",
+    "content_length",
+    "observed_at",
+    "retrieved_at",
+    "ingest_version",
+    "enrichment_source",
+    "theme_confidence",
+]
+_JSON_COLUMNS = {"key_points", "tags", "theme_confidence"}
+_FTS_COLUMNS = ["title", "summary", "key_points", "tags"]
+
+# Process-wide connection for the sync hooks
+_connection: sqlite3.Connection | None = None
+_connection_lock = threading.Lock()
+_mirror_failed = False
+
+
+def connect(path: Path = SQLITE_PATH) -> sqlite3.Connection:
+    """
+    Open a database, creating the schema if needed.
+
+    Args:
+        path: Database file
+
+    Returns:
+        Connection (usable from any thread; callers serialize access)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _column_value(item: dict, column: str) -> object:
+    value = item.get(column)
+    if column in _JSON_COLUMNS and value is not None:
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def upsert_items(conn: sqlite3.Connection, items: Iterable[dict]) -> int:
+    """
+    Insert or replace items with their themes and full-text rows.
+
+    Args:
+        conn: Database connection
+        items: Item records as stored in JSONL
+
+    Returns:
+        Number of items written
+    """
+    count = 0
+    placeholders = ", ".join("?" for _ in _ITEM_COLUMNS)
+    with conn:
+        for item in items:
+            item_id = item.get("item_id")
+            if not item_id:
+                continue
+            conn.execute("DELETE FROM items_fts WHERE item_id = ?", (item_id,))
+            conn.execute("DELETE FROM item_themes WHERE item_id = ?", (item_id,))
+            conn.execute(
+                f"INSERT OR REPLACE INTO items ({', '.join(_ITEM_COLUMNS)}) VALUES ({placeholders})",
+                [_column_value(item, column) for column in _ITEM_COLUMNS],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO item_themes (item_id, theme) VALUES (?, ?)",
+                [(item_id, theme) for theme in item.get("themes", [])],
+            )
+            conn.execute(
+                "INSERT INTO items_fts (item_id, title, summary, key_points, tags) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    item_id,
+                    item.get("title", ""),
+                    item.get("summary", ""),
+                    "\n".join(item.get("key_points", [])),
+                    "\n".join(item.get("tags", [])),
+                ),
+            )
+            count += 1
+    return count
+
+
+def upsert_index_entries(conn: sqlite3.Connection, entries: Iterable[dict]) -> int:
+    """
+    Insert or replace deduplication index entries.
+
+    Args:
+        conn: Database connection
+        entries: Dicts with item_id, first_seen, source and title
+
+    Returns:
+        Number of entries written
+    """
+    rows = [
+        (entry["item_id"], entry.get("first_seen"), entry.get("source"), entry.get("title"))
+        for entry in entries
+    ]
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO seen (item_id, first_seen, source, title) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+    return len(rows)
+
+
+def _mirror(write: Callable[[sqlite3.Connection, list[dict]], int], rows: list[dict]) -> None:
+    """Run a sync hook; failures are logged once and never stop storage."""
+    global _connection, _mirror_failed
+    if not SQLITE_ENABLED or not rows or _mirror_failed:
+        return
+    with _connection_lock:
+        try:
+            if _connection is None:
+                _connection = connect()
+            write(_connection, rows)
+        except Exception as e:  # Best effort: the JSONL files are the source of truth
+            _mirror_failed = True
+            logger.warning(
+                f"SQLite mirror disabled for this run ({e}); "
+                f"run `python -m scripts.sqlite_store rebuild` to resync"
+            )
+
+
+def mirror_items(items: list[dict]) -> None:
+    """Upsert stored items into the SQLite mirror (no-op unless EIC_SQLITE=1)."""
+    _mirror(upsert_items, items)
+
+
+def mirror_index(entries: list[dict]) -> None:
+    """Upsert index entries into the SQLite mirror (no-op unless EIC_SQLITE=1)."""
+    _mirror(upsert_index_entries, entries)
+
+
+def rebuild(path: Path = SQLITE_PATH) -> tuple[int, int]:
+    """
+    Rebuild the database from the JSONL files and the index.
+
+    The new database is built next to the old one and renamed over it.
+
+    Args:
+        path: Database file
+
+    Returns:
+        Tuple of (item count, index entry count)
+    """
+    from scripts.store import load_index, load_items_for_month
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    for stale in (tmp_path, tmp_path.with_name(tmp_path.name + "-wal"), tmp_path.with_name(tmp_path.name + "-shm")):
+        stale.unlink(missing_ok=True)
+
+    conn = connect(tmp_path)
+    try:
+        item_count = 0
+        for jsonl_path in month_paths(ITEMS_DIR):
+            item_count += upsert_items(conn, load_items_for_month(jsonl_path.stem))
+
+        index = load_index()
+        index_count = upsert_index_entries(
+            conn, ({"item_id": item_id, **entry} for item_id, entry in index.items())
+        )
+        conn.execute("INSERT INTO items_fts (items_fts) VALUES ('optimize')")
+        conn.commit()
+        conn.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        conn.close()
+
+    for suffix in ("-wal", "-shm"):
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+    tmp_path.replace(path)
+    return item_count, index_count
+
+
+def _quote_fts(term: str) -> str:
+    """Quote a term as an FTS5 string (no operator syntax)."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search(
+    conn: sqlite3.Connection,
+    query: str,
+    theme: str | None = None,
+    source_group: str | None = None,
+    limit: int = 20,
+) -> list[dict]:
+    """
+    Search items by all whitespace-separated terms.
+
+    Args:
+        conn: Database connection
+        query: Search terms (all must match)
+        theme: Only items with this theme key
+        source_group: Only "high" or "trend" items
+        limit: Maximum results
+
+    Returns:
+        Result dicts (item_id, title, url, source_name, observed_at, themes,
+        snippet), best matches first
+    """
+    terms = [term for term in query.split() if term]
+    long_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_CHARS]
+    short_terms = [term for term in terms if len(term) < MIN_TRIGRAM_CHARS]
+
+    conditions = []
+    params: list[object] = []
+    if long_terms:
+        conditions.append("items_fts MATCH ?")
+        params.append(" AND ".join(_quote_fts(term) for term in long_terms))
+    for term in short_terms:
+        pattern = f"%{_escape_like(term)}%"
+        conditions.append(
+            "(" + " OR ".join(f"f.{column} LIKE ? ESCAPE '\\'" for column in _FTS_COLUMNS) + ")"
+        )
+        params.extend([pattern] * len(_FTS_COLUMNS))
+    if theme:
+        conditions.append("i.item_id IN (SELECT item_id FROM item_themes WHERE theme = ?)")
+        params.append(theme)
+    if source_group:
+        conditions.append("i.source_group = ?")
+        params.append(source_group)
+
+    snippet = (
+        "snippet(items_fts, 2, '[', ']', '…', 16)" if long_terms else "substr(i.summary, 1, 60)"
+    )
+    order = "bm25(items_fts), i.observed_at DESC" if long_terms else "i.observed_at DESC"
+    sql = (
+        f"SELECT i.item_id, i.title, i.url, i.source_name, i.observed_at, {snippet} AS snippet, "
+        "(SELECT group_concat(theme, ',') FROM item_themes t WHERE t.item_id = i.item_id) AS themes "
+        "FROM items_fts f JOIN items i ON i.item_id = f.item_id"
+        + (" WHERE " + " AND ".join(conditions) if conditions else "")
+        + f" ORDER BY {order} LIMIT ?"
+    )
+    params.append(limit)
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def main() -> int:
+    """CLI entry point."""
+    setup_logging()
+
+    parser = argparse.ArgumentParser(
+        description="EIC SQLite store",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m scripts.sqlite_store rebuild
+  python -m scripts.sqlite_store search "育児休業 改正"
+  python -m scripts.sqlite_store search テレワーク --theme workstyle --group high
+        """,
+    )
+    parser.add_argument("--db", type=Path, default=SQLITE_PATH, help="Database file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("rebuild", help="Rebuild the database from JSONL and the index")
+
+    search_parser = subparsers.add_parser("search", help="Full-text search")
+    search_parser.add_argument("query", help="Search terms (all must match)")
+    search_parser.add_argument("--theme", help="Theme key filter")
+    search_parser.add_argument("--group", choices=["high", "trend"], help="Source group filter")
+    search_parser.add_argument("--limit", type=int, default=20, help="Maximum results")
+
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        start = time.monotonic()
+        items, entries = rebuild(args.db)
+        logger.info(
+            f"Rebuilt {args.db.name}: {items} items, {entries} index entries "
+            f"in {time.monotonic() - start:.1f}s"
+        )
+        return 0
+
+    if not args.db.exists():
+        logger.error(f"{args.db} not found; run `python -m scripts.sqlite_store rebuild` first")
+        return 1
+
+    conn = connect(args.db)
+    start = time.monotonic()
+    results = search(conn, args.query, args.theme, args.group, args.limit)
+    elapsed_ms = (time.monotonic() - start) * 1000
+    for result in results:
+        print(f"{result['observed_at'][:10]}  {result['title']}")
+        print(f"    {result['snippet']}")
+        print(f"    {result['source_name']} | {result['themes'] or '-'} | {result['url']}")
+    logger.info(f"{len(results)} results in {elapsed_ms:.1f}ms")
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
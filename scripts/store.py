@@ -3,63 +3,261 @@ Storage management for items and deduplication index.
 
 Data format:
 - data/items/YYYY-MM.jsonl: Monthly JSONL files (append-only)
-- data/index.json: item_id -> {first_seen, source, title}
+- data/items/YYYY-MM.jsonl.zst + .frames: closed months sealed into zstd
+  frames (scripts.month_archive), read transparently by logical offset
+- data/index.json: item_id -> {first_seen, source, title} (snapshot)
+- data/index.journal: JSON lines {item_id, first_seen, source, title}
+  appended and fsynced per add_to_index since the last snapshot
+- data/index.ids: sorted binary item_ids of the snapshot (scripts.item_index),
+  so dedup checks need no JSON parse
+- data/items/YYYY-MM.jsonl.idx: per-line date, source_group, item_id and byte
+  range (scripts.offset_index), so date lookups read only matching lines
+- data/eic.sqlite3: optional searchable mirror (scripts.sqlite_store,
+  EIC_SQLITE=1), updated after items and journal entries are durable
+
+Items are written by ItemWriter, which buffers records and fsyncs them
+before their index journal entries, so the journal never names an item
+that is not on disk. save_index compacts the journal into the snapshot
+(temp file + rename); load_index replays the journal and reconciles
+against the monthly JSONL files, so items stored by a crashed run are
+never fetched again.
 """
 
+import hashlib
 import json
 import logging
+import os
+import threading
+import time
+import weakref
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from scripts.utils import (
     ITEMS_DIR,
     INDEX_FILE,
+    INDEX_IDS_FILE,
+    INDEX_JOURNAL_FILE,
     BASE_RELIABILITY_SCORES,
     INGEST_VERSION,
+    ITEM_FLUSH_EVERY,
+    ITEM_FLUSH_SECONDS,
     get_jst_now,
     get_jst_month,
     clamp,
+    fsync_directory,
 )
+from scripts.item_index import ItemIndex, write_id_file
 from scripts.llm_client import EnrichedItem
+from scripts.month_archive import is_sealed, iter_lines, month_exists, month_paths, unseal_month
+from scripts.offset_index import (
+    StaleOffsetIndex,
+    append_offsets,
+    entry_for_item,
+    load_offset_index,
+    read_items,
+    rebuild_offset_index,
+)
+from scripts.sqlite_store import mirror_index, mirror_items
 
 logger = logging.getLogger(__name__)
 
+# Monthly files reconciled against the index at load (a crashed run can only
+# have written to the current month, or the previous one around month end)
+RECONCILE_RECENT_MONTHS = 2
+
 
 def ensure_directories() -> None:
     """Ensure data directories exist."""
     ITEMS_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def load_index() -> dict[str, dict]:
+# Open append handle on the index journal (guarded by _journal_lock)
+_journal_lock = threading.Lock()
+_journal_file = None
+
+
+def _ends_with_newline(path: Path) -> bool:
+    """Check whether a non-empty file ends with a newline."""
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _append_journal(entries: list[dict]) -> None:
+    """Append entries to the index journal and fsync once (caller holds _journal_lock)."""
+    global _journal_file
+    if not entries:
+        return
+    if _journal_file is None:
+        ensure_directories()
+        _journal_file = open(INDEX_JOURNAL_FILE, "a", encoding="utf-8")
+        if _journal_file.tell() and not _ends_with_newline(INDEX_JOURNAL_FILE):
+            _journal_file.write("\n")  # Keep new entries off a torn last line
+    _journal_file.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+    _journal_file.flush()
+    os.fsync(_journal_file.fileno())
+
+
+def replay_journal(index: dict[str, dict]) -> int:
+    """
+    Apply index journal entries on top of a loaded snapshot.
+
+    A malformed last line is a write torn by a crash and is ignored.
+
+    Args:
+        index: Snapshot index (modified in place)
+
+    Returns:
+        Number of entries added to the index
+    """
+    if not INDEX_JOURNAL_FILE.exists():
+        return 0
+
+    with open(INDEX_JOURNAL_FILE, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    added = 0
+    for line_num, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+            item_id = entry.pop("item_id")
+        except (json.JSONDecodeError, KeyError, AttributeError):
+            if line_num == len(lines):
+                logger.warning("Ignoring torn last line of the index journal")
+            else:
+                logger.warning(f"Skipping malformed line {line_num} in {INDEX_JOURNAL_FILE}")
+            continue
+        if item_id not in index:
+            added += 1
+        index[item_id] = entry
+
+    return added
+
+
+def reconcile_index(index: dict[str, dict], recent_months: int | None = None) -> int:
+    """
+    Add items present in the monthly JSONL files but missing from the index.
+
+    Item_ids come from the offset sidecars, so only lines the sidecars do
+    not cover yet (and the lines of missing items) are read.
+
+    Args:
+        index: The index dict (modified in place)
+        recent_months: Only check the newest N months (None = all)
+
+    Returns:
+        Number of entries added
+    """
+    added = 0
+    paths = month_paths(ITEMS_DIR)
+    if recent_months is not None:
+        paths = paths[-recent_months:]
+    for jsonl_path in paths:
+        missing = [
+            entry
+            for entry in load_offset_index(jsonl_path)
+            if entry.item_id and entry.item_id not in index
+        ]
+        if not missing:
+            continue
+        try:
+            items = read_items(jsonl_path, missing)
+        except StaleOffsetIndex as e:
+            logger.warning(f"Offset index of {jsonl_path.name} is stale ({e}), rebuilding")
+            items = read_items(
+                jsonl_path,
+                [
+                    entry
+                    for entry in rebuild_offset_index(jsonl_path)
+                    if entry.item_id and entry.item_id not in index
+                ],
+            )
+        for item in items:
+            item_id = item["item_id"]
+            if item_id in index:
+                continue  # Stored twice
+            index[item_id] = {
+                "first_seen": item.get("observed_at") or get_jst_now().isoformat(),
+                "source": item.get("source_name", ""),
+                "title": item.get("title", "")[:100],
+            }
+            added += 1
+    return added
+
+
+def load_index() -> ItemIndex:
     """
     Load deduplication index.
 
+    Opens the snapshot through its binary id file, replays the journal
+    written since it, and recovers stored items that never reached either.
+
     Returns:
-        Dict mapping item_id (URL hash) to metadata
+        ItemIndex mapping item_id (URL hash) to metadata
     """
-    if not INDEX_FILE.exists():
-        return {}
+    index = ItemIndex(INDEX_FILE, INDEX_IDS_FILE)
+    snapshot_empty = not len(index)
 
-    try:
-        with open(INDEX_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        logger.warning(f"Failed to load index, starting fresh: {e}")
-        return {}
+    replayed = replay_journal(index)
+    if replayed:
+        logger.info(f"Replayed {replayed} index entries from the journal")
+
+    # Without a usable snapshot every monthly file has to be checked
+    recovered = reconcile_index(index, None if snapshot_empty else RECONCILE_RECENT_MONTHS)
+    if recovered:
+        logger.warning(f"Recovered {recovered} stored items missing from the index")
+
+    return index
 
 
 def save_index(index: dict[str, dict]) -> None:
     """
-    Save deduplication index.
+    Compact the journal into the index snapshot.
+
+    The snapshot is written to a temp file, fsynced and renamed over
+    index.json, followed by its binary id file; only then is the journal
+    truncated. An ItemIndex without new entries is left as is.
 
     Args:
-        index: The index dict to save
+        index: The index (ItemIndex or plain dict) to save
     """
+    global _journal_file
+    # Buffered items must reach disk before the snapshot names them
+    for writer in list(_open_writers):
+        writer.flush()
+
+    if isinstance(index, ItemIndex) and not index.dirty:
+        logger.info(f"Index unchanged: {len(index)} entries")
+        return
+
     ensure_directories()
-    with open(INDEX_FILE, "w", encoding="utf-8") as f:
-        json.dump(index, f, ensure_ascii=False, indent=2, sort_keys=True)
-    logger.info(f"Index saved: {len(index)} entries")
+    snapshot = index.to_dict() if isinstance(index, ItemIndex) else index
+    data = json.dumps(snapshot, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+    tmp_path = INDEX_FILE.with_suffix(".json.tmp")
+
+    with _journal_lock:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, INDEX_FILE)
+        write_id_file(INDEX_IDS_FILE, snapshot, INDEX_FILE, hashlib.sha256(data).hexdigest())
+        fsync_directory(INDEX_FILE.parent)
+        if isinstance(index, ItemIndex):
+            index.mark_saved(snapshot)
+
+        if _journal_file is not None:
+            _journal_file.close()
+            _journal_file = None
+        if INDEX_JOURNAL_FILE.exists():
+            with open(INDEX_JOURNAL_FILE, "w", encoding="utf-8") as f:
+                os.fsync(f.fileno())
+
+    logger.info(f"Index saved: {len(snapshot)} entries")
 
 
 def add_to_index(
@@ -69,7 +267,7 @@ def add_to_index(
     title: str,
 ) -> None:
     """
-    Add entry to index.
+    Add entry to index and record it in the journal.
 
     Args:
         index: The index dict (modified in place)
@@ -77,7 +275,16 @@ def add_to_index(
         source_name: Name of the source
         title: Article title
     """
-    index[item_id] = {
+    entry = _index_entry(source_name, title)
+    with _journal_lock:
+        index[item_id] = entry
+        _append_journal([{"item_id": item_id, **entry}])
+    mirror_index([{"item_id": item_id, **entry}])
+
+
+def _index_entry(source_name: str, title: str) -> dict:
+    """Build an index entry."""
+    return {
         "first_seen": get_jst_now().isoformat(),
         "source": source_name,
         "title": title[:100],  # Truncate for index storage
@@ -99,19 +306,231 @@ def get_jsonl_path(month: str | None = None) -> Path:
     return ITEMS_DIR / f"{month}.jsonl"
 
 
+def repair_torn_tail(jsonl_path: Path) -> int:
+    """
+    Cut a partial trailing record left by a crash mid-write.
+
+    Args:
+        jsonl_path: Path to a JSONL file
+
+    Returns:
+        Number of bytes removed
+    """
+    if not jsonl_path.exists():
+        return 0
+
+    with open(jsonl_path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if not size:
+            return 0
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return 0
+
+        # Find the end of the last complete line
+        end = size
+        keep = 0
+        while end > 0:
+            start = max(0, end - 4096)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                keep = start + newline + 1
+                break
+            end = start
+
+        f.truncate(keep)
+        f.flush()
+        os.fsync(f.fileno())
+
+    logger.warning(f"Removed a torn {size - keep}-byte record from the end of {jsonl_path.name}")
+    return size - keep
+
+
+# Writers with buffered records, flushed by save_index
+_open_writers: "weakref.WeakSet[ItemWriter]" = weakref.WeakSet()
+
+
+class ItemWriter:
+    """
+    Buffered, crash-safe writer for the monthly JSONL files.
+
+    Files stay open for the writer's lifetime. Records are buffered and
+    written at checkpoints (every flush_every items, after flush_seconds,
+    or on flush/close) as one write of complete lines followed by fsync.
+    Only then are their offset-index and index-journal entries written, so
+    a crash can lose buffered items but never leaves the journal naming an
+    item that is not stored. A partial last line from an earlier crash is
+    cut when a file is first opened.
+    """
+
+    def __init__(
+        self,
+        flush_every: int = ITEM_FLUSH_EVERY,
+        flush_seconds: float = ITEM_FLUSH_SECONDS,
+    ):
+        """
+        Initialize writer.
+
+        Args:
+            flush_every: Buffered items that trigger a checkpoint
+            flush_seconds: Seconds since the last checkpoint that trigger one
+        """
+        self.flush_every = max(1, flush_every)
+        self.flush_seconds = flush_seconds
+        self.written = 0
+        self.checkpoints = 0
+        self._files: dict[Path, BinaryIO] = {}
+        # (file, item, serialized line, index journal entry or None)
+        self._buffer: list[tuple[Path, dict, bytes, dict | None]] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+        _open_writers.add(self)
+
+    def __enter__(self) -> "ItemWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered items not yet on disk."""
+        return len(self._buffer)
+
+    def append(self, item: dict, month: str | None = None) -> None:
+        """
+        Buffer an item for the monthly JSONL file.
+
+        Args:
+            item: The complete item record
+            month: Optional month string (YYYY-MM)
+        """
+        self._buffer_item(item, month, None)
+
+    def _buffer_item(self, item: dict, month: str | None, journal_entry: dict | None) -> None:
+        """Buffer a serialized item and checkpoint when due."""
+        line = (json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._buffer.append((get_jsonl_path(month), item, line, journal_entry))
+            if (
+                len(self._buffer) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            ):
+                self.flush()
+
+    def add(
+        self,
+        index: dict[str, dict],
+        item: dict,
+        source_name: str,
+        month: str | None = None,
+    ) -> None:
+        """
+        Buffer an item and add it to the index.
+
+        The index entry is visible immediately (for deduplication within the
+        run); its journal entry is written after the item is fsynced.
+
+        Args:
+            index: The index dict (modified in place)
+            item: The complete item record
+            source_name: Name of the source
+            month: Optional month string (YYYY-MM)
+        """
+        entry = _index_entry(source_name, item["title"])
+        with _journal_lock:
+            index[item["item_id"]] = entry
+        self._buffer_item(item, month, {"item_id": item["item_id"], **entry})
+
+    def _open(self, jsonl_path: Path) -> BinaryIO:
+        """Get the append handle of a file, unsealing it or repairing a torn tail first."""
+        handle = self._files.get(jsonl_path)
+        if handle is None:
+            ensure_directories()
+            if is_sealed(jsonl_path):
+                unseal_month(jsonl_path)  # Resealed once the month is closed again
+            repair_torn_tail(jsonl_path)
+            handle = self._files[jsonl_path] = open(jsonl_path, "ab")
+        return handle
+
+    def flush(self) -> int:
+        """
+        Write, fsync and index all buffered items.
+
+        Returns:
+            Number of items written
+        """
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._buffer:
+                return 0
+
+            by_path: dict[Path, list[tuple[dict, bytes, dict | None]]] = {}
+            for jsonl_path, item, line, journal_entry in self._buffer:
+                by_path.setdefault(jsonl_path, []).append((item, line, journal_entry))
+
+            count = 0
+            for jsonl_path, records in by_path.items():
+                handle = self._open(jsonl_path)
+                offset = handle.seek(0, os.SEEK_END)
+                try:
+                    handle.write(b"".join(line for _, line, _ in records))
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                except OSError:
+                    handle.truncate(offset)  # Never leave a partial batch behind
+                    raise
+
+                # Durable: drop this file's records before anything else can
+                # fail, so a later flush never writes them twice
+                self._buffer = [record for record in self._buffer if record[0] != jsonl_path]
+                self.written += len(records)
+                count += len(records)
+
+                entries = []
+                for item, line, _ in records:
+                    entries.append(entry_for_item(item, offset, len(line)))
+                    offset += len(line)
+                try:
+                    append_offsets(jsonl_path, entries)
+                except OSError as e:
+                    # The next lookup indexes the lines the sidecar is missing
+                    logger.warning(f"Failed to update the offset index of {jsonl_path.name}: {e}")
+
+                journal_entries = [entry for _, _, entry in records if entry is not None]
+                with _journal_lock:
+                    _append_journal(journal_entries)
+                mirror_items([item for item, _, _ in records])
+                mirror_index(journal_entries)
+
+            self.checkpoints += 1
+            return count
+
+    def close(self) -> None:
+        """Flush buffered items and close the files."""
+        with self._lock:
+            try:
+                self.flush()
+            finally:
+                for handle in self._files.values():
+                    handle.close()
+                self._files = {}
+                _open_writers.discard(self)
+
+
 def append_item(item: dict, month: str | None = None) -> None:
     """
-    Append a processed item to the monthly JSONL file.
+    Append a processed item to the monthly JSONL file and fsync it.
+
+    Use ItemWriter to store many items.
 
     Args:
         item: The complete item record
         month: Optional month string (YYYY-MM)
     """
-    ensure_directories()
-    jsonl_path = get_jsonl_path(month)
-
-    with open(jsonl_path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(item, ensure_ascii=False) + "\n")
+    with ItemWriter(flush_every=1) as writer:
+        writer.append(item, month)
 
 
 def load_items_for_month(month: str) -> list[dict]:
@@ -126,18 +545,17 @@ def load_items_for_month(month: str) -> list[dict]:
     """
     jsonl_path = get_jsonl_path(month)
 
-    if not jsonl_path.exists():
+    if not month_exists(jsonl_path):
         return []
 
     items = []
-    with open(jsonl_path, "r", encoding="utf-8") as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if line:
-                try:
-                    items.append(json.loads(line))
-                except json.JSONDecodeError:
-                    logger.warning(f"Skipping malformed line {line_num} in {jsonl_path}")
+    for line_num, (_, line) in enumerate(iter_lines(jsonl_path), 1):
+        line = line.strip()
+        if line:
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed line {line_num} in {jsonl_path}")
 
     return items
 
@@ -156,6 +574,8 @@ def build_complete_item(
     language: str,
     content_length: int,
     enrichment: EnrichedItem,
+    enrichment_source: str = "llm",
+    theme_confidence: dict[str, float] | None = None,
 ) -> dict[str, Any]:
     """
     Build complete item record for storage.
@@ -174,6 +594,8 @@ def build_complete_item(
         language: Language from source config
         content_length: Length of extracted content
         enrichment: LLM enrichment result
+        enrichment_source: "llm" or "local" (theme tagger fallback)
+        theme_confidence: Theme key -> confidence from the local tagger
 
     Returns:
         Complete item record dict
@@ -184,7 +606,7 @@ def build_complete_item(
 
     now = get_jst_now()
 
-    return {
+    item = {
         # Identification
         "item_id": item_id,
         "url": url,
@@ -216,13 +638,20 @@ def build_complete_item(
         "observed_at": now.isoformat(),
         "retrieved_at": now.isoformat(),
         "ingest_version": INGEST_VERSION,
+        "enrichment_source": enrichment_source,
     }
+    if theme_confidence is not None:
+        item["theme_confidence"] = theme_confidence
+
+    return item
 
 
 def get_items_for_date(date_str: str) -> tuple[list[dict], list[dict]]:
     """
     Get items collected on a specific date.
 
+    Only the lines the month's offset index lists for the date are read.
+
     Args:
         date_str: Date string (YYYY-MM-DD)
 
@@ -230,19 +659,25 @@ def get_items_for_date(date_str: str) -> tuple[list[dict], list[dict]]:
         Tuple of (high_items, trend_items)
     """
     # Determine the month from date
-    month = date_str[:7]  # YYYY-MM
-    items = load_items_for_month(month)
+    jsonl_path = get_jsonl_path(date_str[:7])  # YYYY-MM
+
+    def _entries_for_date() -> list:
+        return [entry for entry in load_offset_index(jsonl_path) if entry.date == date_str]
+
+    try:
+        items = read_items(jsonl_path, _entries_for_date())
+    except StaleOffsetIndex as e:
+        logger.warning(f"Offset index of {jsonl_path.name} is stale ({e}), rebuilding")
+        rebuild_offset_index(jsonl_path)
+        items = read_items(jsonl_path, _entries_for_date())
 
     high_items = []
     trend_items = []
 
     for item in items:
-        # Check if observed on this date
-        observed_at = item.get("observed_at", "")
-        if observed_at.startswith(date_str):
-            if item.get("source_group") == "high":
-                high_items.append(item)
-            else:
-                trend_items.append(item)
+        if item.get("source_group") == "high":
+            high_items.append(item)
+        else:
+            trend_items.append(item)
 
     return high_items, trend_items
@@ -0,0 +1,364 @@
+"""
+Deterministic local theme tagger built from themes.yaml.
+
+Assigns theme keys with confidence scores from the theme keywords, names
+and descriptions, without any API call. Used as the enrichment fallback
+when the LLM fails, and to re-tag historical JSONL when themes.yaml
+changes.
+
+Provides:
+- ThemeTagger: keyword/description scorer with confidence per theme
+- get_tagger: tagger for the current themes.yaml (cached)
+- fallback_enrichment: EnrichedItem built locally from RSS data and text
+- retag_items: re-tag stored items and cross-check against LLM themes
+
+Usage:
+    python -m scripts.theme_tagger retag            # report only
+    python -m scripts.theme_tagger retag --write    # update locally tagged items
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import sys
+from functools import lru_cache
+from typing import NamedTuple
+
+from scripts.llm_client import EnrichedItem
+from scripts.month_archive import is_sealed, iter_lines, month_paths, seal_month
+from scripts.offset_index import rebuild_offset_index
+from scripts.prescreen import KeywordMatcher
+from scripts.sqlite_store import mirror_items
+from scripts.utils import ITEMS_DIR, load_themes_config, setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Term weights by origin
+KEYWORD_WEIGHT = 1.0
+NAME_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.5
+
+# Title hits count this many times
+TITLE_WEIGHT = 2.0
+
+# Minimum confidence for a theme to be assigned
+MIN_CONFIDENCE = 0.35
+
+# Maximum themes per item
+MAX_THEMES = 5
+
+# Fallback enrichment
+FALLBACK_SUMMARY_CHARS = 300
+FALLBACK_REASON = "LLM分析に失敗したため、ローカルのキーワード判定で補完（信頼度補正なし）"
+
+_DESCRIPTION_SUFFIX = re.compile(r"に関(係)?するデータ$")
+_DESCRIPTION_SPLIT = re.compile(r"[、・/（）()]")
+_SENTENCE_SPLIT = re.compile(r"(?<=[。！？!?])")
+
+
+class ThemeScore(NamedTuple):
+    """Theme key with its confidence in [0, 1]."""
+
+    key: str
+    confidence: float
+
+
+def description_terms(description: str) -> list[str]:
+    """
+    Extract matchable terms from a theme description.
+
+    "勤務時間、リモート勤務、休暇情報など働き方に関するデータ" yields
+    ["勤務時間", "リモート勤務", "休暇情報"].
+
+    Args:
+        description: Theme description from themes.yaml
+
+    Returns:
+        Terms of two or more characters
+    """
+    text = _DESCRIPTION_SUFFIX.sub("", description.strip())
+    if "など" in text:
+        text = text.rsplit("など", 1)[0]
+    return [term.strip() for term in _DESCRIPTION_SPLIT.split(text) if len(term.strip()) >= 2]
+
+
+class ThemeTagger:
+    """
+    Score themes by weighted keyword hits.
+
+    Each distinct matched term adds its weight to every theme it belongs to
+    (title hits count TITLE_WEIGHT times). The sum is mapped to a confidence
+    with 1 - exp(-score / 2), so one title keyword gives ~0.63 and a single
+    description term in the body ~0.22.
+    """
+
+    def __init__(self, config: dict | None = None):
+        """
+        Build the tagger.
+
+        Args:
+            config: Parsed themes.yaml (default: load from config/)
+        """
+        config = config or load_themes_config()
+        self.theme_keys: list[str] = []
+        weights: dict[str, dict[str, float]] = {}
+
+        for theme in config.get("themes", []):
+            key = theme["key"]
+            self.theme_keys.append(key)
+            terms = weights.setdefault(key, {})
+            for term in description_terms(theme.get("description", "")):
+                terms[term.lower()] = DESCRIPTION_WEIGHT
+            named = [(theme.get("name", ""), NAME_WEIGHT)]
+            for term, weight in named + [(k, KEYWORD_WEIGHT) for k in theme.get("keywords", [])]:
+                term = str(term).strip().lower()
+                if term:
+                    terms[term] = max(terms.get(term, 0.0), weight)
+
+        self.matcher = KeywordMatcher({key: list(terms) for key, terms in weights.items()})
+        # Per matched term: (theme, weight) pairs
+        self._term_themes = [
+            [(key, weights[key][term]) for key in sorted(self.matcher.themes[i])]
+            for i, term in enumerate(self.matcher.keywords)
+        ]
+
+    def score(self, title: str, text: str = "") -> dict[str, float]:
+        """
+        Compute raw theme scores.
+
+        Args:
+            title: Article title
+            text: Body text (summary, extracted content, ...)
+
+        Returns:
+            Theme key -> raw score (themes without hits omitted)
+        """
+        title_hits = self.matcher.find(title) if title else set()
+        text_hits = self.matcher.find(text) - title_hits if text else set()
+
+        scores: dict[str, float] = {}
+        for hits, factor in ((title_hits, TITLE_WEIGHT), (text_hits, 1.0)):
+            for i in hits:
+                for key, weight in self._term_themes[i]:
+                    scores[key] = scores.get(key, 0.0) + weight * factor
+        return scores
+
+    def tag(
+        self,
+        title: str,
+        text: str = "",
+        min_confidence: float = MIN_CONFIDENCE,
+        max_themes: int = MAX_THEMES,
+    ) -> list[ThemeScore]:
+        """
+        Assign themes with confidence scores.
+
+        Args:
+            title: Article title
+            text: Body text
+            min_confidence: Minimum confidence to assign a theme
+            max_themes: Maximum themes returned
+
+        Returns:
+            ThemeScores sorted by confidence (ties by themes.yaml order)
+        """
+        order = {key: i for i, key in enumerate(self.theme_keys)}
+        tagged = [
+            ThemeScore(key, round(1.0 - math.exp(-score / 2.0), 3))
+            for key, score in self.score(title, text).items()
+        ]
+        tagged = [theme for theme in tagged if theme.confidence >= min_confidence]
+        tagged.sort(key=lambda theme: (-theme.confidence, order.get(theme.key, 0)))
+        return tagged[:max_themes]
+
+    def matched_terms(self, title: str, text: str = "", limit: int = 8) -> list[str]:
+        """Get matched terms (title first) for use as tags."""
+        title_hits = sorted(self.matcher.find(title)) if title else []
+        text_hits = sorted(self.matcher.find(text) - set(title_hits)) if text else []
+        return [self.matcher.keywords[i] for i in title_hits + text_hits][:limit]
+
+
+@lru_cache(maxsize=1)
+def get_tagger() -> ThemeTagger:
+    """Get the tagger for the current themes.yaml."""
+    return ThemeTagger()
+
+
+def fallback_enrichment(
+    title: str,
+    content: str,
+    language: str = "unknown",
+    summary: str = "",
+) -> tuple[EnrichedItem, dict[str, float]]:
+    """
+    Build an enrichment locally when the LLM is unavailable.
+
+    Args:
+        title: RSS title
+        content: Extracted text (may be empty)
+        language: Language from the source config
+        summary: RSS summary (used when content is empty)
+
+    Returns:
+        Tuple of (EnrichedItem, theme key -> confidence)
+    """
+    body = content or summary
+    tagger = get_tagger()
+    themes = tagger.tag(title, body)
+
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(body.replace("\n", "")) if s.strip()]
+    key_points = [s[:120] for s in sentences[:3]]
+    key_points.extend(["(要点なし)"] * (3 - len(key_points)))
+
+    enrichment = EnrichedItem(
+        title=title,
+        summary=body[:FALLBACK_SUMMARY_CHARS] if body else "※本文未取得",
+        key_points=key_points,
+        themes=[theme.key for theme in themes],
+        tags=tagger.matched_terms(title, body),
+        language=language if language in ("ja", "en") else "unknown",
+        published_at=None,
+        reliability_score_delta=0,
+        reliability_reason=FALLBACK_REASON,
+    )
+    return enrichment, {theme.key: theme.confidence for theme in themes}
+
+
+def item_text(item: dict) -> str:
+    """Get the stored text of an item used for re-tagging."""
+    return "\n".join([item.get("summary", "")] + list(item.get("key_points", [])))
+
+
+def retag_items(write: bool = False) -> dict:
+    """
+    Re-tag every stored item and cross-check against LLM themes.
+
+    Locally enriched items get their themes replaced when write is set;
+    LLM-enriched items are only compared.
+
+    Args:
+        write: Rewrite themes of locally enriched items in place
+
+    Returns:
+        Report dict with per-theme agreement counts
+    """
+    tagger = get_tagger()
+    report = {
+        "items": 0,
+        "llm_items": 0,
+        "updated": 0,
+        "jaccard_sum": 0.0,
+        "themes": {key: {"both": 0, "llm_only": 0, "local_only": 0} for key in tagger.theme_keys},
+    }
+
+    for path in month_paths(ITEMS_DIR):
+        sealed = is_sealed(path)
+        lines = [line.decode("utf-8").rstrip("\n") for _, line in iter_lines(path)]
+        updated_items = []
+
+        for line_num, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed line {line_num + 1} in {path}")
+                continue
+
+            report["items"] += 1
+            tagged = tagger.tag(item.get("rss_title") or item.get("title", ""), item_text(item))
+            local = {theme.key for theme in tagged}
+
+            if item.get("enrichment_source", "llm") == "local":
+                if write and local != set(item.get("themes", [])):
+                    item["themes"] = [theme.key for theme in tagged]
+                    item["theme_confidence"] = {theme.key: theme.confidence for theme in tagged}
+                    lines[line_num] = json.dumps(item, ensure_ascii=False)
+                    report["updated"] += 1
+                    updated_items.append(item)
+                continue
+
+            llm = set(item.get("themes", []))
+            report["llm_items"] += 1
+            union = llm | local
+            report["jaccard_sum"] += len(llm & local) / len(union) if union else 1.0
+            for key in union:
+                counts = report["themes"].setdefault(
+                    key, {"both": 0, "llm_only": 0, "local_only": 0}
+                )
+                if key in llm and key in local:
+                    counts["both"] += 1
+                elif key in llm:
+                    counts["llm_only"] += 1
+                else:
+                    counts["local_only"] += 1
+
+        if updated_items:
+            tmp_path = path.with_suffix(".jsonl.tmp")
+            tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            os.replace(tmp_path, path)
+            rebuild_offset_index(path)  # Line offsets moved
+            if sealed:
+                seal_month(path)
+            mirror_items(updated_items)
+            logger.info(f"Rewrote {path.name}")
+
+    return report
+
+
+def log_report(report: dict) -> None:
+    """Log a retag cross-check report."""
+    logger.info(
+        f"Retag: {report['items']} items, {report['llm_items']} LLM-tagged, "
+        f"{report['updated']} local items updated"
+    )
+    if report["llm_items"]:
+        logger.info(f"Mean Jaccard (LLM vs local): {report['jaccard_sum'] / report['llm_items']:.2f}")
+
+    for key, counts in report["themes"].items():
+        llm_total = counts["both"] + counts["llm_only"]
+        local_total = counts["both"] + counts["local_only"]
+        if not llm_total and not local_total:
+            continue
+        precision = counts["both"] / local_total if local_total else 0.0
+        recall = counts["both"] / llm_total if llm_total else 0.0
+        logger.info(
+            f"  {key:<14} llm={llm_total:<4} local={local_total:<4} "
+            f"both={counts['both']:<4} precision={precision:.2f} recall={recall:.2f}"
+        )
+
+
+def main() -> int:
+    """CLI entry point."""
+    setup_logging()
+
+    parser = argparse.ArgumentParser(
+        description="EIC local theme tagger",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m scripts.theme_tagger retag
+  python -m scripts.theme_tagger retag --write
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    retag_parser = subparsers.add_parser(
+        "retag", help="Re-tag stored items and cross-check against LLM themes"
+    )
+    retag_parser.add_argument(
+        "--write",
+        action="store_true",
+        help="Rewrite themes of locally enriched items",
+    )
+
+    args = parser.parse_args()
+    log_report(retag_items(write=args.write))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
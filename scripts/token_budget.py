@@ -0,0 +1,186 @@
+"""
+Tokenizer-aware content budgeting for LLM input.
+
+Counts tokens locally with the model's tokenizer (tiktoken) and trims
+article text to a per-model token budget. When trimming is needed, the most
+informative segments are kept: the lead, headings and paragraphs that
+mention HR keywords from themes.yaml. Kept segments stay in their original
+order.
+
+Without tiktoken (or its encoding files) counts fall back to the
+character-based estimate used by the rate limiter.
+"""
+
+import logging
+import re
+import threading
+from functools import lru_cache
+
+from scripts.rate_limit import estimate_tokens
+from scripts.utils import (
+    CONTENT_TOKEN_BUDGET,
+    MODEL_INPUT_TOKEN_BUDGETS,
+    load_themes_config,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # Optional dependency
+    tiktoken = None
+
+# Segments at the start of the article that are always kept first
+LEAD_SEGMENTS = 2
+
+# A short line without sentence-ending punctuation is treated as a heading
+HEADING_MAX_CHARS = 40
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[。！？!?])|(?<=\.)\s+")
+_SENTENCE_END = ("。", "．", ".", "！", "!", "？", "?", "」", "）", ")")
+
+_fallback_warned = threading.Event()
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """Get the tiktoken encoding for a model, or None if unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except Exception:
+            return None
+    except Exception:
+        # Encoding files are downloaded on first use; offline runs end up here
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count tokens for a model.
+
+    Args:
+        text: Input text
+        model: Model name
+
+    Returns:
+        Token count (estimated when no tokenizer is available)
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        if not _fallback_warned.is_set():
+            _fallback_warned.set()
+            logger.warning(f"No tokenizer for {model}, using estimated token counts")
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def get_token_budget(model: str) -> int:
+    """
+    Get the content token budget for a model.
+
+    Args:
+        model: Model name (dated snapshots match their base name)
+
+    Returns:
+        Maximum content tokens per request
+    """
+    if model in MODEL_INPUT_TOKEN_BUDGETS:
+        return MODEL_INPUT_TOKEN_BUDGETS[model]
+    base = max((name for name in MODEL_INPUT_TOKEN_BUDGETS if model.startswith(name)), key=len, default=None)
+    return MODEL_INPUT_TOKEN_BUDGETS.get(base, CONTENT_TOKEN_BUDGET)
+
+
+@lru_cache(maxsize=1)
+def get_hr_keywords() -> tuple[str, ...]:
+    """Get lowercased theme keywords from themes.yaml."""
+    keywords = set()
+    for theme in load_themes_config().get("themes", []):
+        for keyword in theme.get("keywords", []):
+            if keyword:
+                keywords.add(str(keyword).lower())
+    return tuple(sorted(keywords))
+
+
+def split_segments(text: str) -> list[str]:
+    """
+    Split text into paragraphs, or sentences when it has no line breaks.
+
+    Args:
+        text: Article text
+
+    Returns:
+        Non-empty segments in order
+    """
+    segments = [line.strip() for line in text.split("\n") if line.strip()]
+    if len(segments) > 1:
+        return segments
+    return [part.strip() for part in _SENTENCE_SPLIT.split(text) if part and part.strip()]
+
+
+def score_segment(segment: str, keywords: tuple[str, ...]) -> int:
+    """
+    Score a segment by HR keyword mentions (headings get a bonus).
+
+    Args:
+        segment: Paragraph or sentence
+        keywords: Lowercased keywords
+
+    Returns:
+        Score (higher is kept first)
+    """
+    lowered = segment.lower()
+    score = sum(1 for keyword in keywords if keyword in lowered)
+    if len(segment) <= HEADING_MAX_CHARS and not segment.endswith(_SENTENCE_END):
+        score += 2
+    return score
+
+
+def budget_content(text: str, model: str, max_tokens: int | None = None) -> str:
+    """
+    Trim text to the model's token budget, keeping informative segments.
+
+    Args:
+        text: Article text
+        model: Model name
+        max_tokens: Override the per-model budget
+
+    Returns:
+        Text within the budget (unchanged when it already fits)
+    """
+    budget = max_tokens or get_token_budget(model)
+    total = count_tokens(text, model)
+    if total <= budget:
+        return text
+
+    segments = split_segments(text)
+    costs = [count_tokens(segment, model) + 1 for segment in segments]  # +1 for the joiner
+    keywords = get_hr_keywords()
+
+    # Lead first, then the highest scoring segments
+    order = list(range(min(LEAD_SEGMENTS, len(segments))))
+    rest = range(len(order), len(segments))
+    order += sorted(rest, key=lambda i: (-score_segment(segments[i], keywords), i))
+
+    kept = set()
+    used = 0
+    for i in order:
+        if used + costs[i] <= budget:
+            kept.add(i)
+            used += costs[i]
+
+    if not kept:
+        # A single oversized lead segment: keep its beginning
+        ratio = budget / max(costs[0], 1)
+        return segments[0][: max(1, int(len(segments[0]) * ratio))]
+
+    result = "\n".join(segments[i] for i in sorted(kept))
+    logger.info(
+        f"Content budget ({model}): {total} -> {count_tokens(result, model)} tokens, "
+        f"kept {len(kept)}/{len(segments)} segments"
+    )
+    return result
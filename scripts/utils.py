@@ -5,21 +5,28 @@ Provides:
 - Configuration loading
 - Date/time utilities
 - Logging setup
-- Retry decorator
+- Shared pooled HTTP session
 """
 
 import json
 import logging
 import os
+import socket
+import threading
 import time
 from datetime import datetime, timedelta
-from functools import wraps
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any
 from zoneinfo import ZoneInfo
 
+import requests
 import yaml
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
 
 # Load environment variables
 load_dotenv()
@@ -30,10 +37,18 @@ CONFIG_DIR = PROJECT_ROOT / "config"
 DATA_DIR = PROJECT_ROOT / "data"
 ITEMS_DIR = DATA_DIR / "items"
 INDEX_FILE = DATA_DIR / "index.json"
+INDEX_JOURNAL_FILE = DATA_DIR / "index.journal"
+INDEX_IDS_FILE = DATA_DIR / "index.ids"
+FEED_STATE_FILE = DATA_DIR / "feed_state.json"
+BATCH_DIR = DATA_DIR / "batches"
+CACHE_DIR = Path(os.getenv("EIC_CACHE_DIR", str(PROJECT_ROOT / ".cache")))
+SQLITE_PATH = Path(os.getenv("EIC_SQLITE_PATH", str(DATA_DIR / "eic.sqlite3")))
+PARQUET_DIR = Path(os.getenv("EIC_PARQUET_DIR", str(DATA_DIR / "parquet")))
 
 # Environment variables with defaults
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+OPENAI_CHEAP_MODEL = os.getenv("OPENAI_CHEAP_MODEL", "gpt-4.1-nano")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 GITHUB_REPO_OWNER = os.getenv("GITHUB_REPO_OWNER", "")
 GITHUB_REPO_NAME = os.getenv("GITHUB_REPO_NAME", "")
@@ -44,9 +59,117 @@ EIC_TIMEZONE = os.getenv("EIC_TIMEZONE", "Asia/Tokyo")
 MAX_HIGH_TRUST_ITEMS = 20
 MAX_TREND_ITEMS = 20
 CONTENT_FETCH_TIMEOUT = 20
-CONTENT_MAX_CHARS = 12000
+FEED_FETCH_TIMEOUT = 20
+CONTENT_MAX_CHARS = 60000  # Hard pre-cap before token budgeting
 CONTENT_MIN_CHARS = 100
 
+# Article content token budget per model (EIC_CONTENT_TOKENS overrides the default)
+CONTENT_TOKEN_BUDGET = int(os.getenv("EIC_CONTENT_TOKENS", "4000"))
+MODEL_INPUT_TOKEN_BUDGETS = {
+    "gpt-4.1": 6000,
+    "gpt-4.1-mini": CONTENT_TOKEN_BUDGET,
+    "gpt-4.1-nano": 3000,
+    "gpt-4o": 6000,
+    "gpt-4o-mini": CONTENT_TOKEN_BUDGET,
+}
+
+# Keyword pre-screen: off | cheap (low scores use OPENAI_CHEAP_MODEL) | skip
+# Opt-in: "cheap" and "skip" move or drop items away from OPENAI_MODEL
+PRESCREEN_MODE = os.getenv("EIC_PRESCREEN", "off")
+PRESCREEN_THRESHOLD = int(os.getenv("EIC_PRESCREEN_THRESHOLD", "2"))
+
+# Local theme tagger fallback when the LLM call fails (0 = drop the item)
+LOCAL_FALLBACK_ENABLED = os.getenv("EIC_LOCAL_FALLBACK", "1") != "0"
+
+# Collection concurrency (set EIC_COLLECT_WORKERS=1 for serial collection)
+COLLECT_MAX_WORKERS = int(os.getenv("EIC_COLLECT_WORKERS", "8"))
+COLLECT_PER_HOST_LIMIT = int(os.getenv("EIC_COLLECT_PER_HOST", "2"))
+
+# Item pipeline concurrency (fetch -> extract -> enrich)
+PIPELINE_FETCH_WORKERS = int(os.getenv("EIC_FETCH_WORKERS", "8"))
+PIPELINE_EXTRACT_WORKERS = int(os.getenv("EIC_EXTRACT_WORKERS", str(os.cpu_count() or 2)))
+PIPELINE_LLM_WORKERS = int(os.getenv("EIC_LLM_WORKERS", "4"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("EIC_PIPELINE_QUEUE", "8"))
+
+# Extraction process pool (0 processes = extract in the calling thread)
+EXTRACT_PROCESSES = int(os.getenv("EIC_EXTRACT_PROCESSES", str(os.cpu_count() or 2)))
+EXTRACT_TIMEOUT = float(os.getenv("EIC_EXTRACT_TIMEOUT", "20"))
+
+# Page cache (raw HTML + extracted text keyed by item_id)
+PAGE_CACHE_TTL = float(os.getenv("EIC_PAGE_CACHE_TTL", str(7 * 24 * 3600)))
+PAGE_CACHE_MAX_BYTES = int(os.getenv("EIC_PAGE_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+# LLM response cache (keyed by model, prompts and schema)
+LLM_CACHE_ENABLED = os.getenv("EIC_LLM_CACHE", "1") != "0"
+LLM_CACHE_TTL = float(os.getenv("EIC_LLM_CACHE_TTL", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(os.getenv("EIC_LLM_CACHE_MAX_MB", "50")) * 1024 * 1024
+
+# OpenAI pricing in USD per 1M tokens: (input, cached input, output)
+MODEL_PRICING = {
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+}
+
+# Model cascade: OPENAI_CHEAP_MODEL first, escalate low-confidence results (1 enables)
+LLM_CASCADE_ENABLED = os.getenv("EIC_LLM_CASCADE", "0") == "1"
+CASCADE_MIN_CONTENT_CHARS = int(os.getenv("EIC_CASCADE_MIN_CHARS", "300"))
+
+# Packed LLM requests: short articles share one request (EIC_LLM_PACK=0 disables)
+LLM_PACK_ENABLED = os.getenv("EIC_LLM_PACK", "1") != "0"
+LLM_PACK_SIZE = int(os.getenv("EIC_LLM_PACK_SIZE", "5"))
+LLM_PACK_MAX_TOKENS = int(os.getenv("EIC_LLM_PACK_MAX_TOKENS", "800"))
+LLM_PACK_LINGER = float(os.getenv("EIC_LLM_PACK_LINGER", "2.0"))
+
+# OpenAI rate limits and async client concurrency
+OPENAI_RPM_LIMIT = float(os.getenv("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = float(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+LLM_ASYNC_ENABLED = os.getenv("EIC_LLM_ASYNC", "0") == "1"
+
+# Retry policy: total retries per run and circuit breaker thresholds
+RETRY_BUDGET = int(os.getenv("EIC_RETRY_BUDGET", "60"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("EIC_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("EIC_BREAKER_RESET", "60"))
+
+# Run deadline: wall-clock budget in seconds (0 = unlimited) and the slice
+# reserved for saving, Discussions and Slack
+RUN_BUDGET_SECONDS = float(os.getenv("EIC_RUN_BUDGET", "0"))
+RUN_RESERVE_SECONDS = float(os.getenv("EIC_RUN_RESERVE", "180"))
+
+# JSONL writer checkpoints: flush and fsync every N items or after N seconds
+ITEM_FLUSH_EVERY = int(os.getenv("EIC_ITEM_FLUSH_EVERY", "10"))
+ITEM_FLUSH_SECONDS = float(os.getenv("EIC_ITEM_FLUSH_SECONDS", "30"))
+
+# Optional SQLite mirror of items and index with full-text search (EIC_SQLITE=1 enables)
+SQLITE_ENABLED = os.getenv("EIC_SQLITE", "0") == "1"
+
+# Seal closed months into zstd frames after each run (EIC_SEAL_MONTHS=1 enables,
+# needs zstandard)
+SEAL_CLOSED_MONTHS = os.getenv("EIC_SEAL_MONTHS", "0") == "1"
+
+# Optional Parquet export of new items after each run (EIC_PARQUET=1 enables,
+# needs pyarrow); a month with more parts than this is compacted into one
+PARQUET_EXPORT_ENABLED = os.getenv("EIC_PARQUET", "0") == "1"
+PARQUET_MAX_PARTS = int(os.getenv("EIC_PARQUET_MAX_PARTS", "8"))
+
+# Bloom filter in front of the binary dedup index (EIC_INDEX_BLOOM=0 disables)
+INDEX_BLOOM_ENABLED = os.getenv("EIC_INDEX_BLOOM", "1") != "0"
+
+# Shared HTTP client
+USER_AGENT = "Mozilla/5.0 (compatible; EIC-Bot/1.0; +https://github.com/eic-hr-analytics)"
+HTTP_CONNECT_TIMEOUT = float(os.getenv("EIC_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("EIC_HTTP_READ_TIMEOUT", "30"))
+HTTP_POOL_HOSTS = 64  # Host pools kept alive per adapter
+HTTP_POOL_MAXSIZE = int(os.getenv("EIC_HTTP_POOL_MAXSIZE", "4"))
+HTTP_HOST_POOL_SIZES = {
+    "api.github.com": 2,
+    "hooks.slack.com": 1,
+}
+HTTP_DNS_CACHE_TTL = float(os.getenv("EIC_HTTP_DNS_TTL", "300"))  # 0 disables
+
 # Base reliability scores by source_type
 BASE_RELIABILITY_SCORES = {
     "ministry": 80,
@@ -60,7 +183,8 @@ BASE_RELIABILITY_SCORES = {
 }
 
 # Ingest version for tracking schema changes
-INGEST_VERSION = "1.0.0"
+# 1.1.0: enrichment_source, plus theme_confidence on locally tagged items
+INGEST_VERSION = "1.1.0"
 
 
 def setup_logging(level: int = logging.INFO) -> logging.Logger:
@@ -168,48 +292,6 @@ def get_discussions_category_id() -> str:
     return config.get("daily_digest_category_id", "")
 
 
-def retry_with_backoff(
-    max_retries: int = 3,
-    base_delay: float = 1.0,
-    max_delay: float = 30.0,
-    exceptions: tuple = (Exception,),
-) -> Callable:
-    """
-    Decorator for retrying functions with exponential backoff.
-
-    Args:
-        max_retries: Maximum number of retry attempts
-        base_delay: Initial delay in seconds
-        max_delay: Maximum delay in seconds
-        exceptions: Tuple of exceptions to catch
-
-    Returns:
-        Decorated function
-    """
-
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            last_exception = None
-            for attempt in range(max_retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except exceptions as e:
-                    last_exception = e
-                    if attempt < max_retries:
-                        delay = min(base_delay * (2**attempt), max_delay)
-                        logging.warning(
-                            f"Attempt {attempt + 1}/{max_retries + 1} failed: {e}. "
-                            f"Retrying in {delay:.1f}s..."
-                        )
-                        time.sleep(delay)
-            raise last_exception
-
-        return wrapper
-
-    return decorator
-
-
 def clamp(value: int, min_val: int, max_val: int) -> int:
     """Clamp value to [min_val, max_val] range."""
     return max(min_val, min(value, max_val))
@@ -229,3 +311,206 @@ def truncate_text(text: str, max_chars: int) -> str:
     if len(text) <= max_chars:
         return text
     return text[:max_chars]
+
+
+def fsync_directory(path: Path) -> None:
+    """Make a rename in a directory durable (no-op where unsupported)."""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class _PooledSession(requests.Session):
+    """requests.Session that applies the uniform default timeout."""
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+        return super().request(method, url, **kwargs)
+
+
+_http_session: _PooledSession | None = None
+_http_lock = threading.Lock()
+
+_dns_cache: dict[tuple, tuple[float, list]] = {}
+_dns_lock = threading.Lock()
+_dns_stats = {"hits": 0, "misses": 0}
+
+
+def _cached_getaddrinfo(
+    host: Any,
+    port: Any,
+    family: int = 0,
+    type: int = 0,
+    proto: int = 0,
+    flags: int = 0,
+) -> list:
+    """socket.getaddrinfo with a TTL cache shared by the HTTP session's adapters."""
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+
+    with _dns_lock:
+        cached = _dns_cache.get(key)
+        if cached and cached[0] > now:
+            _dns_stats["hits"] += 1
+            return cached[1]
+
+    result = socket.getaddrinfo(host, port, family, type, proto, flags)
+
+    with _dns_lock:
+        _dns_cache[key] = (now + HTTP_DNS_CACHE_TTL, result)
+        _dns_stats["misses"] += 1
+
+    return result
+
+
+def _cached_create_connection(
+    address: tuple[str, int],
+    timeout: Any,
+    source_address: tuple[str, int] | None = None,
+    socket_options: list | None = None,
+) -> socket.socket:
+    """urllib3's create_connection, resolving through the DNS cache."""
+    host, port = address
+    error: OSError | None = None
+
+    for family, socktype, proto, _, sockaddr in _cached_getaddrinfo(
+        host.strip("[]"), port, allowed_gai_family(), socket.SOCK_STREAM
+    ):
+        sock = None
+        try:
+            sock = socket.socket(family, socktype, proto)
+            for option in socket_options or ():
+                sock.setsockopt(*option)
+            if isinstance(timeout, (int, float)):
+                sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sockaddr)
+            return sock
+        except OSError as e:
+            error = e
+            if sock is not None:
+                sock.close()
+
+    raise error or OSError("getaddrinfo returns an empty list")
+
+
+class _CachedDNSConnection(HTTPConnection):
+    """HTTP connection whose host lookups go through the DNS cache."""
+
+    def _new_conn(self) -> socket.socket:
+        try:
+            return _cached_create_connection(
+                (self._dns_host, self.port),
+                self.timeout,
+                source_address=self.source_address,
+                socket_options=self.socket_options,
+            )
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        except socket.timeout as e:
+            raise ConnectTimeoutError(
+                self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})"
+            ) from e
+        except OSError as e:
+            raise NewConnectionError(self, f"Failed to establish a new connection: {e}") from e
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSConnection, HTTPSConnection):
+    """HTTPS connection whose host lookups go through the DNS cache."""
+
+
+class _CachedDNSPool(HTTPConnectionPool):
+    """HTTP pool creating cached-DNS connections."""
+
+    ConnectionCls = _CachedDNSConnection
+
+
+class _CachedDNSHTTPSPool(HTTPSConnectionPool):
+    """HTTPS pool creating cached-DNS connections."""
+
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+
+class _CachedDNSAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connections resolve hosts through the DNS cache.
+
+    The cache is scoped to this adapter's pools, so other code in the
+    process keeps using the system resolver.
+    """
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CachedDNSPool,
+            "https": _CachedDNSHTTPSPool,
+        }
+
+
+def get_http_session() -> requests.Session:
+    """
+    Get the shared HTTP session used by every outbound module.
+
+    The session keeps keep-alive connection pools per host (sized by
+    HTTP_HOST_POOL_SIZES, else HTTP_POOL_MAXSIZE), applies a uniform
+    (connect, read) timeout and, unless disabled, resolves hosts through a
+    TTL DNS cache scoped to its adapters.
+
+    Returns:
+        Shared requests.Session
+    """
+    global _http_session
+
+    with _http_lock:
+        if _http_session is None:
+            session = _PooledSession()
+            session.headers["User-Agent"] = USER_AGENT
+
+            adapter_class = _CachedDNSAdapter if HTTP_DNS_CACHE_TTL > 0 else HTTPAdapter
+            default_adapter = adapter_class(
+                pool_connections=HTTP_POOL_HOSTS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+            )
+            session.mount("http://", default_adapter)
+            session.mount("https://", default_adapter)
+
+            # Longest prefix wins, so these override the default adapter
+            for host, pool_size in HTTP_HOST_POOL_SIZES.items():
+                session.mount(
+                    f"https://{host}",
+                    adapter_class(pool_connections=1, pool_maxsize=pool_size),
+                )
+
+            _http_session = session
+
+        return _http_session
+
+
+def log_http_stats() -> None:
+    """Log connection reuse and DNS cache counts for the shared session."""
+    if _http_session is None:
+        return
+
+    requests_sent = 0
+    connections_opened = 0
+
+    for adapter in {id(a): a for a in _http_session.adapters.values()}.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            requests_sent += pool.num_requests
+            connections_opened += pool.num_connections
+
+    logging.getLogger("eic").info(
+        f"HTTP: {requests_sent} requests over {connections_opened} connections "
+        f"({max(0, requests_sent - connections_opened)} reused), "
+        f"DNS cache hits={_dns_stats['hits']} misses={_dns_stats['misses']}"
+    )
@@ -0,0 +1,104 @@
+"""Shared fixtures: a temporary data directory and an offline LLM client."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from scripts import llm_client, month_archive, resilience, store
+from scripts.cache import DiskCache
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Temporary data/ with an empty items/ directory."""
+    items_dir = tmp_path / "items"
+    items_dir.mkdir()
+    monkeypatch.setattr(store, "ITEMS_DIR", items_dir)
+    monkeypatch.setattr(store, "INDEX_FILE", tmp_path / "index.json")
+    monkeypatch.setattr(store, "INDEX_JOURNAL_FILE", tmp_path / "index.journal")
+    monkeypatch.setattr(store, "INDEX_IDS_FILE", tmp_path / "index.ids")
+    monkeypatch.setattr(month_archive, "ITEMS_DIR", items_dir)
+    monkeypatch.setattr(store, "_open_writers", type(store._open_writers)())
+    monkeypatch.setattr(store, "_journal_file", None)
+    yield tmp_path
+    if store._journal_file is not None:
+        store._journal_file.close()
+
+
+def _make_item(number: int, date: str = "2024-01-15", group: str = "trend") -> dict:
+    return {
+        "item_id": f"{number:064x}",
+        "url": f"https://example.com/{number}",
+        "source_group": group,
+        "source_name": "Example",
+        "title": f"記事 {number}",
+        "summary": "育児・介護休業法の改正について解説",
+        "themes": ["laborlaw"],
+        "observed_at": f"{date}T09:00:00+09:00",
+    }
+
+
+@pytest.fixture
+def make_item():
+    """Factory for minimal stored items: make_item(number, date, group)."""
+    return _make_item
+
+
+def _enrichment_json(title: str = "タイトル", themes: list[str] | None = None, **fields) -> dict:
+    """A valid ENRICHMENT_SCHEMA result."""
+    return {
+        "title": title,
+        "summary": "要約",
+        "key_points": ["要点1", "要点2", "要点3"],
+        "themes": ["laborlaw"] if themes is None else themes,
+        "tags": [],
+        "language": "ja",
+        "published_at": None,
+        "reliability_score_delta": 0,
+        "reliability_reason": "",
+        **fields,
+    }
+
+
+class FakeOpenAI:
+    """Stand-in for the OpenAI client: records requests and answers with reply(request)."""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.reply = lambda request: json.dumps(_enrichment_json())
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **request):
+        self.requests.append(request)
+        usage = SimpleNamespace(
+            prompt_tokens=1000,
+            completion_tokens=100,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=0),
+        )
+        message = SimpleNamespace(content=self.reply(request))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    def models(self, model: str | None = None) -> list[str]:
+        """Models of the recorded requests (optionally only those of one model)."""
+        return [r["model"] for r in self.requests if model is None or r["model"] == model]
+
+
+@pytest.fixture
+def enrichment():
+    """Factory for valid analysis results: enrichment(title, themes, **fields)."""
+    return _enrichment_json
+
+
+@pytest.fixture
+def llm(tmp_path, monkeypatch):
+    """LLMClient with a fake API, a private response cache and fresh circuit breakers."""
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(
+        llm_client, "response_cache", DiskCache(tmp_path / "llm", 3600, 1 << 20)
+    )
+    client = llm_client.LLMClient(
+        api_key="test", model="big-model", cheap_model="small-model", use_cache=True, cascade=False
+    )
+    client.client = FakeOpenAI()
+    return client
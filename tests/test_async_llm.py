@@ -0,0 +1,91 @@
+"""Async LLM client and RPM/TPM token buckets."""
+
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from scripts import llm_client, resilience
+from scripts.cache import DiskCache
+from scripts.llm_client import AsyncLLMClient
+from scripts.rate_limit import RateLimiter, TokenBucket
+
+
+def test_bucket_goes_into_debt_and_reports_the_wait():
+    bucket = TokenBucket(per_minute=60)  # One unit per second
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(2) == pytest.approx(2.0, abs=0.1)
+
+
+def test_pause_blocks_until_retry_after():
+    bucket = TokenBucket(per_minute=6000)
+    bucket.pause(5)
+
+    assert bucket.reserve(1) == pytest.approx(5.0, abs=0.1)
+
+
+def test_limiter_waits_for_the_tighter_bucket():
+    limiter = RateLimiter(rpm=6000, tpm=600)  # 10 tokens per second
+
+    assert limiter._reserve(600) == 0.0
+    assert limiter._reserve(100) == pytest.approx(10.0, abs=0.1)
+
+
+class _AsyncCompletions:
+    """Fake AsyncOpenAI completions that tracks concurrent requests."""
+
+    def __init__(self, enrichment):
+        self.enrichment = enrichment
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, **request):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        title = re.search(r"記事\d{3}", request["messages"][-1]["content"]).group()
+        message = SimpleNamespace(content=json.dumps(self.enrichment(title)))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+@pytest.fixture
+def async_llm(tmp_path, monkeypatch, enrichment):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(llm_client, "response_cache", DiskCache(tmp_path / "llm", 3600, 1 << 20))
+    monkeypatch.setattr(llm_client, "openai_limiter", RateLimiter(rpm=60_000, tpm=10**9))
+    client = AsyncLLMClient(api_key="test", use_cache=False, concurrency=3)
+    client.async_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=_AsyncCompletions(enrichment))
+    )
+    return client
+
+
+def _article(number: int) -> dict:
+    return {
+        "content": f"本文 記事{number:03d}",
+        "source_name": "Example",
+        "source_type": "news",
+        "publisher": "Example",
+        "original_title": f"記事{number:03d}",
+        "language": "ja",
+    }
+
+
+def test_analyze_many_caps_in_flight_requests_and_keeps_order(async_llm):
+    results = asyncio.run(async_llm.analyze_many([_article(n) for n in range(10)]))
+
+    assert [r.title for r in results] == [f"記事{n:03d}" for n in range(10)]
+    assert async_llm.async_client.chat.completions.peak == 3
+
+
+def test_sync_callers_share_the_concurrency_cap(async_llm):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda n: async_llm.analyze_article(**_article(n)), range(8)))
+
+    assert [r.title for r in results] == [f"記事{n:03d}" for n in range(8)]
+    assert async_llm.async_client.chat.completions.peak == 3
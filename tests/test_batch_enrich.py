@@ -0,0 +1,138 @@
+"""Batch collection: unanswered and failed requests are resubmitted."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from scripts import batch_enrich
+from scripts.cache import DiskCache
+from scripts.normalize import compute_item_id
+from scripts.store import load_index
+
+
+class FakeBatchAPI:
+    """OpenAI client stand-in serving one scripted batch at a time."""
+
+    def __init__(self):
+        self.files_by_id: dict[str, bytes] = {}
+        self.batch = None
+        self.submitted: list[list[str]] = []
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=lambda _: self.batch)
+
+    def _create_file(self, file, purpose):
+        custom_ids = [json.loads(line)["custom_id"] for line in file.read().splitlines()]
+        self.submitted.append(custom_ids)
+        return SimpleNamespace(id=f"file-{len(self.submitted)}")
+
+    def _create_batch(self, **kwargs):
+        return SimpleNamespace(id=f"batch-{len(self.submitted)}")
+
+    def _content(self, file_id):
+        return SimpleNamespace(content=self.files_by_id[file_id])
+
+    def finish(self, status: str, ok: list[str], errors: list[str]) -> None:
+        self.files_by_id = {
+            "out": b"".join(_result_line(item_id, 200) for item_id in ok),
+            "err": b"".join(_result_line(item_id, 500) for item_id in errors),
+        }
+        self.batch = SimpleNamespace(
+            status=status,
+            output_file_id="out" if ok else None,
+            error_file_id="err" if errors else None,
+        )
+
+
+def _result_line(item_id: str, status_code: int) -> bytes:
+    if status_code == 200:
+        result = batch_enrich.stub_responder({"messages": [{"content": "元タイトル: 記事"}]})
+        body = {"choices": [{"message": {"content": json.dumps(result)}}]}
+    else:
+        body = {"error": {"message": "server error"}}
+    line = {"custom_id": item_id, "response": {"status_code": status_code, "body": body}}
+    return (json.dumps(line) + "\n").encode("utf-8")
+
+
+@pytest.fixture
+def api(data_dir, monkeypatch):
+    """A prepared three-request batch served by FakeBatchAPI."""
+    monkeypatch.setattr(batch_enrich, "BATCH_DIR", data_dir / "batches")
+    monkeypatch.setattr(batch_enrich, "response_cache", DiskCache(data_dir / "cache", 3600, 1 << 20))
+    api = FakeBatchAPI()
+    monkeypatch.setattr(
+        batch_enrich, "get_backend", lambda name: batch_enrich.OpenAIBatchBackend(api)
+    )
+
+    items = {}
+    batch_dir = data_dir / "batches" / "b"
+    batch_dir.mkdir(parents=True)
+    with open(batch_dir / "requests.jsonl", "w", encoding="utf-8") as f:
+        for number in range(3):
+            url = f"https://example.com/{number}"
+            item_id = compute_item_id(url)
+            body = batch_enrich.build_analysis_request("m", "system", f"元タイトル: 記事 {number}")
+            f.write(json.dumps({"custom_id": item_id, "body": body}) + "\n")
+            candidate = {
+                "url": url,
+                "source_key": "example",
+                "source_name": "Example",
+                "source_type": "rss",
+                "publisher": "Example",
+                "title": f"記事 {number}",
+                "pub_date": "2024-01-15T09:00:00+09:00",
+                "language": "ja",
+            }
+            items[item_id] = {"candidate": candidate, "url_normalized": url, "content_length": 0}
+    batch_enrich.save_manifest(
+        {
+            "name": "b",
+            "source_group": "trend",
+            "model": "m",
+            "backend": None,
+            "batch_id": None,
+            "status": "prepared",
+            "items": items,
+            "merged": [],
+            "failed": [],
+        }
+    )
+    api.item_ids = list(items)
+    return api
+
+
+def test_expired_batch_marks_errors_and_unanswered_failed(api):
+    first, second, third = api.item_ids
+    batch_enrich.submit_batch("b")
+    api.finish("expired", ok=[first], errors=[second])
+
+    manifest = batch_enrich.collect_batch("b")
+
+    assert manifest["merged"] == [first]
+    assert sorted(manifest["failed"]) == sorted([second, third])
+
+
+def test_failed_batch_without_files_is_resubmitted(api):
+    batch_enrich.submit_batch("b")
+    api.finish("failed", ok=[], errors=[])
+    assert sorted(batch_enrich.collect_batch("b")["failed"]) == sorted(api.item_ids)
+
+    batch_enrich.submit_batch("b")
+    assert sorted(api.submitted[-1]) == sorted(api.item_ids)
+    api.finish("completed", ok=api.item_ids, errors=[])
+    manifest = batch_enrich.collect_batch("b")
+
+    assert manifest["failed"] == []
+    assert sorted(manifest["merged"]) == sorted(api.item_ids)
+    assert set(api.item_ids) <= set(load_index())
+
+
+def test_resubmit_sends_only_failed_requests(api):
+    first, second, third = api.item_ids
+    batch_enrich.submit_batch("b")
+    api.finish("completed", ok=[first, third], errors=[second])
+    batch_enrich.collect_batch("b")
+
+    batch_enrich.submit_batch("b")
+
+    assert api.submitted[-1] == [second]
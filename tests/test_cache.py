@@ -0,0 +1,35 @@
+"""DiskCache size accounting."""
+
+import time
+
+from scripts.cache import DiskCache
+
+
+def _disk_size(cache: DiskCache) -> int:
+    return sum(path.stat().st_size for path in cache._entries())
+
+
+def test_first_write_counted_once(tmp_path):
+    cache = DiskCache(tmp_path / "ns", ttl_seconds=3600, max_bytes=1 << 20)
+    cache.set("ab" * 32, b"value")
+    assert cache._total_bytes == _disk_size(cache)
+
+
+def test_first_write_after_restart_counted_once(tmp_path):
+    DiskCache(tmp_path / "ns", 3600, 1 << 20).set("ab" * 32, b"old")
+    cache = DiskCache(tmp_path / "ns", 3600, 1 << 20)  # Size unknown until scanned
+    cache.set("cd" * 32, b"new")
+    cache.set("ab" * 32, b"overwritten")
+    assert cache._total_bytes == _disk_size(cache)
+
+
+def test_expired_read_releases_its_bytes(tmp_path, monkeypatch):
+    cache = DiskCache(tmp_path / "ns", ttl_seconds=60, max_bytes=1 << 20)
+    cache.set("ab" * 32, b"stale")
+    cache.set("cd" * 32, b"fresh")
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert cache.get("ab" * 32) is None
+
+    assert cache._total_bytes == _disk_size(cache)
@@ -0,0 +1,92 @@
+"""Model cascade: cheap model first, escalation only for rejected results."""
+
+import json
+
+import pytest
+
+from scripts import llm_client
+from scripts.llm_client import enrichment_from_dict, escalation_reason
+
+LONG = "育児・介護休業法の改正について。" * 50
+
+
+def _article(content: str = LONG, title: str = "改正のポイント") -> dict:
+    return {
+        "content": content,
+        "source_name": "Example",
+        "source_type": "news",
+        "publisher": "Example",
+        "original_title": title,
+        "language": "ja",
+    }
+
+
+@pytest.fixture
+def cascade_llm(llm, enrichment):
+    """Cascade on; the cheap model answers with whatever cheap_reply returns."""
+    llm.cascade = True
+    llm.cheap_reply = lambda request: json.dumps(enrichment("cheap"))
+
+    def reply(request):
+        if request["model"] == "small-model":
+            return llm.cheap_reply(request)
+        return json.dumps(enrichment("big"))
+
+    llm.client.reply = reply
+    return llm
+
+
+def test_accepted_first_tier_result_is_not_escalated(cascade_llm):
+    assert cascade_llm.analyze_article(**_article()).title == "cheap"
+    assert cascade_llm.client.models() == ["small-model"]
+    assert cascade_llm.usage._tiers == {"first_pass": 1}
+
+
+@pytest.mark.parametrize(
+    "cheap, reason",
+    [
+        (lambda e: "", "failed"),  # Empty response
+        (lambda e: json.dumps(e("cheap", themes=[])), "no_themes"),
+        (lambda e: json.dumps({**e("cheap"), "key_points": ["一つだけ"]}), "placeholder_key_point"),
+        (lambda e: json.dumps(e("cheap", reliability_score_delta=40)), "delta_out_of_range"),
+    ],
+)
+def test_rejected_results_escalate(cascade_llm, enrichment, cheap, reason):
+    cascade_llm.cheap_reply = lambda request: cheap(enrichment)
+
+    assert cascade_llm.analyze_article(**_article()).title == "big"
+    assert cascade_llm.client.models() == ["small-model", "big-model"]
+    assert cascade_llm.usage._tiers == {f"escalated:{reason}": 1}
+
+
+def test_model_override_bypasses_the_cascade(cascade_llm):
+    cascade_llm.analyze_article(**_article(), model="big-model")
+
+    assert cascade_llm.client.models() == ["big-model"]
+
+
+def test_short_content_escalates_single_but_not_packed_articles(cascade_llm, enrichment):
+    short = _article(content="短い本文")
+    assert escalation_reason(enrichment_from_dict(enrichment()), short["content"]) == (
+        "short_content"
+    )
+
+    def packed(request):
+        count = request["messages"][-1]["content"].count("# 記事 ")
+        items = [{"article_id": n, **enrichment("cheap")} for n in range(1, count + 1)]
+        items[1]["themes"] = []  # Only the second article is rejected
+        return json.dumps({"items": items})
+
+    cascade_llm.cheap_reply = packed
+    results = cascade_llm.analyze_packed([short, _article(title="二件目"), _article(title="三件目")])
+
+    assert [r.title for r in results] == ["cheap", "big", "cheap"]
+    assert cascade_llm.client.models() == ["small-model", "big-model"]
+    assert cascade_llm.usage._tiers == {"first_pass": 2, "escalated:no_themes": 1}
+
+
+def test_cascade_needs_a_distinct_cheap_model(monkeypatch):
+    monkeypatch.setattr(llm_client, "OPENAI_API_KEY", "test")
+    client = llm_client.LLMClient(model="same", cheap_model="same", cascade=True)
+
+    assert not client.cascade
@@ -0,0 +1,62 @@
+"""Feed cursor: entries held back by the per-source cap are not skipped."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from scripts import collect_candidates
+
+SOURCE = {"key": "example", "name": "Example", "url": "https://example.com/feed"}
+START = datetime(2024, 1, 15, tzinfo=timezone.utc)
+
+
+def _feed(count: int) -> bytes:
+    """RSS feed with count entries, newest first, one hour apart."""
+    items = "".join(
+        f"<item><title>記事 {n}</title><link>https://example.com/{n}</link>"
+        f"<pubDate>{format_datetime(START + timedelta(hours=n))}</pubDate></item>"
+        for n in reversed(range(count))
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    """Serve a ten-entry feed with a cap of four entries per run."""
+    monkeypatch.setattr(collect_candidates, "MAX_ENTRIES_PER_SOURCE", 4)
+    content = _feed(10)
+
+    def fetch_feed(url, previous):
+        state = {"etag": '"v1"', "last_modified": None, "content_hash": "h", "checked_at": ""}
+        if previous.get("etag") == state["etag"]:
+            return None, {**previous}
+        return content, state
+
+    monkeypatch.setattr(collect_candidates, "fetch_feed", fetch_feed)
+
+
+def _urls(candidates) -> set[str]:
+    return {candidate["url"] for candidate in candidates}
+
+
+def test_held_back_entries_arrive_in_later_runs(feed):
+    cursor = {"pub_date": (START - timedelta(hours=1)).isoformat(), "item_ids": []}
+    state = {"example": {"cursor": cursor}}
+
+    collected = []
+    for _ in range(3):
+        collected.append(_urls(collect_candidates.collect_from_single_source(SOURCE, state)))
+
+    assert [len(urls) for urls in collected] == [4, 4, 2]
+    assert set().union(*collected) == {f"https://example.com/{n}" for n in range(10)}
+    # Nothing left: the validators are kept again and the feed is skipped
+    assert collect_candidates.collect_from_single_source(SOURCE, state) == []
+
+
+def test_first_run_takes_initial_window(feed):
+    state = {}
+    candidates = collect_candidates.collect_from_single_source(SOURCE, state)
+
+    assert _urls(candidates) == {f"https://example.com/{n}" for n in (9, 8, 7, 6)}
+    assert state["example"]["cursor"]["pub_date"] == (START + timedelta(hours=9)).isoformat()
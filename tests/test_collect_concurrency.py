@@ -0,0 +1,79 @@
+"""Concurrent collection: per-host cap, source order and deadline admission."""
+
+import threading
+import time
+
+from scripts import collect_candidates
+from scripts.collect_candidates import collect_from_sources
+
+SOURCES = [
+    {"key": f"{host}-{n}", "url": f"https://{host}.example.com/feed/{n}"}
+    for host in ("a", "b")
+    for n in range(3)
+]
+
+
+class _Recorder:
+    """Stand-in for collect_from_single_source that tracks concurrency per host."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.total_peak = 0
+
+    def __call__(self, source, feed_state):
+        host = source["url"].split("/")[2]
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+            self.total_peak = max(self.total_peak, sum(self.active.values()))
+        time.sleep(0.05)
+        with self.lock:
+            self.active[host] -= 1
+        return [{"url": source["url"], "pub_date": "2024-01-15T09:00:00+00:00"}]
+
+
+def _patch(monkeypatch, per_host: int) -> _Recorder:
+    recorder = _Recorder()
+    monkeypatch.setattr(collect_candidates, "load_sources_config", lambda group: SOURCES)
+    monkeypatch.setattr(collect_candidates, "COLLECT_PER_HOST_LIMIT", per_host)
+    monkeypatch.setattr(collect_candidates, "collect_from_single_source", recorder)
+    return recorder
+
+
+def test_per_host_limit_caps_concurrent_fetches(monkeypatch):
+    recorder = _patch(monkeypatch, per_host=1)
+
+    collect_from_sources("trend", max_workers=6)
+
+    assert recorder.peak == {"a.example.com": 1, "b.example.com": 1}
+    assert recorder.total_peak == 2  # The two hosts still run side by side
+
+
+def test_parallel_result_matches_serial_order(monkeypatch):
+    _patch(monkeypatch, per_host=3)
+    serial = collect_from_sources("trend", max_workers=1)
+    parallel = collect_from_sources("trend", max_workers=6)
+
+    assert parallel == serial
+    assert [c["url"] for c in parallel] == [s["url"] for s in SOURCES]
+
+
+def test_sources_past_the_deadline_are_skipped(monkeypatch):
+    _patch(monkeypatch, per_host=3)
+
+    class _Deadline:
+        def __init__(self):
+            self.admitted = 0
+
+        def admit(self, kind):
+            self.admitted += 1
+            return self.admitted <= 2
+
+        def record(self, kind, seconds):
+            pass
+
+    candidates = collect_from_sources("trend", max_workers=1, deadline=_Deadline())
+
+    assert [c["url"] for c in candidates] == [s["url"] for s in SOURCES[:2]]
@@ -0,0 +1,44 @@
+"""Run deadline: EWMA cost estimates and admission before the reserved tail."""
+
+import pytest
+
+from scripts.deadline import CostEstimator, RunDeadline, create_deadline
+
+
+def test_first_sample_replaces_the_prior_then_smooths():
+    costs = CostEstimator({"item": 45.0}, alpha=0.5)
+
+    costs.record("item", 10.0)
+    assert costs.estimate("item") == 10.0
+    costs.record("item", 20.0)
+    assert costs.estimate("item") == 15.0
+    assert costs.samples("item") == 2
+    assert costs.estimate("unknown") == 0.0
+
+
+def test_work_is_refused_once_its_estimate_reaches_the_reserve():
+    deadline = RunDeadline(100, reserve_seconds=40, costs=CostEstimator({"item": 50.0}))
+
+    assert deadline.work_remaining() == pytest.approx(60, abs=1)
+    assert deadline.admit("item")
+
+    deadline.record("item", 70.0)  # Measured cost no longer fits the work phase
+    assert not deadline.admit("item")
+    assert not deadline.admit("item")
+    assert deadline.refused == {"item": 2}
+
+
+def test_reserved_work_may_use_the_tail():
+    deadline = RunDeadline(100, reserve_seconds=90, costs=CostEstimator({"summary": 20.0}))
+
+    assert not deadline.admit("summary")
+    assert deadline.admit("summary", reserved=True)
+
+
+def test_reserve_never_exceeds_the_budget():
+    assert RunDeadline(10, reserve_seconds=60).reserve_seconds == 10
+
+
+def test_zero_budget_means_no_deadline():
+    assert create_deadline(0) is None
+    assert create_deadline(30).budget_seconds == 30
@@ -0,0 +1,50 @@
+"""Process-pool extraction: same text as in-process, timeouts kill and replace the pool."""
+
+import time
+
+import pytest
+
+from scripts import fetch_content
+from scripts.fetch_content import ExtractionEngine
+
+PARAGRAPH = "育児・介護休業法の改正により、企業には柔軟な働き方を実現するための措置が求められる。"
+HTML = (
+    "<html><head><title>改正のポイント</title></head><body><article><h1>改正のポイント</h1>"
+    + "".join(f"<p>{PARAGRAPH}（{n}）</p>" for n in range(10))
+    + "</article></body></html>"
+)
+
+
+def _stall(html: str) -> str | None:
+    """Runs in a worker process: stands in for a runaway parse."""
+    if html == "stall":
+        time.sleep(60)
+    return "ok"
+
+
+@pytest.fixture
+def engine():
+    engine = ExtractionEngine(processes=2, timeout=5)
+    yield engine
+    engine.close()
+
+
+def test_pool_matches_in_process_extraction(engine):
+    expected = ExtractionEngine(processes=0).extract(HTML)
+
+    assert expected and PARAGRAPH in expected
+    assert engine.extract(HTML) == expected
+    assert engine.pages == 1 and engine.timeouts == 0
+
+
+def test_timeout_replaces_the_pool(engine, monkeypatch):
+    monkeypatch.setattr(fetch_content, "_extract_text", _stall)
+    assert engine.extract("warm-up") == "ok"  # Workers start before the short timeout
+    engine.timeout = 1
+
+    start = time.monotonic()
+    assert engine.extract("stall") is None
+    assert time.monotonic() - start < 10
+
+    assert engine.timeouts == 1
+    assert engine.extract("next") == "ok"  # Served by a fresh pool
@@ -0,0 +1,83 @@
+"""Conditional GET: validators sent, unchanged feeds skipped, rollback of unfinished sources."""
+
+import pytest
+
+from scripts import collect_candidates
+from scripts.collect_candidates import fetch_feed
+from scripts.feed_state import rollback_sources
+
+FEED = b'<?xml version="1.0"?><rss version="2.0"><channel></channel></rss>'
+
+
+class _Response:
+    def __init__(self, status_code=200, content=FEED, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class _Session:
+    def __init__(self, response):
+        self.response = response
+        self.sent_headers = None
+
+    def get(self, url, headers, timeout):
+        self.sent_headers = headers
+        return self.response
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Answer the next feed request with a given response."""
+
+    def serve(response):
+        session = _Session(response)
+        monkeypatch.setattr(collect_candidates, "get_http_session", lambda: session)
+        return session
+
+    return serve
+
+
+def test_first_fetch_stores_validators(serve):
+    serve(_Response(headers={"ETag": '"v1"', "Last-Modified": "Mon, 15 Jan 2024 00:00:00 GMT"}))
+
+    content, state = fetch_feed("https://example.com/feed", {})
+
+    assert content == FEED
+    assert state["etag"] == '"v1"'
+    assert state["last_modified"] == "Mon, 15 Jan 2024 00:00:00 GMT"
+    assert state["content_hash"]
+
+
+def test_not_modified_sends_validators_and_skips(serve):
+    session = serve(_Response(status_code=304))
+    previous = {"etag": '"v1"', "last_modified": "Mon, 15 Jan 2024 00:00:00 GMT", "cursor": {}}
+
+    content, state = fetch_feed("https://example.com/feed", previous)
+
+    assert content is None
+    assert session.sent_headers["If-None-Match"] == '"v1"'
+    assert session.sent_headers["If-Modified-Since"] == previous["last_modified"]
+    assert state["etag"] == '"v1"' and state["checked_at"]
+
+
+def test_identical_body_without_validators_is_skipped(serve):
+    serve(_Response())
+    _, first = fetch_feed("https://example.com/feed", {})
+
+    content, _ = fetch_feed("https://example.com/feed", first)
+
+    assert content is None
+
+
+def test_rollback_restores_or_drops_unfinished_sources():
+    previous = {"a": {"etag": "a0"}}
+    state = {"a": {"etag": "a1"}, "b": {"etag": "b1"}, "c": {"etag": "c1"}}
+
+    rollback_sources(state, previous, {"a", "b"})
+
+    assert state == {"a": {"etag": "a0"}, "c": {"etag": "c1"}}
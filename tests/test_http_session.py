@@ -0,0 +1,43 @@
+"""Shared HTTP session: the DNS cache stays inside the session's adapters."""
+
+import http.server
+import socket
+import threading
+
+import pytest
+
+from scripts import utils
+
+
+@pytest.fixture
+def server():
+    """Local HTTP server on an ephemeral port."""
+    httpd = http.server.HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_dns_cache_is_scoped_to_the_session(server, monkeypatch):
+    monkeypatch.setattr(utils, "_http_session", None)
+    monkeypatch.setattr(utils, "_dns_cache", {})
+    monkeypatch.setattr(utils, "_dns_stats", {"hits": 0, "misses": 0})
+    system_getaddrinfo = socket.getaddrinfo
+
+    session = utils.get_http_session()
+    for _ in range(3):
+        assert session.get(f"http://localhost:{server.server_port}/").status_code == 200
+
+    assert socket.getaddrinfo is system_getaddrinfo
+    assert utils._dns_stats == {"hits": 2, "misses": 1}
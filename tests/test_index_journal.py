@@ -0,0 +1,73 @@
+"""Index journal replay, compaction and reconciliation."""
+
+import json
+
+from scripts import offset_index, store
+
+
+def _close_journal():
+    """Simulate a process exit: the next load starts from the files alone."""
+    if store._journal_file is not None:
+        store._journal_file.close()
+        store._journal_file = None
+
+
+def test_journal_is_replayed_after_a_crash(data_dir):
+    index = store.load_index()
+    store.add_to_index(index, "a" * 64, "Example", "title")
+    _close_journal()  # Crash before save_index
+
+    reloaded = store.load_index()
+    assert reloaded["a" * 64]["title"] == "title"
+
+
+def test_torn_last_journal_line_is_ignored(data_dir):
+    journal = data_dir / "index.journal"
+    journal.write_text(
+        json.dumps({"item_id": "a" * 64, "title": "kept"}) + "\n" + '{"item_id": "b',
+        encoding="utf-8",
+    )
+
+    index = store.load_index()
+    assert "a" * 64 in index
+    assert len(index) == 1
+
+    # New entries start on a fresh line instead of extending the torn one
+    store.add_to_index(index, "c" * 64, "Example", "next")
+    _close_journal()
+    assert "c" * 64 in store.load_index()
+
+
+def test_save_index_compacts_the_journal(data_dir):
+    index = store.load_index()
+    store.add_to_index(index, "a" * 64, "Example", "title")
+    store.save_index(index)
+
+    assert (data_dir / "index.journal").read_text(encoding="utf-8") == ""
+    snapshot = json.loads((data_dir / "index.json").read_text(encoding="utf-8"))
+    assert "a" * 64 in snapshot
+    assert "a" * 64 in store.load_index()
+
+
+def test_reconcile_recovers_items_missing_from_the_index(data_dir, make_item):
+    path = data_dir / "items" / "2024-01.jsonl"
+    path.write_text(json.dumps(make_item(1), ensure_ascii=False) + "\n", encoding="utf-8")
+
+    index = store.load_index()
+    assert make_item(1)["item_id"] in index
+    assert index[make_item(1)["item_id"]]["source"] == "Example"
+
+
+def test_reconcile_reads_ids_from_the_sidecar(data_dir, make_item, monkeypatch):
+    with store.ItemWriter() as writer:
+        for number in range(3):
+            writer.append(make_item(number), "2024-01")
+    index = store.load_index()
+    store.save_index(index)
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("JSONL scanned although the sidecar is current")
+
+    monkeypatch.setattr(offset_index, "iter_lines", no_scan)
+    monkeypatch.setattr(store, "read_items", no_scan)
+    assert len(store.load_index()) == 3
@@ -0,0 +1,138 @@
+"""Binary id index: membership, Bloom filter and rebuilds."""
+
+import json
+import os
+
+import pytest
+
+from scripts import item_index
+from scripts.item_index import IdSet, ItemIndex, file_sha256, write_id_file
+
+
+def _ids(count: int) -> list[str]:
+    return [f"{number:064x}" for number in range(1, count + 1)]
+
+
+@pytest.mark.parametrize("bloom", [True, False])
+def test_id_set_membership(tmp_path, bloom):
+    path, snapshot = tmp_path / "index.ids", tmp_path / "index.json"
+    snapshot.write_text("{}", encoding="utf-8")
+    write_id_file(path, _ids(500), snapshot, bloom=bloom)
+
+    ids = IdSet(path)
+    try:
+        assert len(ids) == 500
+        assert all(item_id in ids for item_id in _ids(500))
+        assert f"{10_000:064x}" not in ids
+        assert "not-hex" not in ids
+        assert (ids.bloom_bits > 0) == bloom
+    finally:
+        ids.close()
+
+
+def test_truncated_id_file_is_rejected(tmp_path):
+    path, snapshot = tmp_path / "index.ids", tmp_path / "index.json"
+    snapshot.write_text("{}", encoding="utf-8")
+    write_id_file(path, _ids(10), snapshot)
+    path.write_bytes(path.read_bytes()[:-5])
+
+    assert IdSet.open(path) is None
+
+
+def _write_snapshot(path, ids):
+    path.write_text(json.dumps({item_id: {"title": "t"} for item_id in ids}), encoding="utf-8")
+
+
+def test_missing_id_file_is_rebuilt_from_the_snapshot(tmp_path):
+    snapshot, ids_path = tmp_path / "index.json", tmp_path / "index.ids"
+    _write_snapshot(snapshot, _ids(3))
+
+    index = ItemIndex(snapshot, ids_path)
+
+    assert ids_path.exists()
+    assert IdSet(ids_path).snapshot_sha256 == file_sha256(snapshot)
+    assert _ids(3)[0] in index
+
+
+def test_stale_id_file_is_rebuilt(tmp_path):
+    snapshot, ids_path = tmp_path / "index.json", tmp_path / "index.ids"
+    _write_snapshot(snapshot, _ids(3))
+    ItemIndex(snapshot, ids_path)
+    _write_snapshot(snapshot, _ids(5))  # Snapshot changed, id file not
+
+    index = ItemIndex(snapshot, ids_path)
+
+    assert _ids(5)[-1] in index
+    assert IdSet(ids_path).snapshot_sha256 == file_sha256(snapshot)
+
+
+def test_membership_does_not_parse_the_snapshot(tmp_path):
+    snapshot, ids_path = tmp_path / "index.json", tmp_path / "index.ids"
+    _write_snapshot(snapshot, _ids(3))
+    ItemIndex(snapshot, ids_path)
+
+    index = ItemIndex(snapshot, ids_path)
+    index["f" * 64] = {"title": "new"}
+
+    assert _ids(3)[1] in index and "f" * 64 in index
+    assert len(index) == 4
+    assert index._meta is None
+    assert index.dirty
+
+
+def test_matching_stamp_skips_hashing_the_snapshot(tmp_path, monkeypatch):
+    snapshot, ids_path = tmp_path / "index.json", tmp_path / "index.ids"
+    _write_snapshot(snapshot, _ids(3))
+    ItemIndex(snapshot, ids_path)
+
+    def no_hashing(path):
+        raise AssertionError("snapshot was hashed")
+
+    monkeypatch.setattr(item_index, "file_sha256", no_hashing)
+    index = ItemIndex(snapshot, ids_path)
+
+    assert index._ids is not None
+    assert _ids(3)[2] in index
+
+
+def test_touched_snapshot_is_hashed_once_and_restamped(tmp_path, monkeypatch):
+    snapshot, ids_path = tmp_path / "index.json", tmp_path / "index.ids"
+    _write_snapshot(snapshot, _ids(3))
+    ItemIndex(snapshot, ids_path)
+    stat = snapshot.stat()
+    os.utime(snapshot, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # e.g. git checkout
+
+    index = ItemIndex(snapshot, ids_path)
+    assert index._ids is not None  # Same bytes: accepted, not rebuilt
+    assert IdSet(ids_path).snapshot_mtime_ns == snapshot.stat().st_mtime_ns
+
+    monkeypatch.setattr(item_index, "file_sha256", lambda path: pytest.fail("hashed again"))
+    ItemIndex(snapshot, ids_path)
+
+
+def test_same_size_edit_is_rebuilt(tmp_path):
+    snapshot, ids_path = tmp_path / "index.json", tmp_path / "index.ids"
+    _write_snapshot(snapshot, _ids(3))
+    ItemIndex(snapshot, ids_path)
+    replaced = _ids(2) + [f"{99:064x}"]
+    _write_snapshot(snapshot, replaced)
+    stat = snapshot.stat()
+    os.utime(snapshot, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    index = ItemIndex(snapshot, ids_path)
+
+    assert replaced[-1] in index
+    assert _ids(3)[-1] not in index
+
+
+def test_delete_marks_the_index_dirty(tmp_path):
+    snapshot, ids_path = tmp_path / "index.json", tmp_path / "index.ids"
+    _write_snapshot(snapshot, _ids(3))
+    index = ItemIndex(snapshot, ids_path)
+    assert not index.dirty
+
+    del index[_ids(3)[0]]
+
+    assert index.dirty
+    index.mark_saved(index.to_dict())
+    assert not index.dirty
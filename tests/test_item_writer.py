@@ -0,0 +1,84 @@
+"""ItemWriter durability and crash recovery."""
+
+import json
+
+import pytest
+
+from scripts import store
+
+
+def _item_ids(path):
+    return [json.loads(line)["item_id"] for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_offset_index_failure_does_not_duplicate_items(data_dir, make_item, monkeypatch):
+    calls = []
+
+    def failing_append_offsets(jsonl_path, entries):
+        calls.append(len(entries))
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "append_offsets", failing_append_offsets)
+    index = store.load_index()
+    writer = store.ItemWriter(flush_every=2)
+    for number in range(5):
+        writer.add(index, make_item(number), "Example", "2024-01")
+    writer.close()
+
+    ids = _item_ids(data_dir / "items" / "2024-01.jsonl")
+    assert sorted(ids) == sorted(make_item(n)["item_id"] for n in range(5))
+    assert len(ids) == len(set(ids))
+    assert calls == [2, 2, 1]
+
+    # The sidecar catches up on the next lookup
+    high, trend = store.get_items_for_date("2024-01-15")
+    assert len(high) + len(trend) == 5
+
+
+def test_crash_between_fsync_and_journal_is_recovered(data_dir, make_item, monkeypatch):
+    original = store._append_journal
+    failing = True
+
+    def journal(entries):
+        if failing:
+            raise OSError("journal unavailable")
+        original(entries)
+
+    monkeypatch.setattr(store, "_append_journal", journal)
+    index = store.load_index()
+    writer = store.ItemWriter(flush_every=10)
+    writer.add(index, make_item(1), "Example", "2024-01")
+    with pytest.raises(OSError):
+        writer.flush()
+    failing = False
+    writer.close()
+
+    # Written once, never retried by the next flush
+    assert writer.pending == 0
+    assert len(_item_ids(data_dir / "items" / "2024-01.jsonl")) == 1
+
+    # A restart finds the stored item although the journal never named it
+    assert make_item(1)["item_id"] in store.load_index()
+
+
+def test_torn_tail_is_cut_before_appending(data_dir, make_item):
+    path = data_dir / "items" / "2024-01.jsonl"
+    path.write_text(json.dumps(make_item(1)) + "\n" + '{"item_id": "torn', encoding="utf-8")
+
+    with store.ItemWriter() as writer:
+        writer.append(make_item(2), "2024-01")
+
+    assert _item_ids(path) == [make_item(1)["item_id"], make_item(2)["item_id"]]
+
+
+def test_buffered_items_are_written_at_save_index(data_dir, make_item):
+    index = store.load_index()
+    writer = store.ItemWriter(flush_every=100)
+    writer.add(index, make_item(1), "Example", "2024-01")
+    assert writer.pending == 1
+
+    store.save_index(index)
+
+    assert writer.pending == 0
+    assert _item_ids(data_dir / "items" / "2024-01.jsonl") == [make_item(1)["item_id"]]
+    writer.close()
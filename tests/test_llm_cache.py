@@ -0,0 +1,49 @@
+"""LLM response cache: keyed by model, prompts and schema; hits skip the API."""
+
+from scripts.llm_client import ENRICHMENT_SCHEMA, compute_cache_key
+
+ARTICLE = {
+    "content": "育児・介護休業法の改正について",
+    "source_name": "Example",
+    "source_type": "news",
+    "publisher": "Example",
+    "original_title": "改正のポイント",
+    "language": "ja",
+}
+
+
+def test_repeated_article_is_served_from_the_cache(llm):
+    first = llm.analyze_article(**ARTICLE)
+    second = llm.analyze_article(**ARTICLE)
+
+    assert second == first
+    assert len(llm.client.requests) == 1
+
+
+def test_changed_content_or_model_misses(llm):
+    llm.analyze_article(**ARTICLE)
+    llm.analyze_article(**{**ARTICLE, "content": ARTICLE["content"] + "（続報）"})
+    llm.analyze_article(**ARTICLE, model="small-model")
+
+    assert llm.client.models() == ["big-model", "big-model", "small-model"]
+
+
+def test_disabled_cache_always_calls_the_api(llm):
+    llm.use_cache = False
+    llm.analyze_article(**ARTICLE)
+    llm.analyze_article(**ARTICLE)
+
+    assert len(llm.client.requests) == 2
+
+
+def test_key_covers_every_input():
+    base = ("m", "system", "user", ENRICHMENT_SCHEMA)
+    keys = {
+        compute_cache_key(*base),
+        compute_cache_key("other", *base[1:]),
+        compute_cache_key("m", "system v2", "user", ENRICHMENT_SCHEMA),
+        compute_cache_key("m", "system", "user 2", ENRICHMENT_SCHEMA),
+        compute_cache_key("m", "system", "user", {**ENRICHMENT_SCHEMA, "x": 1}),
+    }
+    assert len(keys) == 5
+    assert compute_cache_key(*base) == compute_cache_key(*base)
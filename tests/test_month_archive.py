@@ -0,0 +1,105 @@
+"""Sealed months: round-trips, reads through the seal, appends that unseal."""
+
+import json
+
+import pytest
+
+from scripts import month_archive, offset_index, store
+
+pytest.importorskip("zstandard")
+
+
+@pytest.fixture
+def month(data_dir, make_item):
+    """January 2024 with 20 items, half high and half trend."""
+    path = data_dir / "items" / "2024-01.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for number in range(20):
+            date, group = ("2024-01-10", "high") if number % 2 else ("2024-01-11", "trend")
+            item = make_item(number, date=date, group=group)
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+    return path
+
+
+def _seal(path):
+    # Small frames, so reads cross frame boundaries
+    month_archive.seal_month(path, frame_bytes=1024)
+    assert month_archive.is_sealed(path)
+    assert len(month_archive.load_frames(path)) > 1
+
+
+def test_seal_unseal_round_trip(month):
+    original = month.read_bytes()
+    _seal(month)
+    assert not month.exists()
+    assert month_archive.logical_size(month) == len(original)
+
+    month_archive.unseal_month(month)
+
+    assert month.read_bytes() == original
+    assert not month_archive.sealed_path(month).exists()
+    assert not month_archive.frames_path(month).exists()
+
+
+def test_seal_drops_a_torn_tail(month):
+    complete = month.read_bytes()
+    with open(month, "ab") as f:
+        f.write(b'{"item_id": "torn')
+
+    _seal(month)
+    month_archive.unseal_month(month)
+
+    assert month.read_bytes() == complete
+
+
+def test_reads_are_identical_after_sealing(month):
+    entries = offset_index.load_offset_index(month)
+    by_date = store.get_items_for_date("2024-01-11")
+    all_items = store.load_items_for_month("2024-01")
+
+    _seal(month)
+
+    assert offset_index.load_offset_index(month) == entries
+    assert offset_index.read_items(month, entries) == all_items
+    assert store.get_items_for_date("2024-01-11") == by_date
+    assert store.load_items_for_month("2024-01") == all_items
+
+
+def test_sidecar_is_rebuilt_from_a_sealed_month(month):
+    entries = offset_index.load_offset_index(month)
+    _seal(month)
+    offset_index.offset_index_path(month).unlink()
+
+    assert offset_index.load_offset_index(month) == entries
+
+
+def test_appending_to_a_sealed_month_unseals_it(month, make_item):
+    before = store.load_items_for_month("2024-01")
+    _seal(month)
+
+    store.append_item(make_item(99, date="2024-01-31"), month="2024-01")
+
+    assert month.exists()
+    assert not month_archive.sealed_path(month).exists()
+    assert store.load_items_for_month("2024-01") == before + [make_item(99, date="2024-01-31")]
+    entries = offset_index.load_offset_index(month)
+    assert entries[-1].item_id == make_item(99)["item_id"]
+
+
+def test_reconcile_reads_sealed_months(month, make_item):
+    _seal(month)
+
+    index = store.load_index()
+
+    assert all(make_item(number)["item_id"] in index for number in range(20))
+
+
+def test_seal_closed_months_keeps_the_current_month(data_dir, month, make_item):
+    current = data_dir / "items" / "2024-02.jsonl"
+    current.write_text(json.dumps(make_item(50, date="2024-02-01")) + "\n", encoding="utf-8")
+
+    assert month_archive.seal_closed_months(current_month="2024-02") == 1
+
+    assert month_archive.is_sealed(month)
+    assert current.exists()
+    assert month_archive.month_paths(data_dir / "items") == [month, current]
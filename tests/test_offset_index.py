@@ -0,0 +1,110 @@
+"""Offset sidecar: catch-up, stale sidecars and rebuilds."""
+
+import json
+
+import pytest
+
+from scripts import offset_index, store
+from scripts.offset_index import StaleOffsetIndex
+
+
+@pytest.fixture
+def month(data_dir):
+    """Logical path of January 2024 in the temporary data directory."""
+    return data_dir / "items" / "2024-01.jsonl"
+
+
+def _write(path, items, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+def _sidecar_ids(path):
+    lines = offset_index.offset_index_path(path).read_text(encoding="utf-8").splitlines()
+    return [line.split("\t")[2] for line in lines]
+
+
+def test_missing_sidecar_is_rebuilt(month, make_item):
+    _write(month, [make_item(1), make_item(2)])
+
+    entries = offset_index.load_offset_index(month)
+
+    assert [entry.item_id for entry in entries] == [make_item(1)["item_id"], make_item(2)["item_id"]]
+    assert _sidecar_ids(month) == [entry.item_id for entry in entries]
+
+
+def test_lines_appended_after_the_sidecar_are_caught_up(month, make_item):
+    _write(month, [make_item(1)])
+    offset_index.load_offset_index(month)
+    _write(month, [make_item(2)], mode="a")  # Crash before append_offsets
+
+    entries = offset_index.load_offset_index(month)
+
+    assert [entry.item_id for entry in entries][-1] == make_item(2)["item_id"]
+    assert _sidecar_ids(month) == [make_item(1)["item_id"], make_item(2)["item_id"]]
+    assert offset_index.read_items(month, entries[-1:]) == [make_item(2)]
+
+
+def test_unterminated_tail_is_not_indexed(month, make_item):
+    _write(month, [make_item(1)])
+    with open(month, "a", encoding="utf-8") as f:
+        f.write(json.dumps(make_item(2))[:20])
+
+    assert len(offset_index.load_offset_index(month)) == 1
+
+
+def test_torn_sidecar_is_rebuilt(month, make_item):
+    _write(month, [make_item(1), make_item(2)])
+    offset_index.load_offset_index(month)
+    sidecar = offset_index.offset_index_path(month)
+    sidecar.write_bytes(sidecar.read_bytes()[:-3])
+
+    assert len(offset_index.load_offset_index(month)) == 2
+    assert len(_sidecar_ids(month)) == 2
+
+
+def test_sidecar_pointing_past_the_end_is_rebuilt(month, make_item):
+    _write(month, [make_item(1), make_item(2)])
+    offset_index.load_offset_index(month)
+    _write(month, [make_item(3)])  # Month rewritten shorter
+
+    entries = offset_index.load_offset_index(month)
+
+    assert [entry.item_id for entry in entries] == [make_item(3)["item_id"]]
+
+
+def test_read_items_detects_a_rewritten_month(month, make_item):
+    _write(month, [make_item(1)])
+    entries = offset_index.load_offset_index(month)
+    _write(month, [make_item(2)])  # Same length, different item
+
+    with pytest.raises(StaleOffsetIndex):
+        offset_index.read_items(month, entries)
+
+
+def test_get_items_for_date_rebuilds_a_stale_sidecar(month, make_item):
+    _write(month, [make_item(1, group="high"), make_item(2)])
+    offset_index.load_offset_index(month)
+    _write(month, [make_item(3), make_item(4, group="high")])  # Same lengths, swapped groups
+
+    high, trend = store.get_items_for_date("2024-01-15")
+
+    assert high == [make_item(4, group="high")]
+    assert trend == [make_item(3)]
+
+
+def test_append_offsets_skips_a_sidecar_that_is_behind(month, make_item):
+    _write(month, [make_item(1)])
+    offset_index.load_offset_index(month)
+    first_length = month.stat().st_size
+    _write(month, [make_item(2), make_item(3)], mode="a")
+
+    # Only item 3's line is reported; the sidecar does not cover item 2 yet
+    line = (json.dumps(make_item(3), ensure_ascii=False) + "\n").encode("utf-8")
+    offset = month.stat().st_size - len(line)
+    assert offset > first_length
+    offset_index.append_offsets(month, [offset_index.entry_for_item(make_item(3), offset, len(line))])
+
+    assert _sidecar_ids(month) == [make_item(1)["item_id"]]
+    assert len(offset_index.load_offset_index(month)) == 3
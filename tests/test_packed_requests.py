@@ -0,0 +1,106 @@
+"""Packed LLM requests: one call for several short articles, per-article cache, fallbacks."""
+
+import json
+import re
+import threading
+
+import pytest
+
+from scripts.llm_client import PACKED_INSTRUCTIONS, parse_packed_enrichments
+from scripts.pipeline import ArticlePacker
+
+
+def _article(number: int) -> dict:
+    return {
+        "content": f"短い記事{number}",
+        "source_name": "Example",
+        "source_type": "news",
+        "publisher": "Example",
+        "original_title": f"記事{number}",
+        "language": "ja",
+    }
+
+
+@pytest.fixture
+def packed_llm(llm, enrichment):
+    """The fake API answers packed requests per article and single requests normally."""
+
+    def reply(request):
+        system, user = (m["content"] for m in request["messages"])
+        titles = re.findall(r"元タイトル: (\S+)", user)
+        if PACKED_INSTRUCTIONS not in system:
+            return json.dumps(enrichment(titles[0]))
+        items = [{"article_id": n, **enrichment(t)} for n, t in enumerate(titles, 1)]
+        return json.dumps({"items": list(reversed(items))})
+
+    llm.client.reply = reply
+    return llm
+
+
+def _packed_calls(client) -> int:
+    return sum(PACKED_INSTRUCTIONS in r["messages"][0]["content"] for r in client.requests)
+
+
+def test_articles_share_one_request_and_map_back_in_order(packed_llm):
+    results = packed_llm.analyze_packed([_article(n) for n in range(3)])
+
+    assert [r.title for r in results] == ["記事0", "記事1", "記事2"]
+    assert len(packed_llm.client.requests) == 1 == _packed_calls(packed_llm.client)
+
+
+def test_results_are_cached_per_article(packed_llm):
+    packed_llm.analyze_packed([_article(n) for n in range(3)])
+
+    assert packed_llm.analyze_article(**_article(1)).title == "記事1"
+    results = packed_llm.analyze_packed([_article(0), _article(5)])
+
+    assert [r.title for r in results] == ["記事0", "記事5"]
+    # One packed call, then only 記事5 as a single call
+    assert len(packed_llm.client.requests) == 2 and _packed_calls(packed_llm.client) == 1
+
+
+def test_malformed_packed_response_falls_back_to_single_calls(packed_llm, enrichment):
+    single = packed_llm.client.reply
+
+    def reply(request):
+        if PACKED_INSTRUCTIONS in request["messages"][0]["content"]:
+            return json.dumps({"items": [{"article_id": 1, **enrichment()}]})  # One missing
+        return single(request)
+
+    packed_llm.client.reply = reply
+    results = packed_llm.analyze_packed([_article(n) for n in range(2)])
+
+    assert [r.title for r in results] == ["記事0", "記事1"]
+    assert len(packed_llm.client.requests) == 3
+
+
+@pytest.mark.parametrize("ids", [[1, 1], [1, 3], [0, 1]])
+def test_bad_article_ids_are_rejected(enrichment, ids):
+    text = json.dumps({"items": [{"article_id": n, **enrichment()} for n in ids]})
+
+    with pytest.raises(ValueError):
+        parse_packed_enrichments(text, 2)
+
+
+def test_packer_groups_concurrent_workers(packed_llm):
+    packer = ArticlePacker(packed_llm, size=3, linger=5)
+    results = [None] * 3
+
+    def work(n):
+        results[n] = packer.analyze(_article(n))
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [r.title for r in results] == ["記事0", "記事1", "記事2"]
+    assert packer.requests == 1 and packer.articles == 3
+
+
+def test_packer_sends_a_partial_group_after_the_linger(packed_llm):
+    packer = ArticlePacker(packed_llm, size=3, linger=0.05)
+
+    assert packer.analyze(_article(0)).title == "記事0"
+    assert packer.requests == 1
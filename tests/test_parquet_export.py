@@ -0,0 +1,81 @@
+"""Parquet export: incremental parts, re-export of rewritten months, compaction, column reads."""
+
+import json
+
+import pytest
+
+from scripts import parquet_export, store
+from scripts.offset_index import rebuild_offset_index
+from scripts.parquet_export import export_items, read_columns, theme_counts
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def export_dir(data_dir, monkeypatch):
+    monkeypatch.setattr(parquet_export, "ITEMS_DIR", data_dir / "items")
+    return data_dir / "parquet"
+
+
+def _append(make_item, numbers, themes=("laborlaw",)):
+    for number in numbers:
+        item = {**make_item(number, date="2024-01-10"), "themes": list(themes)}
+        store.append_item(item, month="2024-01")
+
+
+def _parts(export_dir) -> list[str]:
+    return sorted(path.name for path in (export_dir / "month=2024-01").glob("*.parquet"))
+
+
+def test_only_new_lines_are_exported(export_dir, make_item):
+    _append(make_item, range(3))
+    assert export_items(export_dir=export_dir) == 3
+    assert export_items(export_dir=export_dir) == 0
+
+    _append(make_item, range(3, 5), themes=("recruiting",))
+    assert export_items(export_dir=export_dir) == 2
+
+    assert len(_parts(export_dir)) == 2
+    ids = read_columns(["item_id"], export_dir=export_dir)["item_id"].to_pylist()
+    assert sorted(ids) == [make_item(n)["item_id"] for n in range(5)]
+
+
+def test_rewritten_month_is_exported_again(data_dir, export_dir, make_item):
+    _append(make_item, range(3))
+    export_items(export_dir=export_dir)
+
+    # Rewrite the month in place, as theme_tagger retag does
+    path = data_dir / "items" / "2024-01.jsonl"
+    items = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    items[0]["themes"] = ["workstyle", "benefits"]
+    path.write_text("".join(json.dumps(i, ensure_ascii=False) + "\n" for i in items), "utf-8")
+    rebuild_offset_index(path)
+
+    assert export_items(export_dir=export_dir) == 3
+    assert len(_parts(export_dir)) == 1
+    themes = read_columns(["themes"], export_dir=export_dir)["themes"].to_pylist()
+    assert sorted(map(tuple, themes))[-1] == ("workstyle", "benefits")
+
+
+def test_many_parts_are_compacted(export_dir, make_item, monkeypatch):
+    monkeypatch.setattr(parquet_export, "PARQUET_MAX_PARTS", 2)
+    for number in range(3):
+        _append(make_item, [number])
+        export_items(export_dir=export_dir)
+
+    assert len(_parts(export_dir)) == 1
+    assert read_columns(["item_id"], export_dir=export_dir).num_rows == 3
+    assert export_items(export_dir=export_dir) == 0  # The compacted state still matches
+
+
+def test_theme_counts_per_month(export_dir, make_item):
+    _append(make_item, range(3))
+    _append(make_item, [3], themes=("laborlaw", "recruiting"))
+    export_items(export_dir=export_dir)
+
+    counts = theme_counts(export_dir=export_dir).to_pylist()
+
+    assert counts == [
+        {"month": "2024-01", "theme": "laborlaw", "items": 4},
+        {"month": "2024-01", "theme": "recruiting", "items": 1},
+    ]
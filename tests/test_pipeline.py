@@ -0,0 +1,131 @@
+"""Staged pipeline: overlapping fetches, admission under max_items, abandonment at the deadline."""
+
+import threading
+import time
+
+import pytest
+
+from scripts import pipeline
+from scripts.llm_client import EnrichedItem
+from scripts.normalize import compute_item_id
+from scripts.pipeline import run_pipeline
+
+
+def _candidate(number: int, source_key: str = "src") -> dict:
+    return {
+        "url": f"https://example.com/{number}",
+        "title": f"記事 {number}",
+        "pub_date": "2024-01-15T00:00:00+00:00",
+        "source_key": source_key,
+        "source_name": "Example",
+        "source_type": "news",
+        "publisher": "Example",
+        "language": "ja",
+        "summary": "",
+    }
+
+
+def _enriched(title: str) -> EnrichedItem:
+    return EnrichedItem(
+        title=title,
+        summary="要約",
+        key_points=["要点"],
+        themes=["laborlaw"],
+        tags=[],
+        language="ja",
+        published_at=None,
+        reliability_score_delta=0,
+        reliability_reason="",
+    )
+
+
+class _FakeLLM:
+    model = "m"
+
+    def __init__(self, fail_titles=(), release: threading.Event | None = None):
+        self.fail_titles = set(fail_titles)
+        self.release = release
+        self.calls = 0
+
+    def analyze_article(self, original_title, model=None, **kwargs):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        if original_title in self.fail_titles:
+            return None
+        return _enriched(original_title)
+
+
+class _Fetcher:
+    """Stand-in for fetch_page that records how many fetches overlap."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self, url, item_id):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return "<html></html>", None
+
+
+@pytest.fixture
+def fetcher(data_dir, monkeypatch):
+    fetcher = _Fetcher(delay=0.05)
+    monkeypatch.setattr(pipeline, "fetch_page", fetcher)
+    monkeypatch.setattr(pipeline, "prepare_content", lambda html, url, *args: "本文")
+    monkeypatch.setattr(pipeline, "LLM_PACK_ENABLED", False)
+    monkeypatch.setattr(pipeline, "LOCAL_FALLBACK_ENABLED", False)
+    monkeypatch.setattr(pipeline, "PIPELINE_FETCH_WORKERS", 4)
+    return fetcher
+
+
+def test_fetches_overlap_and_all_items_are_stored(fetcher):
+    index = {}
+    stats = run_pipeline([_candidate(n) for n in range(8)], "trend", 8, index, _FakeLLM())
+
+    assert len(stats.processed) == 8
+    assert fetcher.peak > 1
+    assert all(compute_item_id(f"https://example.com/{n}") in index for n in range(8))
+    assert stats.unfinished_sources == set()
+
+
+def test_failed_item_frees_a_slot_and_duplicates_are_counted(fetcher):
+    index = {compute_item_id("https://example.com/0"): {}}
+    llm = _FakeLLM(fail_titles={"記事 1"})
+
+    stats = run_pipeline([_candidate(n) for n in range(5)], "trend", 2, index, llm)
+
+    assert sorted(item["rss_title"] for item in stats.processed) == ["記事 2", "記事 3"]
+    assert stats.duplicates == 1
+    assert len(stats.errors) == 1
+    assert stats.unfinished_sources == {"src"}
+
+
+def test_items_in_flight_at_the_deadline_are_abandoned(fetcher):
+    class _Deadline:
+        def admit(self, kind):
+            return True
+
+        def record(self, kind, seconds):
+            pass
+
+        def work_remaining(self):
+            return 0.2
+
+    release = threading.Event()
+    llm = _FakeLLM(release=release)
+    candidates = [_candidate(0, "a"), _candidate(1, "b")]
+    try:
+        stats = run_pipeline(candidates, "trend", 2, {}, llm, deadline=_Deadline())
+    finally:
+        release.set()
+
+    assert stats.processed == []
+    assert stats.unfinished_sources == {"a", "b"}
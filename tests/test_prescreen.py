@@ -0,0 +1,41 @@
+"""Keyword pre-screen: matching, scoring and screening decisions."""
+
+from scripts.prescreen import (
+    SCREEN_CHEAP,
+    SCREEN_FULL,
+    SCREEN_SKIP,
+    KeywordMatcher,
+    score_candidate,
+    screen,
+)
+
+
+def _found(matcher: KeywordMatcher, text: str) -> set[str]:
+    return {matcher.keywords[i] for i in matcher.find(text)}
+
+
+def test_latin_keywords_match_on_word_boundaries():
+    matcher = KeywordMatcher({"workstyle": ["office", "remote work"]})
+
+    assert _found(matcher, "Back to the Office") == {"office"}
+    assert _found(matcher, "officer training") == set()
+    assert _found(matcher, "REMOTE WORK policy") == {"remote work"}
+
+
+def test_cjk_keywords_match_anywhere():
+    matcher = KeywordMatcher({"workstyle": ["休暇", "有給休暇"], "recruiting": ["採用"]})
+
+    assert _found(matcher, "新卒採用と有給休暇の取得率") == {"採用", "休暇", "有給休暇"}
+    assert matcher.themes_for(matcher.find("中途採用")) == {"recruiting"}
+
+
+def test_title_hits_weigh_more_than_summary_hits():
+    assert score_candidate("テレワーク") > score_candidate("", "テレワーク")
+    assert score_candidate("決算発表", "株価の動向") == 0
+
+
+def test_screen_modes():
+    assert screen(0, threshold=2, mode="off") == SCREEN_FULL
+    assert screen(1, threshold=2, mode="cheap") == SCREEN_CHEAP
+    assert screen(1, threshold=2, mode="skip") == SCREEN_SKIP
+    assert screen(2, threshold=2, mode="skip") == SCREEN_FULL
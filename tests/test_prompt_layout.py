@@ -0,0 +1,68 @@
+"""Prompt-cache-friendly layout and cached-token accounting."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from scripts import llm_client
+from scripts.llm_client import (
+    UsageStats,
+    build_analysis_request,
+    build_system_prompt,
+    create_kwargs,
+    prompt_fingerprint,
+)
+
+
+def test_static_prefix_is_stable_and_article_goes_last():
+    system_prompt = build_system_prompt()
+    first = build_analysis_request("m", system_prompt, "記事A")
+    second = build_analysis_request("m", build_system_prompt(), "記事B")
+
+    assert first["messages"][0] == second["messages"][0]
+    assert [m["role"] for m in first["messages"]] == ["system", "user"]
+    assert first["messages"][-1]["content"] == "記事A"
+    assert first["prompt_cache_key"] == second["prompt_cache_key"]
+
+
+def test_fingerprint_changes_with_the_prefix():
+    system_prompt = build_system_prompt()
+
+    assert prompt_fingerprint(system_prompt) != prompt_fingerprint(system_prompt + "追記")
+    assert prompt_fingerprint(system_prompt) != prompt_fingerprint(system_prompt, {"name": "x"})
+
+
+def test_cache_key_travels_in_extra_body():
+    request = build_analysis_request("m", "system", "user")
+    kwargs = create_kwargs(request)
+
+    assert "prompt_cache_key" not in kwargs
+    assert kwargs["extra_body"] == {"prompt_cache_key": request["prompt_cache_key"]}
+    assert "prompt_cache_key" in request  # The Batch API body keeps it
+
+
+def _usage(prompt: int, cached: int, completion: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        prompt_tokens=prompt,
+        completion_tokens=completion,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+    )
+
+
+def test_cached_tokens_are_billed_at_the_cached_price(monkeypatch):
+    monkeypatch.setattr(llm_client, "MODEL_PRICING", {"gpt-x": (1.0, 0.25, 4.0)})
+    usage = UsageStats()
+    usage.record("gpt-x-2025-01-01", _usage(1_000_000, 600_000, 100_000), latency=0.5)
+    usage.record("gpt-x-2025-01-01", None)  # Responses without usage are ignored
+
+    counters = usage.snapshot()["gpt-x-2025-01-01"]
+    assert counters == {
+        "calls": 1,
+        "prompt": 1_000_000,
+        "cached": 600_000,
+        "completion": 100_000,
+        "latency_ms": 500,
+    }
+    input_cost, output_cost = UsageStats.cost("gpt-x-2025-01-01", counters)
+    assert input_cost == pytest.approx(0.4 + 0.15)
+    assert output_cost == pytest.approx(0.4)
@@ -0,0 +1,71 @@
+"""Circuit breaker: half-open trials always end with an outcome."""
+
+import asyncio
+
+import pytest
+
+from scripts import resilience
+from scripts.llm_client import AsyncLLMClient
+from scripts.resilience import CircuitOpenError, get_breaker, retry_with_backoff
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    """A fresh breaker whose circuit is open and due for a trial call."""
+    monkeypatch.setattr(resilience, "_breakers", {})
+    breaker = get_breaker("example.com")
+    breaker.reset_seconds = 0
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.opened_at is not None
+    return breaker
+
+
+def test_unlisted_exception_releases_trial(breaker):
+    @retry_with_backoff(max_retries=0, exceptions=(ConnectionError,), circuit="example.com")
+    def call():
+        raise RuntimeError("GraphQL errors")
+
+    with pytest.raises(RuntimeError):
+        call()
+    # The next trial is admitted instead of failing fast forever
+    breaker.before_call()
+
+
+def test_interrupt_releases_trial(breaker):
+    @retry_with_backoff(max_retries=0, circuit="example.com")
+    def call():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        call()
+    breaker.before_call()
+
+
+def test_trial_failure_reopens_circuit(breaker):
+    @retry_with_backoff(max_retries=0, circuit="example.com")
+    def call():
+        raise ConnectionError("refused")
+
+    breaker.reset_seconds = 3600
+    breaker.opened_at -= 3600
+    with pytest.raises(ConnectionError):
+        call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_async_rejection_keeps_the_circuit_open(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    breaker = get_breaker("openai")
+    breaker.reset_seconds = 3600
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    client = AsyncLLMClient(api_key="test", use_cache=False)
+    article = ("本文", "Example", "news", "Example", "記事")
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.analyze_article_async(*article, model=client.model))
+
+    assert breaker.opened_at is not None
+    assert breaker.rejected == 1
@@ -0,0 +1,45 @@
+"""Daily run: a failing source group still leaves stored items and feed state saved."""
+
+import pytest
+
+from scripts import run_daily, store
+from scripts.pipeline import ProcessingStats
+
+
+class _FakeLLM:
+    model = "m"
+    cascade = False
+
+    def __init__(self, **kwargs):
+        pass
+
+
+def test_trend_failure_still_saves_items_index_and_feed_state(data_dir, make_item, monkeypatch):
+    previous = {"high-src": {"etag": "h0"}, "trend-src": {"etag": "t0"}}
+    saved = {}
+
+    def process_source_group(group, max_items, index, llm, feed_state, deadline, writer):
+        feed_state[f"{group}-src"] = {"etag": f"{group[0]}1"}
+        if group == "trend":
+            raise RuntimeError("trend feed exploded")
+        writer.add(index, make_item(1, group="high"), "Example", month="2024-01")
+        return ProcessingStats([make_item(1)], 0, [], set())
+
+    monkeypatch.setattr(run_daily, "validate_config", lambda: [])
+    monkeypatch.setattr(run_daily, "LLMClient", _FakeLLM)
+    monkeypatch.setattr(
+        run_daily, "load_feed_state", lambda: {key: dict(v) for key, v in previous.items()}
+    )
+    monkeypatch.setattr(run_daily, "save_feed_state", saved.update)
+    monkeypatch.setattr(
+        run_daily, "load_sources_config", lambda group: [{"key": f"{group}-src"}]
+    )
+    monkeypatch.setattr(run_daily, "process_source_group", process_source_group)
+
+    with pytest.raises(RuntimeError):
+        run_daily.run_daily("2024-01-15", async_llm=False, budget_seconds=0)
+
+    assert store.load_items_for_month("2024-01") == [make_item(1, group="high")]
+    assert make_item(1)["item_id"] in store.load_index()
+    # HIGH finished and keeps its new state; the failed TREND group is rolled back
+    assert saved == {"high-src": {"etag": "h1"}, "trend-src": {"etag": "t0"}}
@@ -0,0 +1,82 @@
+"""SQLite mirror: upserts, trigram full-text search with short-term fallback, rebuild."""
+
+import json
+
+import pytest
+
+from scripts import sqlite_store
+from scripts.sqlite_store import connect, rebuild, search, upsert_index_entries, upsert_items
+
+
+@pytest.fixture
+def conn(tmp_path, make_item):
+    conn = connect(tmp_path / "eic.sqlite3")
+    upsert_items(
+        conn,
+        [
+            {**make_item(1), "title": "育児休業法の改正ポイント", "themes": ["laborlaw"]},
+            {
+                **make_item(2, group="high"),
+                "title": "新卒採用の早期化",
+                "summary": "採用活動の開始時期が前倒しに",
+                "themes": ["recruiting"],
+            },
+            {
+                **make_item(3),
+                "title": "テレワーク規程の改正",
+                "summary": "在宅勤務手当の見直し",
+                "themes": ["workstyle"],
+            },
+        ],
+    )
+    yield conn
+    conn.close()
+
+
+def _ids(results) -> list[str]:
+    return sorted(row["item_id"] for row in results)
+
+
+def test_trigram_search_matches_japanese_without_segmentation(conn, make_item):
+    results = search(conn, "育児・介護休業法")
+
+    assert _ids(results) == [make_item(1)["item_id"]]
+    assert "[" in results[0]["snippet"]
+    assert results[0]["themes"] == "laborlaw"
+
+
+def test_short_terms_fall_back_to_like(conn, make_item):
+    assert _ids(search(conn, "改正")) == [make_item(1)["item_id"], make_item(3)["item_id"]]
+    assert _ids(search(conn, "改正 テレワーク")) == [make_item(3)["item_id"]]
+
+
+def test_theme_and_group_filters(conn, make_item):
+    assert _ids(search(conn, "改正", theme="workstyle")) == [make_item(3)["item_id"]]
+    assert _ids(search(conn, "採用活動", source_group="high")) == [make_item(2)["item_id"]]
+    assert search(conn, "採用活動", source_group="trend") == []
+
+
+def test_upsert_replaces_rows(conn, make_item):
+    upsert_items(conn, [{**make_item(1), "title": "差し替え後の見出し", "themes": ["benefits"]}])
+
+    assert search(conn, "育児休業法") == []
+    assert _ids(search(conn, "差し替え後")) == [make_item(1)["item_id"]]
+    themes = conn.execute("SELECT theme FROM item_themes WHERE item_id = ?", (make_item(1)["item_id"],))
+    assert [row["theme"] for row in themes] == ["benefits"]
+
+
+def test_rebuild_ingests_jsonl_and_index(data_dir, make_item, monkeypatch):
+    monkeypatch.setattr(sqlite_store, "ITEMS_DIR", data_dir / "items")
+    lines = "".join(json.dumps(make_item(n), ensure_ascii=False) + "\n" for n in range(3))
+    (data_dir / "items" / "2024-01.jsonl").write_text(lines, encoding="utf-8")
+
+    path = data_dir / "eic.sqlite3"
+    assert rebuild(path) == (3, 3)  # The index is reconciled from the JSONL files
+
+    conn = connect(path)
+    try:
+        assert len(search(conn, "介護休業法")) == 3
+        assert upsert_index_entries(conn, [{"item_id": "x", "title": "t"}]) == 1
+        assert conn.execute("SELECT count(*) FROM seen").fetchone()[0] == 4
+    finally:
+        conn.close()
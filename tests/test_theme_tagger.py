@@ -0,0 +1,90 @@
+"""Local theme tagger: confidences, fallback enrichment and re-tagging."""
+
+import json
+
+import pytest
+
+from scripts import theme_tagger
+from scripts.theme_tagger import ThemeTagger, description_terms, fallback_enrichment, retag_items
+
+CONFIG = {
+    "themes": [
+        {
+            "key": "workstyle",
+            "name": "働き方",
+            "description": "勤務時間、リモート勤務、休暇情報など働き方に関するデータ",
+            "keywords": ["テレワーク", "有給休暇"],
+        },
+        {
+            "key": "recruiting",
+            "name": "採用",
+            "description": "求人、採用活動に関するデータ",
+            "keywords": ["新卒採用", "中途採用"],
+        },
+    ]
+}
+
+
+@pytest.fixture
+def tagger(monkeypatch):
+    tagger = ThemeTagger(CONFIG)
+    monkeypatch.setattr(theme_tagger, "get_tagger", lambda: tagger)
+    return tagger
+
+
+def test_description_terms():
+    assert description_terms(CONFIG["themes"][0]["description"]) == [
+        "勤務時間",
+        "リモート勤務",
+        "休暇情報",
+    ]
+
+
+def test_title_hits_outweigh_body_hits(tagger):
+    by_title = dict(tagger.tag("テレワークの実態"))
+    by_body = dict(tagger.tag("調査結果", "テレワークの実態"))
+
+    assert by_title["workstyle"] == pytest.approx(0.632, abs=0.001)
+    assert by_body["workstyle"] == pytest.approx(0.393, abs=0.001)
+    assert tagger.tag("決算発表", "株価の動向") == []
+
+
+def test_themes_sorted_by_confidence(tagger):
+    themes = tagger.tag("新卒採用と中途採用", "テレワーク")
+
+    assert [theme.key for theme in themes] == ["recruiting", "workstyle"]
+    # A single description term in the body stays below MIN_CONFIDENCE
+    assert [theme.key for theme in tagger.tag("新卒採用", "勤務時間")] == ["recruiting"]
+
+
+def test_fallback_enrichment_uses_summary_without_content(tagger):
+    enrichment, confidence = fallback_enrichment(
+        "テレワーク導入企業が増加", "", "ja", summary="調査の結果を公表した。対象は500社。"
+    )
+
+    assert enrichment.themes == ["workstyle"]
+    assert confidence == {"workstyle": pytest.approx(0.632, abs=0.001)}
+    assert enrichment.key_points == ["調査の結果を公表した。", "対象は500社。", "(要点なし)"]
+    assert enrichment.reliability_score_delta == 0
+    assert enrichment.reliability_reason == theme_tagger.FALLBACK_REASON
+
+
+def test_retag_updates_local_items_and_compares_llm_items(data_dir, make_item, tagger, monkeypatch):
+    monkeypatch.setattr(theme_tagger, "ITEMS_DIR", data_dir / "items")
+    local = {
+        **make_item(1, date="2024-01-10"),
+        "rss_title": "新卒採用の動向",
+        "themes": ["workstyle"],
+        "enrichment_source": "local",
+    }
+    llm = {**make_item(2, date="2024-01-10"), "rss_title": "テレワーク", "themes": ["workstyle"]}
+    path = data_dir / "items" / "2024-01.jsonl"
+    path.write_text("".join(json.dumps(i, ensure_ascii=False) + "\n" for i in (local, llm)))
+
+    report = retag_items(write=True)
+
+    stored = [json.loads(line) for line in path.read_text().splitlines()]
+    assert stored[0]["themes"] == ["recruiting"]
+    assert stored[1] == llm
+    assert report["updated"] == 1 and report["llm_items"] == 1
+    assert report["themes"]["workstyle"]["both"] == 1
@@ -0,0 +1,60 @@
+"""Token budgeting: text within budget is untouched; trimming keeps lead and HR paragraphs."""
+
+from scripts import token_budget
+from scripts.token_budget import budget_content, count_tokens, get_token_budget, split_segments
+
+MODEL = "gpt-4.1-mini"
+
+FILLER = "本日は晴天なり。地域のイベントについて特に大きな話題はありませんでした。" * 3
+ARTICLE = "\n".join(
+    [
+        "リード文：企業の人事制度に関する最新動向をまとめた。",
+        "二段落目：調査の概要と対象について説明する。",
+        *[f"{FILLER}（{n}）" for n in range(6)],
+        "育児休業の取得率が過去最高を更新したことが明らかになった。",
+        *[f"{FILLER}（{n}）" for n in range(6, 12)],
+    ]
+)
+
+
+def test_text_within_budget_is_unchanged():
+    assert budget_content("短い本文。", MODEL, max_tokens=1000) == "短い本文。"
+
+
+def test_trimming_keeps_lead_and_keyword_paragraphs_in_order(monkeypatch):
+    monkeypatch.setattr(token_budget, "get_hr_keywords", lambda: ("育児休業",))
+    budget = count_tokens("\n".join(ARTICLE.split("\n")[:2]), MODEL) + 60
+
+    result = budget_content(ARTICLE, MODEL, max_tokens=budget)
+
+    lines = result.split("\n")
+    assert count_tokens(result, MODEL) <= budget
+    assert lines[:2] == ARTICLE.split("\n")[:2]
+    assert "育児休業の取得率が過去最高を更新したことが明らかになった。" in lines
+    assert lines == [line for line in ARTICLE.split("\n") if line in lines]  # Original order
+
+
+def test_oversized_single_segment_keeps_its_beginning():
+    text = "あ" * 5000
+
+    result = budget_content(text, MODEL, max_tokens=100)
+
+    assert text.startswith(result)
+    assert count_tokens(result, MODEL) <= 100
+
+
+def test_sentences_are_split_when_there_are_no_line_breaks():
+    assert split_segments("一文目。二文目！Third one. Fourth") == [
+        "一文目。",
+        "二文目！",
+        "Third one.",
+        "Fourth",
+    ]
+
+
+def test_dated_snapshots_use_the_base_model_budget(monkeypatch):
+    monkeypatch.setattr(token_budget, "MODEL_INPUT_TOKEN_BUDGETS", {"gpt-x": 100, "gpt-x-mini": 50})
+
+    assert get_token_budget("gpt-x-mini-2025-01-01") == 50
+    assert get_token_budget("gpt-x-2025-01-01") == 100
+    assert get_token_budget("other") == token_budget.CONTENT_TOKEN_BUDGET